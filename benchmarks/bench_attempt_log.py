@@ -0,0 +1,58 @@
+"""
+Benchmark for attempt log analytics.
+
+Writes a synthetic attempt log with millions of records, then times
+memory-mapping it and computing per-character accuracy and answer times.
+
+    python benchmarks/bench_attempt_log.py [--records N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from AttemptLog_Classes import ATTEMPT_DTYPE, LOG_HEADER, LOG_MAGIC, LOG_VERSION, character_stats, read_attempts
+
+
+def write_synthetic_log(path, count, seed=0):
+    rng = np.random.default_rng(seed)
+    records = np.zeros(count, dtype=ATTEMPT_DTYPE)
+    records['time'] = 1.7e9 + np.arange(count)
+    records['target'] = rng.choice(np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+/=', dtype=np.uint8), count)
+    records['correct'] = rng.random(count) < 0.7
+    records['response_ms'] = rng.gamma(3.0, 800.0, count)
+    records['response_ms'][rng.random(count) < 0.01] = np.nan
+    records['key_ms'] = np.nan
+    with open(path, 'wb') as file:
+        file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, ATTEMPT_DTYPE.itemsize))
+        file.write(records.tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=2_000_000, help="records in the log (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="timing runs (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.mlog')
+        write_synthetic_log(path, args.records)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            stats = character_stats(read_attempts(path))
+            best = min(best, time.perf_counter() - start)
+            del stats
+    size_mb = args.records * ATTEMPT_DTYPE.itemsize / 1e6
+    print(f"{args.records} records ({size_mb:.0f} MB): {best * 1000:.0f} ms "
+          f"({args.records / best / 1e6:.1f} M records/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
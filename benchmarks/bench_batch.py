@@ -0,0 +1,50 @@
+"""
+Benchmark for the batch renderer.
+
+Renders the same set of practice messages with 1, 2, 4... worker
+processes up to the number of cores and reports audio seconds rendered
+per wall second, to show how the batch scales.
+
+    python benchmarks/bench_batch.py [--messages N] [--format wav|npy]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from Batch_Classes import RenderJob, render_batch
+
+
+def make_jobs(count):
+    words = "CQ DE K1ABC UR RST 599 NAME JOHN QTH BOSTON WX SUNNY TEMP 20C HW CPY".split()
+    return [RenderJob(name=f"{index:05d}", text=' '.join(words[index % 5:index % 5 + 8]),
+                      wpm=15 + index % 16, freq=500 + 10 * (index % 40))
+            for index in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=400, help="messages to render (default: %(default)s)")
+    parser.add_argument('--format', choices=('wav', 'npy'), default='wav')
+    args = parser.parse_args(argv)
+
+    jobs = make_jobs(args.messages)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** power for power in range(cores.bit_length()) if 2 ** power <= cores})
+    baseline = None
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            seconds = sum(entry['seconds'] for entry in render_batch(jobs, directory, args.format, workers))
+            elapsed = time.perf_counter() - start
+        rate = seconds / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>3} workers: {elapsed:6.2f} s, {rate:8.0f}x real time, {rate / baseline:4.1f}x one worker")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark for the challenge sampler.
+
+Times AdaptiveSampler draws and weight updates for alphabets from 64 to
+65536 symbols, next to a linear-time weighted draw (random.choices) for
+comparison.  The Fenwick-tree costs should stay nearly flat as the
+alphabet grows while the linear draw grows with it.
+
+    python benchmarks/bench_sampler.py [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from Challenge_Classes import AdaptiveSampler
+
+SIZES = (64, 1024, 4096, 16384, 65536)
+
+
+def per_call_ns(function, number, repeat):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="timing runs per case (default: %(default)s)")
+    parser.add_argument('--number', type=int, default=2000, help="calls per timing run (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'symbols':>8} {'draw ns':>10} {'update ns':>10} {'linear draw ns':>15}")
+    for size in SIZES:
+        symbols = [chr(0x100 + index) for index in range(size)]
+        sampler = AdaptiveSampler(symbols, seed=1)
+        rng = random.Random(2)
+        for _ in range(size // 4):
+            sampler.record(rng.choice(symbols), rng.random() < 0.5, rng.uniform(1, 8))
+
+        draw = per_call_ns(sampler.draw, args.number, args.repeat)
+        update = per_call_ns(lambda: sampler.record(rng.choice(symbols), rng.random() < 0.5, 4.0),
+                             args.number, args.repeat)
+        weights = sampler.tree.values
+        linear = per_call_ns(lambda: rng.choices(symbols, weights), max(1, args.number // 20), args.repeat)
+        print(f"{size:>8} {draw:>10.0f} {update:>10.0f} {linear:>15.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""
+Benchmark suite for the codec, synthesis and frame-loop hot paths.
+
+Times each case with timeit (the best of several runs, each long enough
+to be measured reliably) and prints nanoseconds per call.  Results can be
+written to JSON together with the machine, Python and library versions
+and the git commit, stored as a baseline, and compared against one: any
+case slower than the baseline by more than the threshold is reported as
+a regression and the suite exits with status 1.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --save-baseline
+    python benchmarks/bench_suite.py --compare --threshold 0.25 -o results.json
+    python benchmarks/bench_suite.py -k frame
+
+The frame-loop cases run the game under SDL's dummy drivers with the
+null audio backend.  Baselines are only meaningful on the machine that
+recorded them; the comparison warns when the machine differs.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+import pygame
+
+from Audio_Classes import create_backend
+from Challenge_Classes import AdaptiveSampler
+from MorseCode_Classes import (MORSE_CODE, MORSE_TREE, MorseCodeEncoder, MorseCodeInterpreter, MorseCodePlayer,
+                               WaveformBank)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+MESSAGE = "CQ CQ CQ DE K1ABC K1ABC K"
+CASES = {}
+
+
+def case(name):
+    """Register a benchmark: a function that sets up and returns the callable to time"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def cycle(items):
+    """A callable returning the next item on each call, so cases do not repeat one input"""
+    items = list(items)
+    state = {'index': 0}
+
+    def next_item():
+        index = state['index']
+        state['index'] = (index + 1) % len(items)
+        return items[index]
+    return next_item
+
+
+CODES = [MORSE_CODE[char] for char in MORSE_TREE.packed]
+
+
+@case('codec.lookup_morse_code')
+def bench_lookup():
+    interpreter = MorseCodeInterpreter()
+    code = cycle(CODES + ['.-.-.-.-', '--..--..'])
+    return lambda: interpreter.lookup_morse_code(code())
+
+
+@case('codec.interpret_morse_code')
+def bench_interpret():
+    interpreter = MorseCodeInterpreter()
+    code = cycle(CODES + ['.-.-.-.-'])
+
+    def interpret():
+        for symbol in code():
+            interpreter.add_symbol(symbol)
+        interpreter.interpret_morse_code()
+    return interpret
+
+
+@case('codec.encode_character')
+def bench_encode():
+    encoder = MorseCodeEncoder()
+    char = cycle(MORSE_TREE.packed)
+
+    def encode():
+        encoder.select_character(char())
+        done = False
+        while not done:
+            done, _, _ = encoder.next_dot_dash()
+    return encode
+
+
+@case('challenge.sampler_draw')
+def bench_sampler():
+    sampler = AdaptiveSampler(seed=1)
+    return sampler.draw
+
+
+@case('synthesis.generate_signal')
+def bench_generate_signal():
+    player = MorseCodePlayer()
+    symbol = cycle('.-')
+    player.generate_signal('.')  # render the bank once; the case times the lookups
+    return lambda: player.generate_signal(symbol())
+
+
+@case('synthesis.bank_render')
+def bench_bank_render():
+    return lambda: WaveformBank(MORSE_CODE).table(700, 44100, 0.1)
+
+
+@case('synthesis.render_message')
+def bench_render_message():
+    player = MorseCodePlayer(wpm=20)
+    backend = create_backend('null')
+    backend.open(player)
+    return lambda: backend.play(MESSAGE, lambda: False)
+
+
+@case('synthesis.stream_message')
+def bench_stream_message():
+    player = MorseCodePlayer(wpm=20)
+
+    def stream():
+        for chunk in player.renderer.stream(MESSAGE):
+            pass
+    return stream
+
+
+def make_game():
+    from Morse_Invader import GameConfig, MorseInvaderGame
+    from Simulation_Classes import VirtualClock
+
+    os.chdir(SRC)  # the game loads its assets relative to src
+    clock = VirtualClock()
+    config = GameConfig(AUDIO_BACKEND='null', ATTEMPT_LOG=None, WAVEFORM_STORE=None, CHALLENGE_SEED=1)
+    game = MorseInvaderGame(config, now=clock, get_events=lambda: [])
+    game.reset_game_marker_position()
+    game.update_display()
+    return game, clock
+
+
+@case('frame.update_display_idle')
+def bench_display_idle():
+    game, _ = make_game()
+    return game.update_display
+
+
+@case('frame.update_display_changed')
+def bench_display_changed():
+    game, _ = make_game()
+
+    def changed():
+        game.score_keeper.player_score += 1
+        game.update_display()
+    return changed
+
+
+@case('frame.update_display_full')
+def bench_display_full():
+    game, _ = make_game()
+
+    def full():
+        game.last_frame = None
+        game.update_display()
+    return full
+
+
+@case('frame.update_game_marker')
+def bench_game_marker():
+    game, clock = make_game()
+    char = cycle(MORSE_TREE.packed)
+
+    def walk():
+        # One character's whole walk down the tree, then let the scheduled callbacks run out
+        game.state.morse_char_target = char()
+        game.game_marker.encode_character(game.state.morse_char_target)
+        game.marker_pause.set_count(0)
+        game.state.game_marker_moving = True
+        while game.state.game_marker_moving:
+            game.update_game_marker()
+        clock.advance(10.0)
+        game.scheduler.run_due()
+    return walk
+
+
+def time_case(function, repeat, min_time):
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    runs = [elapsed / number * 1e9] + [value / number * 1e9 for value in timer.repeat(repeat - 1, number)]
+    return {
+        'ns_per_call': round(min(runs), 1),
+        'median_ns': round(statistics.median(runs), 1),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SRC, capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata():
+    return {
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; returns the names of the regressions"""
+    regressions = []
+    print(f"\n{'case':<30} {'baseline ns':>12} {'now ns':>12} {'change':>8}")
+    for name, entry in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<30} {'-':>12} {entry['ns_per_call']:>12.1f}      new")
+            continue
+        change = entry['ns_per_call'] / before['ns_per_call'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:<30} {before['ns_per_call']:>12.1f} {entry['ns_per_call']:>12.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', dest='filter', help="only run cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5, help="timing runs per case (default: %(default)s)")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="shortest timing run in seconds (default: %(default)s)")
+    parser.add_argument('-o', '--output', help="write the results and machine metadata to this JSON file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline, after --compare has read the old one")
+    parser.add_argument('--compare', action='store_true', help="compare with the baseline and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="slowdown counted as a regression, as a fraction (default: %(default)s)")
+    parser.add_argument('--list', action='store_true', help="list the cases and exit")
+    args = parser.parse_args(argv)
+    # The frame cases change directory to src, so resolve the paths first
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    names = [name for name in CASES if args.filter is None or args.filter in name]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        print(f"no case matches {args.filter!r}", file=sys.stderr)
+        return 2
+    if args.compare:
+        # Read before running, so --save-baseline cannot replace it first
+        try:
+            with open(baseline_path) as file:
+                baseline = json.load(file)
+        except (OSError, ValueError) as error:
+            print(f"cannot read baseline: {error}", file=sys.stderr)
+            return 2
+
+    report = {'metadata': {**metadata(), 'repeat': args.repeat, 'min_time': args.min_time}, 'results': {}}
+    print(f"{'case':<30} {'ns/call':>12} {'median ns':>12} {'calls':>9}")
+    for name in names:
+        entry = time_case(CASES[name](), args.repeat, args.min_time)
+        report['results'][name] = entry
+        print(f"{name:<30} {entry['ns_per_call']:>12.1f} {entry['median_ns']:>12.1f} {entry['number']:>9}", flush=True)
+
+    for path in filter(None, (output, baseline_path if args.save_baseline else None)):
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=1)
+        print(f"\nwrote {path}")
+
+    if args.compare:
+        before, now = baseline.get('metadata', {}), report['metadata']
+        for key in ('machine', 'processor', 'cpu_count', 'python'):
+            if before.get(key) != now.get(key):
+                print(f"warning: baseline {key} is {before.get(key)!r}, this run's is {now.get(key)!r}")
+        regressions = compare(report['results'], baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+MAX_KEYS = 8  # key press times kept per attempt
+
+# One fixed-width little-endian record per answered challenge
+ATTEMPT_DTYPE = np.dtype([
+    ('time', '<f8'),                    # seconds since the epoch
+    ('target', '<u4'),                  # code point of the target character, 0 if none
+    ('entered', '<u4'),                 # code point of the character entered, 0 if none
+    ('code_bits', '<u2'),               # entered code packed as bits, a dash being a 1 bit
+    ('code_length', 'u1'),              # number of elements entered
+    ('correct', 'u1'),
+    ('response_ms', '<f4'),             # target played to answer, NaN if unknown
+    ('key_ms', '<f4', (MAX_KEYS,)),     # target played to each element key, NaN padded
+])
+
+LOG_MAGIC = b'MIATTLOG'
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct('<8sHH')  # magic, version, record size
+
+
+def pack_code(code):
+    """Pack a string of dots and dashes into (bits, length), keeping the first 16 elements"""
+    code = code[:16]
+    bits = 0
+    for symbol in code:
+        bits = (bits << 1) | (symbol == '-')
+    return bits, len(code)
+
+
+def unpack_code(bits, length):
+    return ''.join('-' if (bits >> (length - 1 - index)) & 1 else '.' for index in range(length))
+
+
+class AttemptLog:
+    """
+    An append-only binary log of challenge attempts.
+
+    record() only builds one fixed-width record and queues it, so the game
+    loop never waits on the disk.  A writer thread takes everything queued
+    so far, appends it to the file in a single write and flushes.  A new
+    file starts with a short header giving the format version and record
+    size, which read_attempts() checks.  Reopening a log cuts off any
+    partly written last record before appending.
+
+    Attributes:
+        path (str): The log file.
+        written (int): Records written by this log so far.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self._queue = queue.Queue()
+        self._file = open(path, 'ab')
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, ATTEMPT_DTYPE.itemsize))
+            self._file.flush()
+        else:
+            try:
+                offset = read_header(path)
+            except ValueError:
+                self._file.close()
+                raise
+            whole = offset + (size - offset) // ATTEMPT_DTYPE.itemsize * ATTEMPT_DTYPE.itemsize
+            if whole != size:
+                # Drop a record left half written by a crash, so new records stay aligned
+                self._file.truncate(whole)
+        self._thread = threading.Thread(target=self._run, name="AttemptLog", daemon=True)
+        self._thread.start()
+
+    def record(self, target, code, entered, correct, response_time=None, key_times=(), when=None):
+        """
+        Queue one attempt.
+
+        Args:
+            target (str): The challenge character.
+            code (str): The dots and dashes entered.
+            entered (str): The character the code stands for, or None.
+            correct (bool): Whether the answer matched the target.
+            response_time (float, optional): Seconds from the target being played to the answer.
+            key_times (sequence, optional): Seconds from the target being played to each element key.
+            when (float, optional): Time of the attempt. Defaults to now.
+        """
+        record = np.zeros((), dtype=ATTEMPT_DTYPE)
+        record['time'] = time.time() if when is None else when
+        record['target'] = ord(target) if target else 0
+        record['entered'] = ord(entered) if entered else 0
+        record['code_bits'], record['code_length'] = pack_code(code)
+        record['correct'] = bool(correct)
+        record['response_ms'] = np.nan if response_time is None else 1000 * response_time
+        keys = np.full(MAX_KEYS, np.nan, dtype=np.float32)
+        key_times = list(key_times)[:MAX_KEYS]
+        keys[:len(key_times)] = np.asarray(key_times, dtype=np.float32) * 1000
+        record['key_ms'] = keys
+        self._queue.put(record.tobytes())
+
+    def flush(self):
+        """Block until every queued record is on disk"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._file.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                self._file.write(b''.join(records))
+                self._file.flush()
+                self.written += len(records)
+            for _ in batch:
+                self._queue.task_done()
+            if len(records) < len(batch):
+                return
+
+### END OF CLASS -  AttemptLog ###
+
+
+def read_header(path):
+    """Check a log file's header and return the byte offset of the first record"""
+    with open(path, 'rb') as file:
+        header = file.read(LOG_HEADER.size)
+    if len(header) < LOG_HEADER.size:
+        raise ValueError(f"{path} is not an attempt log")
+    magic, version, record_size = LOG_HEADER.unpack(header)
+    if magic != LOG_MAGIC:
+        raise ValueError(f"{path} is not an attempt log")
+    if version != LOG_VERSION or record_size != ATTEMPT_DTYPE.itemsize:
+        raise ValueError(f"{path} has log version {version} with {record_size}-byte records; "
+                         f"expected version {LOG_VERSION} with {ATTEMPT_DTYPE.itemsize}-byte records")
+    return LOG_HEADER.size
+
+
+def read_attempts(path):
+    """
+    Memory-map the records of an attempt log.
+
+    Returns a read-only structured array of ATTEMPT_DTYPE; a partly written
+    last record, as left by a crash, is ignored.
+    """
+    offset = read_header(path)
+    count = (os.path.getsize(path) - offset) // ATTEMPT_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=ATTEMPT_DTYPE)
+    return np.memmap(path, dtype=ATTEMPT_DTYPE, mode='r', offset=offset, shape=(count,))
+
+
+def character_stats(records, since=None):
+    """
+    Per-character accuracy and answer time for an array of attempt records.
+
+    Everything is computed with whole-array numpy operations, so millions of
+    records take a fraction of a second.
+
+    Args:
+        records (np.ndarray): Records as returned by read_attempts().
+        since (float, optional): Only count attempts from this time on.
+
+    Returns:
+        dict: For each target character, a dict with 'attempts', 'correct',
+            'accuracy', 'timed', 'mean_response_ms' and 'median_response_ms'
+            (the response times ignore attempts where it is unknown; 'timed'
+            counts the ones they are taken from).
+            Records whose target is not a Unicode code point are skipped.
+    """
+    if since is not None:
+        records = records[records['time'] >= since]
+    # A damaged record can hold any value; counting by code point needs it in Unicode's range
+    records = records[records['target'] <= sys.maxunicode]
+    targets = records['target']
+    if not len(targets):
+        return {}
+    # Group by code point directly; the counts are indexed by code point
+    if targets.max() < 1 << 16:
+        targets = targets.astype(np.uint16)  # lets argsort use a radix sort
+    response = records['response_ms']
+    attempts = np.bincount(targets)
+    hits = np.bincount(targets, weights=records['correct'])
+    timed = ~np.isnan(response)
+    timed_targets = targets[timed]
+    timed_response = response[timed]
+    timed_counts = np.bincount(timed_targets, minlength=len(attempts))
+    timed_sums = np.bincount(timed_targets, weights=timed_response, minlength=len(attempts))
+    grouped = timed_response[np.argsort(timed_targets, kind='stable')]
+    ends = np.cumsum(timed_counts)
+
+    stats = {}
+    for code_point in np.flatnonzero(attempts).tolist():
+        if code_point == 0:
+            continue
+        count = int(timed_counts[code_point])
+        run = grouped[ends[code_point] - count:ends[code_point]]
+        stats[chr(code_point)] = {
+            'attempts': int(attempts[code_point]),
+            'correct': int(hits[code_point]),
+            'accuracy': float(hits[code_point] / attempts[code_point]),
+            'timed': count,
+            'mean_response_ms': float(timed_sums[code_point] / count) if count else None,
+            'median_response_ms': float(np.median(run)) if count else None,
+        }
+    return stats
@@ -0,0 +1,326 @@
+import struct
+
+import numpy as np
+
+from MorseCode_Classes import MORSE_TREE
+
+WAV_FORMATS = {
+    (1, 1): np.uint8,     # 8-bit PCM is unsigned
+    (1, 2): np.int16,
+    (1, 4): np.int32,
+    (3, 4): np.float32,
+    (0xFFFE, 2): np.int16,  # WAVE_FORMAT_EXTENSIBLE, assumed PCM
+    (0xFFFE, 4): np.int32,
+}
+
+
+def open_wav(path):
+    """
+    Memory-map the samples of a WAV file.
+
+    Returns (samples, samplerate) where samples is a read-only np.memmap of
+    shape (frames, channels) in the file's own sample type.
+    """
+    with open(path, 'rb') as file:
+        riff, _, wave_id = struct.unpack('<4sI4s', file.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"{path} is not a WAV file")
+        fmt = None
+        while True:
+            header = file.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack('<HHIIHH', file.read(16))
+                file.seek(size - 16 + (size & 1), 1)
+            elif chunk_id == b'data':
+                offset = file.tell()
+                break
+            else:
+                file.seek(size + (size & 1), 1)
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    format_tag, channels, samplerate, _, block_align, bits = fmt
+    dtype = WAV_FORMATS.get((format_tag, bits // 8))
+    if dtype is None:
+        raise ValueError(f"Unsupported WAV format {format_tag} with {bits}-bit samples")
+    frames = size // block_align
+    samples = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(frames, channels))
+    return samples, samplerate
+
+
+def to_float(samples):
+    """Convert integer or float PCM frames to a mono float32 array in [-1, 1]."""
+    if samples.dtype == np.uint8:
+        data = (samples.astype(np.float32) - 128) / 128
+    elif samples.dtype.kind == 'i':
+        data = samples.astype(np.float32) / np.iinfo(samples.dtype).max
+    else:
+        data = samples.astype(np.float32)
+    if data.ndim > 1:
+        data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    return data
+
+
+class MorseAudioDecoder:
+    """
+    An incremental decoder for Morse code audio.
+
+    Samples are fed in chunks of any size.  Each chunk is cut into short
+    blocks and the tone level of every block is measured at once with a
+    single-bin DFT (the value a Goertzel filter computes), as one matrix
+    product.  The levels are keyed against a threshold that follows the
+    signal peak and noise floor, with hysteresis, and the resulting key-down
+    and key-up runs are timed in blocks.  Marks are classified as dits or
+    dahs against a running dit-length estimate that also learns from the
+    gaps between elements, and each finished character is looked up by
+    walking the shared MORSE_TREE.
+
+    Only the current partial block, the current run and the marks of the
+    current character are kept between chunks, so memory is constant and
+    a character is emitted about two dits after its last element ends.
+    The one exception is the start: levels are held, for FLOOR_SECONDS at
+    most, until they include quiet blocks to set the noise floor from, as
+    a slow dah can fill a whole chunk.
+
+    Attributes:
+        samplerate (int): Sample rate of the audio.
+        freq (float): Tone frequency in Hz, or None to detect it from the first chunk with a signal.
+        block_size (int): Samples per level measurement.
+        dit_blocks (float): Current dit-length estimate in blocks, or None before the first mark.
+        char_gap_blocks (float): Current character-gap estimate in blocks, or None before the first gap.
+        unknown (str): Character emitted for a code that is not in the tree.
+    """
+    SQUELCH = 4.0  # minimum ratio of the tone peak to the noise floor
+    FLOOR_SECONDS = 4.0  # audio held back at most while looking for quiet blocks to set the floor from
+    CALIBRATION_RUNS = 48  # runs held back at most while the dit length is unknown
+
+    def __init__(self, samplerate=44100, freq=None, block_seconds=0.004, wpm=None,
+                 unknown='#', tree=MORSE_TREE):
+        self.samplerate = samplerate
+        self.block_size = max(1, round(block_seconds * samplerate))
+        self.dit_blocks = 1.2 / wpm / (self.block_size / samplerate) if wpm else None
+        self.char_gap_blocks = None
+        self.unknown = unknown
+        self.tree = tree
+        self.freq = None
+        if freq is not None:
+            self.set_frequency(freq)
+
+        # Peak follower halves over about two seconds
+        self._decay = 0.5 ** (self.block_size / samplerate / 2.0)
+        self._peak = 0.0
+        self._floor = None
+        self._held = np.zeros(0, dtype=np.float32)
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self._key_down = False
+        self._run = 0
+        self._marks = []
+        self._gaps = []
+        self._calibration = []
+        self._word_pending = False
+
+    def set_frequency(self, freq):
+        self.freq = freq
+        n = np.arange(self.block_size)
+        angle = 2 * np.pi * freq * n / self.samplerate
+        self._basis = np.stack([np.cos(angle), np.sin(angle)], axis=1).astype(np.float32)
+
+    def detect_frequency(self, samples, low=200.0, high=3000.0):
+        """Return the strongest frequency between low and high Hz."""
+        spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+        freqs = np.fft.rfftfreq(len(samples), 1 / self.samplerate)
+        band = (freqs >= low) & (freqs <= high)
+        return float(freqs[band][np.argmax(spectrum[band])])
+
+    def levels(self, samples):
+        """Return the tone amplitude of each whole block in samples."""
+        blocks = samples[:len(samples) // self.block_size * self.block_size]
+        blocks = blocks.reshape(-1, self.block_size)
+        parts = blocks @ self._basis
+        return np.hypot(parts[:, 0], parts[:, 1]) * (2.0 / self.block_size)
+
+    def feed(self, samples):
+        """Decode a chunk of float samples and return any newly completed text."""
+        samples = np.concatenate((self._leftover, np.asarray(samples, dtype=np.float32)))
+        whole = len(samples) // self.block_size * self.block_size
+        self._leftover = samples[whole:].copy()
+        if whole == 0:
+            return ''
+        if self.freq is None:
+            if np.abs(samples[:whole]).max() < 1e-3:
+                self._run += whole // self.block_size
+                return ''
+            self.set_frequency(self.detect_frequency(samples[:whole]))
+
+        keyed = self._key(self.levels(samples[:whole]))
+        return self._time_runs(keyed)
+
+    def flush(self):
+        """Finish decoding at the end of the audio and return the remaining text."""
+        out = []
+        if len(self._held):
+            out.append(self._time_runs(self._key(self._held[:0], final=True)))
+        if self._key_down:
+            out.append(self._end_run(True, self._run))
+            self._key_down = False
+        if self._calibration:
+            out.append(self._calibrate(final=True))
+        if self._marks:
+            out.append(self._end_character())
+        self._run = 0
+        self._leftover = np.zeros(0, dtype=np.float32)
+        return ''.join(out)
+
+    def _key(self, levels, final=False):
+        """
+        Turn block levels into key-down flags with an adaptive, hysteretic threshold.
+
+        Until the noise floor is known the levels are held back, and their
+        flags are returned with those of the chunk that sets it.
+        """
+        if len(levels):
+            self._peak = max(float(levels.max()), self._peak * self._decay ** len(levels))
+        if self._floor is None:
+            # A chunk can be all tone at low speeds, so wait for clearly quiet blocks,
+            # falling back to the median of everything held if none come
+            levels = np.concatenate((self._held, levels))
+            low = float(np.percentile(levels, 10))
+            if self._peak > 20 * low:
+                self._floor = low
+            elif final or len(levels) * self.block_size >= self.FLOOR_SECONDS * self.samplerate:
+                self._floor = float(np.median(levels))
+            else:
+                self._held = levels
+                return np.zeros(0, dtype=bool)
+            self._held = np.zeros(0, dtype=np.float32)
+        count = len(levels)
+        seconds = count * self.block_size / self.samplerate
+        # The noise floor follows the median of the blocks below the keying
+        # threshold: it drops at once and rises with a one second time constant
+        quiet = levels[levels < self._floor + 0.5 * (self._peak - self._floor)]
+        if len(quiet):
+            median = float(np.median(quiet))
+            if median < self._floor:
+                self._floor = median
+            else:
+                self._floor += (median - self._floor) * (1 - np.exp(-seconds))
+        span = self._peak - self._floor
+        if span < 1e-4 or self._peak < self.SQUELCH * self._floor:
+            return np.zeros(count, dtype=bool)
+
+        high = self._floor + 0.55 * span
+        low = self._floor + 0.45 * span
+        # 1 above the high threshold, 0 below the low one, -1 in between
+        decided = np.where(levels > high, 1, np.where(levels < low, 0, -1))
+        decided = np.concatenate(([int(self._key_down)], decided))
+        last = np.where(decided >= 0, np.arange(len(decided)), 0)
+        np.maximum.accumulate(last, out=last)
+        return decided[last][1:].astype(bool)
+
+    def _time_runs(self, keyed):
+        out = []
+        changes = np.flatnonzero(keyed[1:] != keyed[:-1]) + 1
+        if len(keyed) and keyed[0] != self._key_down:
+            changes = np.concatenate(([0], changes))
+        previous = 0
+        for change in changes.tolist():
+            self._run += change - previous
+            previous = change
+            out.append(self._end_run(self._key_down, self._run))
+            self._key_down = not self._key_down
+            self._run = 0
+        self._run += len(keyed) - previous
+
+        # Emit a finished character while its trailing gap is still running
+        if (not self._key_down and self._marks and self.dit_blocks
+                and self._run >= 2 * self.dit_blocks):
+            out.append(self._end_character())
+        return ''.join(out)
+
+    def _end_run(self, key_down, blocks):
+        """Handle a finished key-down or key-up run and return any completed text."""
+        if self.dit_blocks is None:
+            if key_down or self._calibration:  # leading silence is ignored
+                self._calibration.append((key_down, blocks))
+                return self._calibrate()
+            return ''
+        if key_down:
+            if len(self._marks) <= self.tree.depth:
+                self._marks.append(blocks)
+            return ''
+        return self._end_gap(blocks)
+
+    def _calibrate(self, final=False):
+        """
+        Fix the dit length from the first runs, then replay them.
+
+        A lone mark could be a dit or a dah, so runs are held until the
+        marks include both lengths, or a gap shorter than a mark shows the
+        marks were dahs.  Otherwise the shortest run is taken as the dit
+        once the buffer is full or the audio ends.
+        """
+        marks = [blocks for key_down, blocks in self._calibration if key_down]
+        gaps = [blocks for key_down, blocks in self._calibration if not key_down]
+        shortest = min(marks)
+        if max(marks) >= 2 * shortest:
+            self.dit_blocks = float(shortest)
+        elif gaps and min(gaps) < 0.5 * shortest:
+            self.dit_blocks = float(min(gaps))
+        elif final or len(self._calibration) >= self.CALIBRATION_RUNS:
+            self.dit_blocks = float(min(marks + gaps))
+        else:
+            return ''
+        runs, self._calibration = self._calibration, []
+        return ''.join(self._end_run(key_down, blocks) for key_down, blocks in runs)
+
+    def _end_gap(self, blocks):
+        if not self._marks and not self._word_pending:
+            return ''  # silence before the first character says nothing about the spacing
+        if blocks < 2 * self.dit_blocks:
+            if self._marks:
+                self._gaps.append(blocks)
+            return ''
+        out = self._end_character() if self._marks else ''
+        # Word gaps are 7/3 of a character gap; tracking the character gap
+        # separately keeps Farnsworth-spaced audio from splitting every letter
+        char_gap = self.char_gap_blocks or 3 * self.dit_blocks
+        word = blocks >= 5 / 3 * char_gap
+        self.char_gap_blocks = 0.7 * char_gap + 0.3 * (blocks * 3 / 7 if word else blocks)
+        if self._word_pending and word:
+            out += ' '  # sent once the next word starts, so text never ends in a space
+        self._word_pending = False
+        return out
+
+    def _end_character(self):
+        marks = np.asarray(self._marks, dtype=np.float64)
+        dahs = marks >= 2 * self.dit_blocks
+        node = 0
+        for dah in dahs.tolist():
+            node = self.tree.child(node, '-' if dah else '.')
+        char = self.tree.char_at(node) or self.unknown
+
+        # Learn the speed from this character's elements and gaps (one dit each)
+        units = np.concatenate((marks[~dahs], marks[dahs] / 3, self._gaps))
+        self.dit_blocks = 0.7 * self.dit_blocks + 0.3 * float(units.mean())
+        self._marks = []
+        self._gaps = []
+        self._word_pending = True
+        return char
+
+### END OF CLASS -  MorseAudioDecoder ###
+
+
+def decode_wav(path, chunk_seconds=0.5, **decoder_args):
+    """Decode a WAV file incrementally, yielding text as it is recognised."""
+    samples, samplerate = open_wav(path)
+    decoder = MorseAudioDecoder(samplerate, **decoder_args)
+    step = max(1, int(chunk_seconds * samplerate))
+    for start in range(0, len(samples), step):
+        text = decoder.feed(to_float(samples[start:start + step]))
+        if text:
+            yield text
+    text = decoder.flush()
+    if text:
+        yield text
@@ -0,0 +1,441 @@
+import queue
+import sys
+import threading
+import time
+import wave
+
+import numpy as np
+import pygame
+
+from MorseCode_Classes import MessageRenderer, MessageStream
+
+
+class AudioBackend:
+    """
+    Base class for the audio outputs driven by AudioEngine.
+
+    A backend is opened once with the MorseCodePlayer whose settings it
+    plays, then asked to play whole messages from the engine's worker
+    thread.  The default play() renders the message through the player and
+    hands it to write() in chunks, checking for cancellation between chunks.
+    play_stream() does the same for a MessageStream, rendering each chunk
+    only as the output is ready for it.
+
+    Attributes:
+        chunk_frames (int): Number of frames handed to write() at a time.
+        player (MorseCodePlayer): The player supplied to open().
+        renderer (MessageRenderer): Renders streams at the output's sample rate.
+        on_start (callable): Called with the message as its first samples are handed to the output, or None.
+    """
+    name = "base"
+
+    def __init__(self, chunk_frames=1024):
+        self.chunk_frames = chunk_frames
+        self.player = None
+        self.renderer = None
+        self.on_start = None
+
+    def open(self, player):
+        self.player = player
+        self.renderer = player.renderer
+
+    def play(self, message, is_cancelled):
+        self.write_buffers(self.player.message_buffers(message), message, is_cancelled)
+
+    def play_samples(self, samples, label, is_cancelled):
+        """Play float32 samples at the renderer's sample rate, such as a mix of several stations"""
+        self.write_buffers([np.ascontiguousarray(samples, dtype=np.float32)], label, is_cancelled)
+
+    def write_buffers(self, buffers, label, is_cancelled):
+        chunk_bytes = 4 * self.chunk_frames  # float32 mono
+        started = False
+        for buffer in buffers:
+            view = memoryview(buffer).cast('B')
+            for offset in range(0, len(view), chunk_bytes):
+                if is_cancelled():
+                    return
+                if not started:
+                    self.started(label)
+                    started = True
+                self.write(view[offset:offset + chunk_bytes])
+
+    def play_stream(self, stream, is_cancelled):
+        started = False
+        for chunk in stream:
+            if is_cancelled():
+                return
+            if not started:
+                self.started(stream.message)
+                started = True
+            self.write(memoryview(chunk).cast('B'))
+
+    def started(self, message):
+        if self.on_start is not None:
+            self.on_start(message)
+
+    def write(self, data):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+### END OF CLASS -  AudioBackend ###
+
+
+class PyAudioBackend(AudioBackend):
+    """An AudioBackend writing to one persistent PyAudio float32 stream."""
+    name = "pyaudio"
+
+    def open(self, player):
+        import pyaudio
+        super().open(player)
+        self._pyaudio = pyaudio.PyAudio()
+        try:
+            self._stream = self._pyaudio.open(format=pyaudio.paFloat32,
+                                              channels=1,
+                                              rate=player.samplerate,
+                                              output=True,
+                                              frames_per_buffer=self.chunk_frames)
+        except OSError:
+            self._pyaudio.terminate()
+            raise
+
+    def write(self, data):
+        self._stream.write(bytes(data))
+
+    def close(self):
+        self._stream.stop_stream()
+        self._stream.close()
+        self._pyaudio.terminate()
+
+### END OF CLASS -  PyAudioBackend ###
+
+
+class MixerBackend(AudioBackend):
+    """
+    An AudioBackend that plays pre-built pygame.mixer Sounds.
+
+    A Sound is built for every character when the backend is opened, so
+    playing a character is a single channel trigger.  Longer messages are
+    rendered once and kept in a small cache of recent Sounds.
+
+    Attributes:
+        sounds (dict): Pre-built Sound for each character in the player's Morse code table.
+        max_messages (int): Number of multi-character Sounds kept.
+    """
+    name = "mixer"
+
+    def __init__(self, chunk_frames=1024, max_messages=16):
+        super().__init__(chunk_frames)
+        self.sounds = {}
+        self.max_messages = max_messages
+        self._messages = {}
+
+    def open(self, player):
+        super().open(player)
+        if pygame.mixer.get_init() is None:
+            pygame.mixer.init(frequency=player.samplerate, size=-16, channels=1)
+        frequency, self._size, self._channels = pygame.mixer.get_init()
+        renderer = player.renderer
+        self.renderer = MessageRenderer(player.morse_code, wpm=renderer.wpm,
+                                         farnsworth_wpm=renderer.farnsworth_wpm,
+                                         freq=renderer.freq, samplerate=frequency)
+        if frequency == player.samplerate:
+            # The player's bank has them already, possibly mapped from a WaveformStore
+            self.sounds = {char: self.make_sound(np.frombuffer(player.character_buffer(char), dtype=np.float32))
+                           for char in player.morse_code}
+        else:
+            self.sounds = {char: self.make_sound(self.renderer.render(char))
+                           for char in player.morse_code}
+
+    def make_sound(self, samples):
+        """Convert float32 samples into a Sound in the mixer's format."""
+        if self._size == 32:
+            pcm = samples.astype(np.float32)
+        else:
+            pcm = (samples * 32767).astype(np.int16)
+        if self._channels > 1:
+            pcm = np.repeat(pcm[:, None], self._channels, axis=1)
+        return pygame.mixer.Sound(buffer=pcm.tobytes())
+
+    def sound_for(self, message):
+        sound = self.sounds.get(message.upper())
+        if sound is None:
+            sound = self._messages.pop(message, None)
+            if sound is None:
+                sound = self.make_sound(self.renderer.render(message))
+            self._messages[message] = sound
+            if len(self._messages) > self.max_messages:
+                del self._messages[next(iter(self._messages))]
+        return sound
+
+    def play(self, message, is_cancelled):
+        self.play_sound(self.sound_for(message), message, is_cancelled)
+
+    def play_samples(self, samples, label, is_cancelled):
+        self.play_sound(self.make_sound(samples), label, is_cancelled)
+
+    def play_sound(self, sound, label, is_cancelled):
+        channel = sound.play()
+        if channel is None:
+            return
+        self.started(label)
+        while channel.get_busy():
+            if is_cancelled():
+                channel.stop()
+                return
+            time.sleep(0.005)
+
+    def play_stream(self, stream, is_cancelled):
+        """Play a stream by keeping the next chunk's Sound queued behind the one playing"""
+        channel = None
+        for chunk in stream:
+            sound = self.make_sound(chunk)
+            if channel is None:
+                channel = sound.play()
+                if channel is None:
+                    return
+                self.started(stream.message)
+                continue
+            while channel.get_queue() is not None:
+                if is_cancelled():
+                    channel.stop()
+                    return
+                time.sleep(0.002)
+            channel.queue(sound)
+        while channel is not None and channel.get_busy():
+            if is_cancelled():
+                channel.stop()
+                return
+            time.sleep(0.005)
+
+    def close(self):
+        pygame.mixer.stop()
+
+### END OF CLASS -  MixerBackend ###
+
+
+class NullBackend(AudioBackend):
+    """
+    An AudioBackend with no sound device.
+
+    Audio is rendered and discarded, or appended to a 16-bit mono WAV file
+    when a path is given, so the game can run headless and recordings can
+    be checked offline.
+
+    Attributes:
+        path (str): WAV file to write, or None to discard audio.
+    """
+    name = "null"
+
+    def __init__(self, path=None, chunk_frames=1024):
+        super().__init__(chunk_frames)
+        self.path = path
+        self._wav = None
+
+    def open(self, player):
+        super().open(player)
+        if self.path:
+            self._wav = wave.open(self.path, 'wb')
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(player.samplerate)
+
+    def write(self, data):
+        if self._wav is not None:
+            samples = np.frombuffer(data, dtype=np.float32)
+            self._wav.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+### END OF CLASS -  NullBackend ###
+
+
+AUDIO_BACKENDS = {
+    'mixer': MixerBackend,
+    'pyaudio': PyAudioBackend,
+    'null': NullBackend,
+}
+
+
+def create_backend(name, path=None):
+    """Create an audio backend by name ('mixer', 'pyaudio', 'null' or 'wav')."""
+    if name == 'wav':
+        return NullBackend(path)
+    if name not in AUDIO_BACKENDS:
+        raise ValueError(f"Unknown audio backend: {name}")
+    return AUDIO_BACKENDS[name]()
+
+
+class AudioEngine:
+    """
+    A background audio engine for Morse code playback.
+
+    The engine opens one AudioBackend up front and plays queued messages on
+    a worker thread.  The backend checks for cancellation while it plays,
+    so cancel() takes effect within one chunk and the game loop never
+    waits on audio.  Long texts are best played with stream(), which
+    renders them a chunk at a time as they play and can be paused,
+    resumed and moved to another character.  If the backend cannot be opened the engine falls back
+    to a NullBackend.
+
+    Attributes:
+        player (MorseCodePlayer): Supplies the sample rate and message buffers.
+        backend (AudioBackend): The output the worker thread plays through.
+        on_start (callable): Called on the worker thread with each message as its first
+            samples reach the backend, or None.
+    """
+
+    def __init__(self, player, backend=None):
+        self.player = player
+        self.backend = backend if backend is not None else PyAudioBackend()
+        self.on_start = None
+        self.current_stream = None
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        self._thread = None
+
+    def start(self):
+        """Open the backend and start the worker thread if not already running."""
+        if self._thread is None:
+            try:
+                self.backend.open(self.player)
+            except (OSError, ImportError, pygame.error) as error:
+                print(f"Audio backend '{self.backend.name}' unavailable: {error}", file=sys.stderr)
+                self.backend = NullBackend()
+                self.backend.open(self.player)
+            self.backend.on_start = self._started
+            self._thread = threading.Thread(target=self._run, name="AudioEngine", daemon=True)
+            self._thread.start()
+
+    def play(self, message):
+        """Queue a message for playback and return immediately."""
+        if not message:
+            return
+        self.start()
+        with self._lock:
+            self._pending += 1
+            generation = self._generation
+        self._jobs.put((generation, message))
+
+    @property
+    def samplerate(self):
+        """Sample rate that play_samples() expects, which the backend may have changed from the player's"""
+        self.start()
+        return self.backend.renderer.samplerate
+
+    def play_samples(self, samples, label=""):
+        """Queue float32 samples at samplerate for playback and return immediately."""
+        self.start()
+        with self._lock:
+            self._pending += 1
+            generation = self._generation
+        self._jobs.put((generation, (label, samples)))
+
+    def stream(self, message, start=0, chunk_frames=None):
+        """
+        Queue a message to be rendered chunk by chunk while it plays and
+        return immediately with its MessageStream, through which it can be
+        paused, resumed or seeked.
+        """
+        self.start()
+        stream = MessageStream(self.backend.renderer, message,
+                               chunk_frames or self.backend.chunk_frames, start)
+        with self._lock:
+            self._pending += 1
+            generation = self._generation
+        self._jobs.put((generation, stream))
+        return stream
+
+    def pause(self):
+        """Pause the message being streamed, if any, at the next chunk."""
+        if self.current_stream is not None:
+            self.current_stream.pause()
+
+    def resume(self):
+        if self.current_stream is not None:
+            self.current_stream.resume()
+
+    def seek(self, index):
+        """Move the message being streamed to the character at index."""
+        if self.current_stream is not None:
+            self.current_stream.seek(index)
+
+    def flush(self):
+        """Drop queued messages but let the current one finish."""
+        while True:
+            try:
+                self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            self._job_done()
+
+    def cancel(self):
+        """Drop queued messages and stop the current one at the next chunk."""
+        with self._lock:
+            self._generation += 1
+            stream = self.current_stream
+        if stream is not None:
+            stream.close()  # wakes a paused stream so the worker can move on
+        self.flush()
+
+    @property
+    def is_playing(self):
+        """True while a message is queued or being played."""
+        return self._pending > 0
+
+    def wait(self, timeout=None):
+        """Block until all queued audio has played. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self):
+        """Cancel playback, stop the worker thread and close the backend."""
+        if self._thread is not None:
+            self.cancel()
+            self._jobs.put(None)
+            self._thread.join()
+            self._thread = None
+            self.backend.close()
+
+    def _started(self, message):
+        if self.on_start is not None:
+            self.on_start(message)
+
+    def _job_done(self):
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            generation, message = job
+            is_cancelled = lambda: generation != self._generation
+            try:
+                # Published before the check, so cancel() either sees the stream or wins the check
+                if isinstance(message, MessageStream):
+                    self.current_stream = message
+                if generation != self._generation:
+                    continue
+                if isinstance(message, MessageStream):
+                    self.backend.play_stream(message, is_cancelled)
+                elif isinstance(message, tuple):
+                    label, samples = message
+                    self.backend.play_samples(samples, label, is_cancelled)
+                else:
+                    self.backend.play(message, is_cancelled)
+            finally:
+                self.current_stream = None
+                self._job_done()
+
+### END OF CLASS -  AudioEngine ###
@@ -0,0 +1,186 @@
+import functools
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import numpy as np
+
+from Channel_Classes import ChannelConditions, ChannelSimulator
+from MorseCode_Classes import MORSE_CODE, MessageRenderer
+
+WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')  # RIFF header, fmt chunk and data chunk header
+
+
+@dataclass
+class RenderJob:
+    """One message to render, with its own speed, pitch and, optionally, band conditions"""
+    name: str
+    text: str
+    wpm: float = 20
+    farnsworth_wpm: Optional[float] = None
+    freq: float = 700
+    samplerate: int = 44100
+    channel: Optional[dict] = None  # ChannelConditions fields; None renders a clean signal
+    seed: Optional[int] = None  # seeds the channel's noise, fading and jitter
+
+
+def read_jobs(path, defaults=None):
+    """
+    Read render jobs from a file.
+
+    A .jsonl file holds one JSON object per line with a 'text' and any of
+    the other RenderJob fields; any other file holds one message per line.
+    Blank lines are skipped and jobs without a name are numbered by line.
+    defaults supplies the fields a line leaves out; a line's 'channel'
+    fields are added to the default channel's, and a default 'seed' is
+    offset by the line number so every job gets its own.
+    """
+    defaults = dict(defaults or {})
+    jobs = []
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            if path.endswith('.jsonl'):
+                try:
+                    fields = json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"{path}:{number}: {error}") from None
+                if 'text' not in fields:
+                    raise ValueError(f"{path}:{number}: no 'text' field")
+            else:
+                fields = {'text': line}
+            channel = defaults.get('channel')
+            if channel is not None and fields.get('channel') is not None:
+                fields['channel'] = {**channel, **fields['channel']}
+            if 'seed' not in fields and defaults.get('seed') is not None:
+                fields['seed'] = defaults['seed'] + number
+            fields = {**defaults, **fields}
+            fields.setdefault('name', f"{number:06d}")
+            try:
+                jobs.append(RenderJob(**fields))
+            except TypeError as error:
+                raise ValueError(f"{path}:{number}: {error}") from None
+    return jobs
+
+
+@functools.lru_cache(maxsize=32)
+def renderer_for(wpm, farnsworth_wpm, freq, samplerate):
+    """One MessageRenderer per distinct setting, kept for the life of a worker"""
+    return MessageRenderer(MORSE_CODE, wpm=wpm, farnsworth_wpm=farnsworth_wpm,
+                           freq=freq, samplerate=samplerate)
+
+
+def render_into(renderer, text, out):
+    """
+    Render text straight into a preallocated array, a chunk at a time.
+
+    out is float32 for samples in [-1, 1] or int16 for 16-bit PCM; it must
+    hold exactly the message's samples.  Returns out.
+    """
+    scale = 32767 if out.dtype == np.int16 else 1
+    position = 0
+    for chunk in renderer.stream(text, chunk_frames=65536):
+        end = position + len(chunk)
+        np.multiply(chunk, scale, out=out[position:end], casting='unsafe')
+        position = end
+    if position != len(out):
+        raise ValueError(f"rendered {position} samples into an array of {len(out)}")
+    return out
+
+
+def create_wav(path, frames, samplerate):
+    """Create a 16-bit mono WAV file of the given length and memory-map its samples"""
+    data_bytes = 2 * frames
+    with open(path, 'wb') as file:
+        file.write(WAV_HEADER.pack(b'RIFF', 36 + data_bytes, b'WAVE',
+                                   b'fmt ', 16, 1, 1, samplerate, 2 * samplerate, 2, 16,
+                                   b'data', data_bytes))
+        file.truncate(WAV_HEADER.size + data_bytes)
+    if frames == 0:
+        return np.zeros(0, dtype=np.int16)
+    return np.memmap(path, dtype='<i2', mode='r+', offset=WAV_HEADER.size, shape=(frames,))
+
+
+def create_npy(path, frames):
+    """Create a float32 .npy file of the given length and memory-map it"""
+    return np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(frames,))
+
+
+def render_job(job, directory, format='wav'):
+    """
+    Render one job to directory/<name>.<format> and return its manifest entry.
+
+    A clean message's file is sized from its layout first and the samples
+    are rendered straight into its memory map, so no full-length buffer is
+    built.  A message with a channel is rendered whole by ChannelSimulator
+    and copied into the map once.
+    """
+    renderer = renderer_for(job.wpm, job.farnsworth_wpm, job.freq, job.samplerate)
+    samples = None
+    if job.channel is not None:
+        simulator = ChannelSimulator(ChannelConditions(**job.channel), job.seed)
+        samples = simulator.render(renderer, job.text)
+        frames = len(samples)
+    else:
+        frames = int(renderer.segment_lengths(job.text).sum())
+    path = os.path.join(directory, f"{job.name}.{format}")
+    out = create_wav(path, frames, job.samplerate) if format == 'wav' else create_npy(path, frames)
+    if samples is None:
+        render_into(renderer, job.text, out)
+    else:
+        np.multiply(samples, 32767 if out.dtype == np.int16 else 1, out=out, casting='unsafe')
+    if isinstance(out, np.memmap):
+        out.flush()
+    del out
+    return {
+        **asdict(job),
+        'file': os.path.basename(path),
+        'frames': frames,
+        'seconds': frames / job.samplerate,
+        'bytes': os.path.getsize(path),
+    }
+
+
+def render_batch(jobs, directory, format='wav', workers=None):
+    """
+    Render jobs across a pool of worker processes.
+
+    Yields each job's manifest entry in job order as it completes.  Jobs
+    are handed out in small batches, so the pool stays busy whatever the
+    mix of message lengths.  workers=1 renders in this process.
+    """
+    os.makedirs(directory, exist_ok=True)
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("job names must be unique; they name the output files")
+    for name in names:
+        if not name or os.path.basename(name) != name:
+            raise ValueError(f"job name {name!r} is not a plain file name")
+    if workers == 1:
+        for job in jobs:
+            yield render_job(job, directory, format)
+        return
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(32, len(jobs) // (4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_job, jobs, [directory] * len(jobs), [format] * len(jobs),
+                            chunksize=chunksize)
+
+
+def write_manifest(path, entries, settings):
+    """Write the manifest JSON: the batch settings and one entry per rendered file"""
+    entries = list(entries)
+    manifest = {
+        'settings': settings,
+        'count': len(entries),
+        'seconds': sum(entry['seconds'] for entry in entries),
+        'items': entries,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=1)
+    return manifest
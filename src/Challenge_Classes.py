@@ -0,0 +1,162 @@
+import random
+
+from MorseCode_Classes import PRACTICE_CHARACTERS
+
+
+class FenwickTree:
+    """
+    A binary indexed tree of non-negative weights.
+
+    Holds prefix sums so that changing one weight and finding the item at
+    a given point of the cumulative weight both take O(log n), whatever the
+    number of items.  Items can be appended; the tree doubles its capacity
+    and rebuilds in O(n) when full, so appends are O(log n) amortised.
+
+    Attributes:
+        values (list): The current weight of each item.
+        total (float): Sum of all weights.
+    """
+    def __init__(self, weights=()):
+        self.values = [float(weight) for weight in weights]
+        self._build(max(1, len(self.values)))
+
+    def _build(self, capacity):
+        """Rebuild the tree for the given capacity in O(n)"""
+        tree = [0.0] * (capacity + 1)
+        tree[1:len(self.values) + 1] = self.values
+        for index in range(1, capacity + 1):
+            parent = index + (index & -index)
+            if parent <= capacity:
+                tree[parent] += tree[index]
+        self._tree = tree
+        self._capacity = capacity
+        self._top = 1 << (capacity.bit_length() - 1)
+        self.total = sum(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def add(self, index, delta):
+        self.values[index] += delta
+        self.total += delta
+        position = index + 1
+        while position <= self._capacity:
+            self._tree[position] += delta
+            position += position & -position
+
+    def set(self, index, weight):
+        self.add(index, float(weight) - self.values[index])
+
+    def append(self, weight):
+        """Add an item at the end and return its index"""
+        if len(self.values) == self._capacity:
+            self.values.append(float(weight))
+            self._build(2 * self._capacity)
+        else:
+            self.values.append(0.0)
+            self.add(len(self.values) - 1, float(weight))
+        return len(self.values) - 1
+
+    def prefix_sum(self, count):
+        """Sum of the first count weights"""
+        result = 0.0
+        while count > 0:
+            result += self._tree[count]
+            count -= count & -count
+        return result
+
+    def find(self, point):
+        """
+        Return the index of the item whose cumulative weight range holds
+        point, for 0 <= point < total
+        """
+        position = 0
+        step = self._top
+        while step:
+            child = position + step
+            if child <= self._capacity and self._tree[child] <= point:
+                position = child
+                point -= self._tree[child]
+            step >>= 1
+        # Rounding can walk past the last item with a weight
+        return min(position, len(self.values) - 1)
+
+### END OF CLASS -  FenwickTree ###
+
+
+class AdaptiveSampler:
+    """
+    Picks practice characters, favouring the ones the player finds hard.
+
+    Each character's weight grows with its recent miss rate and with how
+    much longer than FAST_RESPONSE the player takes to answer it, so missed
+    and slow characters come up more often.  Weights are kept in a
+    FenwickTree, so a draw and an update are both O(log n) in the size of
+    the alphabet.  The random generator is private and seedable, so a
+    sequence of challenges can be reproduced.
+
+    Attributes:
+        characters (list): The characters that can be drawn.
+        tree (FenwickTree): Current weight of each character.
+        miss_rate (list): Exponential moving average of misses (1) and matches (0) per character.
+        response_time (list): Exponential moving average of answer time per character, or None.
+        rng (random.Random): Generator for the draws.
+    """
+    BASE_WEIGHT = 1.0
+    MISS_BOOST = 4.0  # extra weight for a character that is always missed
+    SLOW_BOOST = 1.0  # extra weight per second beyond FAST_RESPONSE
+    FAST_RESPONSE = 3.0  # answer time in seconds that counts as known
+    SMOOTHING = 0.3  # weight of the newest outcome in the moving averages
+
+    def __init__(self, characters=PRACTICE_CHARACTERS, seed=None):
+        self.characters = []
+        self._index = {}
+        self.miss_rate = []
+        self.response_time = []
+        self.tree = FenwickTree()
+        self.rng = random.Random(seed)
+        for char in characters:
+            self.add_character(char)
+
+    def add_character(self, char):
+        """Make a character drawable at the base weight"""
+        if char in self._index:
+            return
+        self._index[char] = len(self.characters)
+        self.characters.append(char)
+        self.miss_rate.append(0.0)
+        self.response_time.append(None)
+        self.tree.append(self.BASE_WEIGHT)
+
+    def weight(self, index):
+        weight = self.BASE_WEIGHT + self.MISS_BOOST * self.miss_rate[index]
+        response_time = self.response_time[index]
+        if response_time is not None and response_time > self.FAST_RESPONSE:
+            weight += self.SLOW_BOOST * (response_time - self.FAST_RESPONSE)
+        return weight
+
+    def record(self, char, correct, response_time=None):
+        """Update a character's weight from the outcome of one challenge"""
+        index = self._index.get(char)
+        if index is None:
+            return
+        alpha = self.SMOOTHING
+        self.miss_rate[index] += alpha * ((0.0 if correct else 1.0) - self.miss_rate[index])
+        if response_time is not None:
+            previous = self.response_time[index]
+            self.response_time[index] = (response_time if previous is None
+                                         else previous + alpha * (response_time - previous))
+        self.tree.set(index, self.weight(index))
+
+    def draw(self):
+        return self.characters[self.tree.find(self.rng.random() * self.tree.total)]
+
+    def probabilities(self):
+        """Current chance of drawing each character"""
+        total = self.tree.total
+        return {char: self.tree[index] / total for index, char in enumerate(self.characters)}
+
+### END OF CLASS -  AdaptiveSampler ###
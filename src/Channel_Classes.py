@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class ChannelConditions:
+    """
+    Band conditions to simulate; the defaults give a clean signal with soft keying.
+
+    Attributes:
+        snr_db (float): Tone power over noise power in dB, or None for no noise.
+        noise_bandwidth (float): Width in Hz of the noise band around the tone, or None for white noise.
+        qsb_depth (float): Fading depth from 0 (none) to 1 (fades out completely).
+        qsb_rate (float): Typical fading rate in Hz.
+        chirp_hz (float): Frequency offset at key-down, decaying through each element.
+        chirp_time (float): Time constant of the chirp decay in seconds.
+        jitter (float): Standard deviation of element and gap lengths, as a fraction of each.
+        rise_time (float): Raised-cosine rise and fall time of each element in seconds.
+    """
+    snr_db: Optional[float] = None
+    noise_bandwidth: Optional[float] = None
+    qsb_depth: float = 0.0
+    qsb_rate: float = 0.2
+    chirp_hz: float = 0.0
+    chirp_time: float = 0.01
+    jitter: float = 0.0
+    rise_time: float = 0.005
+
+
+class ChannelSimulator:
+    """
+    Renders Morse code as it might be heard on the air.
+
+    A whole message is produced by a fixed number of whole-array numpy
+    steps.  The renderer's tone/gap lengths are jittered and expanded into
+    a keying gate; the raised-cosine edges and the chirp only touch the
+    samples just after each key-down and before each key-up, through one
+    fancy-indexed assignment each; fading is computed at a low control
+    rate and interpolated; band-limited noise is drawn directly in the
+    frequency domain.  There is no per-element or per-sample Python loop,
+    so impairments cost about as much again as the plain rendering.  All
+    randomness comes from one seedable generator.
+
+    Attributes:
+        conditions (ChannelConditions): The impairments applied.
+        rng (np.random.Generator): Source of the jitter, fading and noise.
+    """
+    FADING_CONTROL_RATE = 100  # fading gain points per second, interpolated between
+    NOISE_BLOCK = 1 << 14  # samples per band-limited noise block
+    CHIRP_SPAN = 8  # chirp time constants applied after each key-down
+
+    def __init__(self, conditions=None, seed=None):
+        self.conditions = conditions if conditions is not None else ChannelConditions()
+        self.rng = np.random.default_rng(seed)
+
+    def render(self, renderer, message):
+        """Render a message through the channel as float32 samples in [-1, 1]"""
+        lengths = renderer.segment_lengths(message)
+        if not len(lengths):
+            return np.zeros(0, dtype=np.float32)
+        samplerate = renderer.samplerate
+        lengths = self.jitter(lengths)
+        ends = np.cumsum(lengths)
+        tone_starts = (ends - lengths)[::2]
+        tone_lengths = lengths[::2]
+
+        gate = np.repeat((np.arange(len(lengths)) % 2 == 0).astype(np.float32), lengths)
+        self.shape_edges(gate, tone_starts, tone_lengths, samplerate)
+        phase = (2 * np.pi * renderer.freq / samplerate) * np.arange(len(gate))
+        self.add_chirp(phase, tone_starts, tone_lengths, samplerate)
+        samples = np.sin(phase).astype(np.float32)
+        samples *= gate
+        return self.impair(samples, samplerate, renderer.freq)
+
+    def impair(self, samples, samplerate, freq):
+        """Apply fading and noise to already rendered samples, returning float32 in [-1, 1]"""
+        samples = np.array(samples, dtype=np.float32)
+        if self.conditions.qsb_depth:
+            samples *= self.fading(len(samples), samplerate)
+        if self.conditions.snr_db is not None:
+            samples += self.noise(len(samples), samplerate, freq)
+        peak = max(samples.max(initial=0.0), -samples.min(initial=0.0))
+        if peak > 1.0:
+            samples /= peak
+        return samples
+
+    def jitter(self, lengths):
+        """Scale each element and gap length by its own random factor, keeping at least one sample"""
+        if not self.conditions.jitter:
+            return lengths
+        factors = 1 + self.conditions.jitter * self.rng.standard_normal(len(lengths))
+        return np.maximum(np.rint(lengths * factors), 1).astype(np.int64)
+
+    def shape_edges(self, gate, tone_starts, tone_lengths, samplerate):
+        """Replace the hard edges of every element in gate with raised-cosine ramps, in place"""
+        width = int(min(self.conditions.rise_time * samplerate, tone_lengths.min() // 2))
+        if width < 1:
+            return
+        offsets = np.arange(width)
+        ramp = (0.5 - 0.5 * np.cos(np.pi * (offsets + 0.5) / width)).astype(np.float32)
+        gate[tone_starts[:, None] + offsets] = ramp
+        gate[(tone_starts + tone_lengths - 1)[:, None] - offsets] = ramp
+
+    def add_chirp(self, phase, tone_starts, tone_lengths, samplerate):
+        """
+        Add to phase, in place, a frequency offset of chirp_hz at each key-down
+        decaying with time constant chirp_time
+        """
+        conditions = self.conditions
+        if not conditions.chirp_hz:
+            return
+        decay = conditions.chirp_time * samplerate
+        width = int(min(self.CHIRP_SPAN * decay, tone_lengths.min()))
+        offsets = np.arange(width)
+        # The integral of the offset, less its final value, which only shifts the phase
+        correction = 2 * np.pi * conditions.chirp_hz * conditions.chirp_time * np.exp(-offsets / decay)
+        phase[tone_starts[:, None] + offsets] -= correction
+
+    def fading(self, count, samplerate):
+        """
+        Slow QSB gain for count samples: a sum of three sinusoids near
+        qsb_rate with random phases, swinging from 1 down to 1 - qsb_depth
+        """
+        conditions = self.conditions
+        rates = conditions.qsb_rate * self.rng.uniform(0.5, 1.5, 3)
+        phases = self.rng.uniform(0, 2 * np.pi, 3)
+        step = max(1, samplerate // self.FADING_CONTROL_RATE)
+        points = np.arange(0, count + step, step)
+        wave = np.sin(np.outer(points / samplerate, 2 * np.pi * rates) + phases).sum(axis=1) / 3
+        gain = 1 - conditions.qsb_depth * (0.5 + 0.5 * wave)
+        return np.interp(np.arange(count), points, gain).astype(np.float32)
+
+    def noise(self, count, samplerate, freq):
+        """
+        Gaussian noise for count samples at snr_db below a full-scale tone.
+
+        Band-limited noise is built from blocks of NOISE_BLOCK samples, each
+        drawn directly as random spectrum bins around freq, inverse FFT'd in
+        one batch and overlap-added with sine windows, whose squares sum to
+        one, so the noise level stays constant from block to block.
+        """
+        conditions = self.conditions
+        power = 0.5 / 10 ** (conditions.snr_db / 10)  # a full-scale tone has power 0.5
+        if not conditions.noise_bandwidth:
+            return self.rng.standard_normal(count, dtype=np.float32) * np.float32(np.sqrt(power))
+        size = self.NOISE_BLOCK
+        hop = size // 2
+        bins = np.fft.rfftfreq(size, 1 / samplerate)
+        band = np.flatnonzero(np.abs(bins - freq) <= conditions.noise_bandwidth / 2)
+        if not len(band):
+            return 0.0
+        blocks = -(-count // hop) + 1
+        spectrum = np.zeros((blocks, len(bins)), dtype=np.complex64)
+        shape = (blocks, len(band))
+        spectrum[:, band] = (self.rng.standard_normal(shape, dtype=np.float32)
+                             + 1j * self.rng.standard_normal(shape, dtype=np.float32))
+        # irfft gives each sample a variance of 4 * len(band) / size**2 from these bins
+        scale = size / (2 * np.sqrt(len(band))) * np.sqrt(power)
+        window = (scale * np.sin(np.pi * (np.arange(size) + 0.5) / size)).astype(np.float32)
+        pieces = np.fft.irfft(spectrum, size, axis=1).astype(np.float32, copy=False)
+        pieces *= window
+        noise = pieces[:, :hop].copy()
+        noise[1:] += pieces[:-1, hop:]
+        return noise.ravel()[hop:hop + count]
+
+### END OF CLASS -  ChannelSimulator ###
+
@@ -0,0 +1,379 @@
+import asyncio
+import heapq
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from MorseCode_Classes import MORSE_CODE, MORSE_TREE, MorseCodeEncoder, MorseCodeInterpreter
+from Profiler_Classes import Profiler
+
+MAX_CODE_LENGTH = 16  # longest answer accepted; longer ones cannot be characters
+
+
+def encode_message(message):
+    """One protocol message: compact JSON and a newline, as bytes"""
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+@dataclass(eq=False)
+class DrillPlayer:
+    """
+    One connected seat in a class drill.
+
+    Attributes:
+        id (int): Number given by the server when the player joined.
+        name (str): Name the player joined with.
+        writer (asyncio.StreamWriter): The player's connection.
+        interpreter (MorseCodeInterpreter): Checks the player's keyed answers.
+        hits (int): Answers that matched the challenge.
+        misses (int): Answers that did not.
+        answer_time (float): Total seconds taken over all answers.
+        answered_round (int): Last round the player answered, so a round is only scored once.
+    """
+    id: int
+    name: str
+    writer: asyncio.StreamWriter
+    interpreter: MorseCodeInterpreter = field(default_factory=MorseCodeInterpreter)
+    hits: int = 0
+    misses: int = 0
+    answer_time: float = 0.0
+    answered_round: int = 0
+
+    def standing(self):
+        answers = self.hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'mean_ms': round(1000 * self.answer_time / answers, 1) if answers else None,
+        }
+
+
+class DrillServer:
+    """
+    Runs one synchronized Morse drill for a whole class over TCP.
+
+    Messages are JSON objects, one per line.  A client sends
+    {"op": "join", "name": ...} and is sent every challenge from then on:
+    {"op": "challenge", "round", "char", "answer_time", "sent"}.  It
+    answers with {"op": "answer", "round", "code"}, the dots and dashes it
+    keyed, and is sent its "result" straight away.  A round ends when
+    every player has answered or answer_time has passed; then everyone is
+    sent the "scores" for the round and the class leaderboard.
+
+    Challenges come from a MorseCodeEncoder whose AdaptiveSampler, if
+    given, learns from the whole class's answers.  Each player's answers
+    are checked by their own MorseCodeInterpreter.  Everything runs on one
+    event loop: a broadcast is encoded once and written to every socket
+    without waiting, and a client that lets more than MAX_BUFFER bytes
+    queue up is disconnected rather than allowed to slow the others down.
+
+    Attributes:
+        host (str): Address to listen on.
+        port (int): Port to listen on; 0 picks a free one, see address.
+        answer_time (float): Seconds players have to answer.
+        pause (float): Seconds between the end of one round and the next challenge.
+        board_size (int): Players listed on the leaderboard.
+        players (dict): DrillPlayer for each connected player id.
+        round (int): Number of the current or last round.
+        target (str): Character of the current round.
+        profiler (Profiler): Time spent handling answers and broadcasting.
+        on_round (callable): Called with each round's scores message, or None.
+    """
+    MAX_BUFFER = 256 * 1024  # bytes queued for one client before it is dropped as too slow
+
+    def __init__(self, host='127.0.0.1', port=7373, answer_time=5.0, pause=2.0, board_size=10,
+                 sampler=None, on_round=None):
+        self.host = host
+        self.port = port
+        self.answer_time = answer_time
+        self.pause = pause
+        self.board_size = board_size
+        self.encoder = MorseCodeEncoder(sampler)
+        self.on_round = on_round
+        self.profiler = Profiler(size=4096)
+        self.players = {}
+        self.round = 0
+        self.target = None
+        self.round_open = False
+        self.round_started = 0.0
+        self.answered = 0
+        self.correct = 0
+        self.answer_times = []
+        self.server = None
+        self._next_id = 1
+        self._handlers = set()
+        self._joined = asyncio.Event()
+        self._all_answered = asyncio.Event()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, backlog=4096)
+        return self
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        self.round_open = False
+        self.server.close()
+        for player in list(self.players.values()):
+            player.writer.transport.abort()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def wait_for_players(self, count):
+        while len(self.players) < count:
+            self._joined.clear()
+            await self._joined.wait()
+
+    async def drill(self, rounds=None, players=1):
+        """Run rounds (forever if None), starting once the given number of players have joined"""
+        await self.wait_for_players(players)
+        while rounds is None or self.round < rounds:
+            await self.run_round()
+            if rounds is None or self.round < rounds:
+                await asyncio.sleep(self.pause)
+
+    async def run_round(self):
+        """Send a new challenge, collect answers until all are in or time is up, then send the scores"""
+        self.round += 1
+        self.target = self.encoder.generate_random_character()
+        self.encoder.select_character(self.target)
+        self.answered = self.correct = 0
+        self.answer_times = []
+        self._all_answered.clear()
+        self.round_started = time.perf_counter()
+        self.round_open = True
+        self.broadcast({'op': 'challenge', 'round': self.round, 'char': self.target,
+                        'answer_time': self.answer_time, 'sent': time.time()})
+        try:
+            await asyncio.wait_for(self._all_answered.wait(), self.answer_time)
+        except asyncio.TimeoutError:
+            pass
+        self.round_open = False
+        scores = self.scores()
+        self.broadcast(scores)
+        if self.on_round is not None:
+            self.on_round(scores)
+        return scores
+
+    def scores(self):
+        """The scores message for the round just ended"""
+        times = sorted(self.answer_times)
+        leaders = heapq.nlargest(self.board_size, self.players.values(),
+                                 key=lambda player: (player.hits, -player.answer_time))
+        return {
+            'op': 'scores',
+            'round': self.round,
+            'char': self.target,
+            'players': len(self.players),
+            'answered': self.answered,
+            'correct': self.correct,
+            'median_ms': round(1000 * times[len(times) // 2], 1) if times else None,
+            'leaders': [player.standing() for player in leaders],
+        }
+
+    async def handle_client(self, reader, writer):
+        player = None
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                    op = message.get('op')
+                except (ValueError, AttributeError):
+                    self.send(writer, encode_message({'op': 'error', 'error': "not a JSON object"}))
+                    continue
+                if op == 'answer' and player is not None:
+                    self.profiler.timed('answer', self.answer, player, message)
+                elif op == 'join' and player is None:
+                    player = self.join(str(message.get('name', ''))[:32], writer)
+                else:
+                    self.send(writer, encode_message({'op': 'error', 'error': f"unexpected {op!r}"}))
+        except (ConnectionError, ValueError):
+            pass  # reset, or a line longer than the reader's limit
+        finally:
+            if player is not None:
+                del self.players[player.id]
+                self.check_all_answered()
+            writer.close()
+            self._handlers.discard(task)
+
+    def join(self, name, writer):
+        player = DrillPlayer(self._next_id, name or f"player {self._next_id}", writer)
+        self._next_id += 1
+        self.players[player.id] = player
+        self._joined.set()
+        self.send(writer, encode_message({'op': 'welcome', 'player': player.id, 'round': self.round}))
+        return player
+
+    def answer(self, player, message):
+        """Check and score one answer and send the player its result"""
+        code = message.get('code')
+        if not self.round_open or message.get('round') != self.round or player.answered_round == self.round:
+            self.send(player.writer, encode_message({'op': 'error', 'round': message.get('round'),
+                                                     'error': "round is not open for an answer"}))
+            return
+        if not isinstance(code, str) or len(code) > MAX_CODE_LENGTH or set(code) - {'.', '-'}:
+            self.send(player.writer, encode_message({'op': 'error', 'round': self.round,
+                                                     'error': "code must be dots and dashes"}))
+            return
+
+        elapsed = time.perf_counter() - self.round_started
+        interpreter = player.interpreter
+        interpreter.morse_code = code
+        char = interpreter.current_morse_code()
+        interpreter.clear_morse_code()
+        correct = char == self.target
+        player.answered_round = self.round
+        player.answer_time += elapsed
+        if correct:
+            player.hits += 1
+            self.correct += 1
+        else:
+            player.misses += 1
+        self.answered += 1
+        self.answer_times.append(elapsed)
+        if self.encoder.sampler is not None:
+            self.encoder.sampler.record(self.target, correct, elapsed)
+        self.send(player.writer, encode_message({
+            'op': 'result', 'round': self.round, 'char': char, 'correct': correct,
+            'ms': round(1000 * elapsed, 1), 'hits': player.hits, 'misses': player.misses,
+        }))
+        self.check_all_answered()
+
+    def check_all_answered(self):
+        if self.round_open and self.answered >= len(self.players):
+            self._all_answered.set()
+
+    def broadcast(self, message):
+        start = time.perf_counter_ns()
+        data = encode_message(message)
+        for player in list(self.players.values()):
+            self.send(player.writer, data)
+        self.profiler.record('broadcast', time.perf_counter_ns() - start)
+
+    def send(self, writer, data):
+        transport = writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > self.MAX_BUFFER:
+            transport.abort()  # the client's handler sees the reset and removes it
+            return
+        writer.write(data)
+
+### END OF CLASS -  DrillServer ###
+
+
+class LoadTest:
+    """
+    Many simulated players on one event loop, to load-test a DrillServer.
+
+    Each player connects, joins and answers every challenge after a random
+    thinking time, correctly with probability accuracy, until it has seen
+    the scores of the given number of rounds.  Two latencies are recorded
+    in a Profiler: 'delivery', from the server sending a challenge to the
+    player reading it (wall clock, so only meaningful on one machine), and
+    'round_trip', from sending an answer to reading its result.
+
+    Attributes:
+        host (str): Server address.
+        port (int): Server port.
+        players (int): Number of simulated players.
+        rounds (int): Rounds each player plays.
+        accuracy (float): Chance of each answer being right.
+        think (float): Longest thinking time in seconds; each answer waits a uniform random time up to it.
+        profiler (Profiler): The recorded latencies.
+        counts (dict): Messages sent and received, results, errors and disconnects.
+    """
+    CONNECT_BATCH = 256  # connections opened at once, to stay inside the server's listen backlog
+
+    def __init__(self, host='127.0.0.1', port=7373, players=1000, rounds=5, accuracy=0.9, think=1.0, seed=None):
+        self.host = host
+        self.port = port
+        self.players = players
+        self.rounds = rounds
+        self.accuracy = accuracy
+        self.think = think
+        self.rng = random.Random(seed)
+        self.profiler = Profiler(size=min(players * max(rounds, 1), 1 << 20))
+        self.counts = {'sent': 0, 'received': 0, 'correct': 0, 'errors': 0, 'disconnected': 0}
+        self.codes = {char: MORSE_CODE[char] for char in MORSE_TREE.packed}
+        self.connect_seconds = 0.0
+        self._answered = {}  # writer -> perf_counter_ns when its answer was sent
+
+    def answer_code(self, char):
+        """The code a simulated player keys for char: usually right, otherwise a random other one"""
+        if self.rng.random() < self.accuracy:
+            return self.codes[char]
+        return self.rng.choice(list(self.codes.values()))
+
+    async def run(self):
+        """Connect every player, play the rounds and return a summary"""
+        start = time.perf_counter()
+        connections = []
+        for first in range(0, self.players, self.CONNECT_BATCH):
+            batch = range(first, min(first + self.CONNECT_BATCH, self.players))
+            connections += await asyncio.gather(*(self.connect(number) for number in batch))
+        self.connect_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        await asyncio.gather(*(self.play(reader, writer) for reader, writer in connections))
+        return self.summary(time.perf_counter() - start)
+
+    async def connect(self, number):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(encode_message({'op': 'join', 'name': f"sim {number}"}))
+        self.counts['sent'] += 1
+        return reader, writer
+
+    async def play(self, reader, writer):
+        answered_at = None
+        try:
+            async for line in reader:
+                message = json.loads(line)
+                self.counts['received'] += 1
+                op = message['op']
+                if op == 'challenge':
+                    self.profiler.record('delivery', int((time.time() - message['sent']) * 1e9))
+                    asyncio.get_running_loop().call_later(
+                        self.rng.uniform(0, self.think), self.send_answer, writer, message)
+                elif op == 'result':
+                    if message['correct']:
+                        self.counts['correct'] += 1
+                    sent = self._answered.pop(writer, None)
+                    if sent is not None:
+                        self.profiler.record('round_trip', time.perf_counter_ns() - sent)
+                elif op == 'error':
+                    self.counts['errors'] += 1
+                elif op == 'scores' and message['round'] >= self.rounds:
+                    break
+            else:
+                self.counts['disconnected'] += 1
+        except ConnectionError:
+            self.counts['disconnected'] += 1
+        finally:
+            writer.close()
+
+    def send_answer(self, writer, challenge):
+        if writer.is_closing():
+            return
+        self._answered[writer] = time.perf_counter_ns()
+        writer.write(encode_message({'op': 'answer', 'round': challenge['round'],
+                                     'code': self.answer_code(challenge['char'])}))
+        self.counts['sent'] += 1
+
+    def summary(self, seconds):
+        return {
+            'players': self.players,
+            'rounds': self.rounds,
+            'connect_seconds': round(self.connect_seconds, 3),
+            'seconds': round(seconds, 3),
+            **self.counts,
+            'messages_per_second': round((self.counts['sent'] + self.counts['received']) / seconds, 1),
+            'latency_ms': self.profiler.summary(),
+        }
+
+### END OF CLASS -  LoadTest ###
@@ -1,40 +1,210 @@
-import pygame
+import heapq
+import itertools
 import numpy as np
-import time
+import pygame
 import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from MorseCode_Classes import MORSE_CODE, MORSE_TREE
+
+def init_display(size, caption="Morse Invader"):
+    """
+    Initialize pygame once and return the shared game window.
+
+    Only the display and font modules are started here; the mixer is
+    opened by the audio backend when the game's audio is loaded.  The
+    existing window is reused when it already has the requested size.
+    """
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+    window = pygame.display.get_surface()
+    if window is None or window.get_size() != tuple(size):
+        window = pygame.display.set_mode(size)
+    pygame.display.set_caption(caption)
+    return window
+
+
+class TreeLayout:
+    """
+    Screen position of every node of a MorseTree.
+
+    Positions are computed once into an array indexed like the tree's
+    nodes.  Each level of the tree is spread evenly across the horizontal
+    span, so finding where a code sits is a single lookup and the tree can
+    be any depth.  for_background() fits the levels to the tree drawn in
+    the game's background image; levels deeper than the rows given carry
+    on at the last row spacing, squeezed to fit in the window.
+
+    Attributes:
+        tree (MorseTree): The tree laid out.
+        rows (list): Y coordinate of each level.
+        span (tuple): Left and right edges of every level.
+        positions (np.ndarray): (x, y) centre of each node index.
+    """
+    BACKGROUND_SIZE = (800, 600)
+    BACKGROUND_ROWS = (67, 160, 263, 378, 476, 548)  # node centres of each level in background.png
+    BACKGROUND_SPAN = (9, 760)
+    MIN_RADIUS = 16
+    MAX_RADIUS = 40
+
+    def __init__(self, window_size, tree=MORSE_TREE, rows=(), span=None):
+        width, height = window_size
+        self.tree = tree
+        self.window_size = tuple(window_size)
+        self.span = tuple(span) if span is not None else (0.05 * width, 0.95 * width)
+        rows = [float(row) for row in rows][:tree.depth + 1] or [0.1 * height]
+        step = rows[-1] - rows[-2] if len(rows) > 1 else 0.8 * height / max(tree.depth, 1)
+        extra = tree.depth + 1 - len(rows)
+        if extra:
+            step = min(step, (0.97 * height - rows[-1]) / extra)
+            rows += [rows[-1] + step * (number + 1) for number in range(extra)]
+        self.rows = rows
+
+        left, right = self.span
+        self.positions = np.zeros((len(tree.nodes), 2), dtype=np.int32)
+        for level, row in enumerate(rows):
+            count = 1 << level
+            first = count - 1
+            self.positions[first:first + count, 0] = np.rint(left + (right - left) * (np.arange(count) + 0.5) / count)
+            self.positions[first:first + count, 1] = round(row)
+
+    @classmethod
+    def for_background(cls, window_size, tree=MORSE_TREE):
+        """The layout of the tree in background.png, scaled to the window"""
+        scale_x = window_size[0] / cls.BACKGROUND_SIZE[0]
+        scale_y = window_size[1] / cls.BACKGROUND_SIZE[1]
+        return cls(window_size, tree,
+                   rows=[row * scale_y for row in cls.BACKGROUND_ROWS],
+                   span=[edge * scale_x for edge in cls.BACKGROUND_SPAN])
+
+    @staticmethod
+    def level(index):
+        return (index + 1).bit_length() - 1
+
+    def position(self, index):
+        x, y = self.positions[index]
+        return int(x), int(y)
+
+    def radius(self, level):
+        """Marker radius for a level, shrinking as the nodes get closer together"""
+        spacing = (self.span[1] - self.span[0]) / (1 << level)
+        return int(min(max(0.3 * spacing + 12, self.MIN_RADIUS), self.MAX_RADIUS))
+
+    def radii(self):
+        return [self.radius(level) for level in range(len(self.rows))]
+
+    def draw_nodes(self, surface, atlas, first_level, fill=(245, 230, 180), outline=(0, 0, 0)):
+        """Draw every character node from first_level down, as the background does"""
+        for index in range(1 << first_level, len(self.tree.nodes) + 1):
+            char = self.tree.nodes[index - 1]
+            if not char:
+                continue
+            radius = self.radius(self.level(index - 1))
+            center = self.position(index - 1)
+            pygame.draw.circle(surface, fill, center, radius)
+            pygame.draw.circle(surface, outline, center, radius, 2)
+            glyph = atlas.glyph(char, radius)
+            surface.blit(glyph, glyph.get_rect(center=center))
+
+### END OF CLASS -  TreeLayout ###
+
+
+class MarkerMotion:
+    """
+    Eased movement from one point to another over a set time.
+
+    A point is any tuple of numbers, such as (x, y) or (x, y, radius).
+    position() interpolates with smoothstep easing from the point the
+    marker was at when move_to() was called, so a move can start while
+    the last one is still under way.
+
+    Attributes:
+        start (tuple): Where the current move began.
+        end (tuple): Where it ends.
+        started (float): When it began.
+        duration (float): How long it takes in seconds.
+    """
+    def __init__(self, point):
+        self.jump_to(point)
+
+    def jump_to(self, point):
+        self.start = self.end = tuple(point)
+        self.started = 0.0
+        self.duration = 0.0
+
+    def move_to(self, point, now, duration):
+        self.start = self.position(now)
+        self.end = tuple(point)
+        self.started = now
+        self.duration = duration
+
+    def progress(self, now):
+        if self.duration <= 0:
+            return 1.0
+        return min(max((now - self.started) / self.duration, 0.0), 1.0)
+
+    def moving(self, now):
+        return self.progress(now) < 1.0
+
+    def position(self, now):
+        t = self.progress(now)
+        if t >= 1.0:
+            return self.end
+        eased = t * t * (3 - 2 * t)
+        return tuple(round(a + (b - a) * eased) for a, b in zip(self.start, self.end))
+
+### END OF CLASS -  MarkerMotion ###
+
+
+def build_tree_layer(background, layout, drawn_levels):
+    """
+    Build the static tree layer every frame is drawn over: the background
+    art, with any levels of the layout deeper than the art's drawn_levels
+    rendered onto a copy of it once.
+    """
+    if len(layout.rows) <= drawn_levels:
+        return background
+    layer = background.copy()
+    characters = [char for char in layout.tree.nodes if char]
+    atlas = GlyphAtlas(characters, layout.radii()[drawn_levels:], (0, 0, 0))
+    layout.draw_nodes(layer, atlas, drawn_levels)
+    return layer
+
 
 class RectangleMarker:
     """
-    A class representing a movable marker on a pygame surface.
+    A marker that walks the Morse code tree one dot or dash at a time.
 
-    This class handles the creation, movement, and drawing of a marker
-    that moves in a symmetrical pattern based on user input.
+    The node reached is looked up in a TreeLayout rather than worked out
+    from the last position, and the marker glides there with a
+    MarkerMotion.  A step that would leave the tree is ignored.
 
     Attributes:
-        x (int): Current x-coordinate of the marker.
-        y (int): Current y-coordinate of the marker.
-        start_x (int): Initial x-coordinate of the marker.
-        start_y (int): Initial y-coordinate of the marker.
-        size (int): Size of the marker (width and height).
-        speed_x (int): Horizontal speed of the marker (not currently used).
-        speed_y (int): Vertical speed of the marker (not currently used).
-        direction (int): Direction of movement (1: right, -1: left).
+        layout (TreeLayout): Where each node is drawn.
+        node (int): The tree node the marker is on.
+        size (int): Diameter of the marker.
         color (tuple): RGB color of the marker.
-        move_count (int): Counter for tracking the number of moves made.
-        move_distances (list): List of tuples containing (x, y) move distances.
-    """
-    def __init__(self, x, y, size, speed_x, speed_y, color):
-        self.x = x
-        self.y = y
-        self.start_x = x
-        self.start_y = y
+        glide (float): Seconds taken to move to a new node.
+        motion (MarkerMotion): The marker's movement.
+        x (int): Current x-coordinate of the marker's centre.
+        y (int): Current y-coordinate of the marker's centre.
+    """
+    def __init__(self, layout, size, color, glide=0.12):
+        self.layout = layout
         self.size = size
-        self.speed_x = speed_x
-        self.speed_y = speed_y
-        self.direction = 1
         self.color = color
-        self.move_count = 0
-        self.move_distances = [(190, 93), (96, 103), (45, 115), (25, 98), (10, 90), (0, 0)]
+        self.glide = glide
+        self.node = 0
+        self.x, self.y = layout.position(0)
+        self.motion = MarkerMotion((self.x, self.y))
+
+    @property
+    def move_count(self):
+        return self.layout.level(self.node)
 
     def draw(self, surface):
         """
@@ -42,37 +212,97 @@ class RectangleMarker:
 
         Args:
             surface (pygame.Surface): The surface to draw the marker on.
+
+        Returns:
+            pygame.Rect: The area drawn.
         """
-        # pygame.draw.rect(surface, self.color, (self.x, self.y, self.size, self.size))
-        # now draw a cicle instead of a square
-        pygame.draw.circle(surface, self.color, (self.x + self.size // 2, self.y + self.size // 2), self.size // 2)
-        #print('MARKER DRAW NOW')
-
-    def move_mkr(self, left_pressed, right_pressed, window_width, window_height):
-        move_distance = self.move_distances[self.move_count % len(self.move_distances)]
-        
-        if left_pressed:
-            self.x -= move_distance[0]
-        if right_pressed:
-            self.x += move_distance[0]
-        
-        if self.x <= 0 or self.x >= window_width - self.size:
-            self.direction *= -1
-        
-        if left_pressed or right_pressed:
-            self.y += move_distance[1]
-        
-        self.y = min(self.y, window_height - self.size)
-        self.move_count += 1
+        return pygame.draw.circle(surface, self.color, (self.x, self.y), self.size // 2)
+
+    def move_mkr(self, left_pressed, right_pressed, now=0.0):
+        """Step to the dot (left) or dash (right) child. Returns False if there is none"""
+        if left_pressed == right_pressed:
+            return False
+        child = self.layout.tree.child(self.node, '.' if left_pressed else '-')
+        if child == self.layout.tree.DEAD:
+            return False
+        self.node = child
+        self.motion.move_to(self.layout.position(child), now, self.glide)
+        return True
+
+    def update(self, now):
+        """Move to where the marker is at time now. Returns True while it is still gliding"""
+        self.x, self.y = self.motion.position(now)
+        return self.motion.moving(now)
 
     def reset_marker(self):
-        self.x = self.start_x
-        self.y = self.start_y
-        self.move_count = 0
+        self.node = 0
+        self.x, self.y = self.layout.position(0)
+        self.motion.jump_to((self.x, self.y))
 
 
 ### END OF CLASS -  RectangleMarker ###
 
+class FontCache:
+    """
+    A cache of pygame fonts keyed by size.
+
+    Creating a pygame.font.Font opens the font file and sets up FreeType,
+    so each size is created once and shared.
+
+    Attributes:
+        name (str): Font file, or None for pygame's default font.
+        fonts (dict): Font for each size created so far.
+    """
+    def __init__(self, name=None):
+        self.name = name
+        self.fonts = {}
+
+    def get(self, size):
+        size = int(size)
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(self.name, size)
+        return font
+
+### END OF CLASS -  FontCache ###
+
+FONT_CACHE = FontCache()
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered surfaces for single characters at a set of font sizes.
+
+    The atlas is filled once up front, so drawing a character is a dict
+    lookup and a blit.  A character or size that was not pre-rendered is
+    rendered on first use and kept.
+
+    Attributes:
+        color (tuple): Color of the glyphs in RGB format (r, g, b).
+        fonts (FontCache): Source of the fonts for each size.
+        glyphs (dict): Surface for each (character, size) pair.
+    """
+    def __init__(self, characters, sizes, color, fonts=FONT_CACHE):
+        self.color = color
+        self.fonts = fonts
+        self.glyphs = {}
+        for size in sizes:
+            for char in characters:
+                self.glyph(char, size)
+
+    def glyph(self, char, size):
+        key = (char, int(size))
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.fonts.get(size).render(char, True, self.color)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.glyphs[key] = surface
+        return surface
+
+### END OF CLASS -  GlyphAtlas ###
+
+
 class CircleMarker:
     """
     A class to represent a circle marker with text in a Pygame window.
@@ -89,56 +319,89 @@ class CircleMarker:
         font_size (int): The size of the font for the text in pixels.
         font_color (tuple): The color of the font in RGB format (r, g, b).
         text (str): The text to be displayed inside the circle.
-        font (pygame.font.Font): The font object for rendering text.
+        atlas (GlyphAtlas): Pre-rendered characters at every radius the marker uses.
         text_surface (pygame.Surface): The surface containing the rendered text.
         text_rect (pygame.Rect): The rectangle enclosing the text surface.
     """
-    def __init__(self, window_size):
+    FONT_COLOR = (255, 255, 255) # WHITE
+
+    def __init__(self, window_size, atlas=None):
         self.window_size = window_size
         self.circle_center = [window_size[0] // 2, window_size[1] // 2]
         self.circle_radius = 10
         self.circle_color = (255, 0, 0)  # RED
         self.font_size = 10
-        self.font_color = (255, 255, 255) # WHITE
+        self.font_color = self.FONT_COLOR
         self.text = ""  
-        self.font = pygame.font.Font(None, self.font_size)
-        self.text_surface = self.font.render(self.text, True, self.font_color)
+        self.atlas = atlas if atlas is not None else self.build_atlas(TreeLayout.for_background(window_size).radii())
+        self.text_surface = self.atlas.glyph(self.text, self.font_size)
         self.text_rect = self.text_surface.get_rect(center=self.circle_center)
-        self.move_count = 0
-        self.radii = [0, 40, 40, 30, 30, 25, 0]
-        self.xy_trim = [(0, 0), (10, 5), (10, 5), (15, 10), (13, 11), (7, 0)] 
+
+    @classmethod
+    def build_atlas(cls, sizes):
+        """Render every Morse character at every radius the marker uses"""
+        characters = [char for char in MORSE_CODE if char != ' ']
+        return GlyphAtlas(characters, sorted(set(sizes)), cls.FONT_COLOR)
 
     def set_circle_attributes(self,x,y,radius):
         self.circle_center = [x,y]
         self.circle_radius = radius
+        if self.text_surface is not None:
+            self.text_rect = self.text_surface.get_rect(center=self.circle_center)
 
     def set_font_attributes(self,TGT_LTR,NEW_SIZE):
         self.text = TGT_LTR
         self.font_size = NEW_SIZE
-        self.font = pygame.font.Font(None, int(self.font_size))
-        self.text_surface = self.font.render(self.text, True, self.font_color)
+        self.text_surface = self.atlas.glyph(self.text, self.font_size)
         self.text_rect = self.text_surface.get_rect(center=self.circle_center)
 
     def draw(self, window):
-        pygame.draw.circle(window, self.circle_color, self.circle_center, self.circle_radius)
+        """Draw the circle and its text, returning the area drawn"""
+        rect = pygame.draw.circle(window, self.circle_color, self.circle_center, self.circle_radius)
         if self.text_surface is not None:
-            window.blit(self.text_surface, self.text_rect)
+            rect = rect.union(window.blit(self.text_surface, self.text_rect))
+        return rect
     
     def clear_text(self):
         """ clear the text char that gets left behind when the game maker moves"""
         self.text = ""
         self.text_surface = None
-    
-    def get_radius_from_list(self, move_count):
-        if 0 <= move_count < len(self.radii):
-            xy_mod = self.xy_trim[move_count]
-            return self.radii[move_count], xy_mod
-        else:
-            raise IndexError(f"Move count {move_count} is out of range. Valid range is 0 to {len(self.radii) - 1}.")     
 
 ### END OF CLASS -  CircleMarker ###
 
 
+class TextCache:
+    """
+    A rendered line of text that is only re-rendered when it changes.
+
+    font.render is one of the most expensive calls in a frame, and the
+    status lines change only on key presses, so the last surface is kept
+    and returned until the text or color differ.
+
+    Attributes:
+        font (pygame.font.Font): The font used for rendering.
+        text (str): Text of the cached surface.
+        color (tuple): Color of the cached surface.
+        surface (pygame.Surface): The cached rendered text.
+    """
+    def __init__(self, font):
+        self.font = font
+        self.text = None
+        self.color = None
+        self.surface = None
+
+    def render(self, text, color):
+        if text != self.text or color != self.color or self.surface is None:
+            self.surface = self.font.render(text, True, color)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert_alpha()
+            self.text = text
+            self.color = color
+        return self.surface
+
+### END OF CLASS -  TextCache ###
+
+
 class ScoreKeeper:
     """
     A class for keeping track of scores in a game.
@@ -150,12 +413,15 @@ class ScoreKeeper:
     Attributes:
         player_score (int): The player's current score.
         game_score (int): The game's current score.
+        on_outcome (callable): Called with (target, correct, response_time) for each recorded answer, or None.
     """
 
-    def __init__(self, font, window_width, window_height):
+    def __init__(self, font, window_width, window_height, on_outcome=None):
+        self.on_outcome = on_outcome
         self.player_score = 0
         self.game_score = 0
         self.font = font
+        self.text = TextCache(font)
         self.window_width = window_width
         self.window_height = window_height
 
@@ -165,11 +431,21 @@ class ScoreKeeper:
     def increment_game_score(self):
         self.game_score += 1
 
+    def record_outcome(self, target, correct, response_time=None):
+        """Score one answer and pass it on to on_outcome, e.g. AdaptiveSampler.record"""
+        if correct:
+            self.increment_player_score()
+        else:
+            self.increment_game_score()
+        if self.on_outcome is not None:
+            self.on_outcome(target, correct, response_time)
+
     def display_score(self, window):
+        """Draw the scores, returning the area drawn"""
         score_text = f"Match: {self.player_score}  Miss: {self.game_score}"
-        score_surface = self.font.render(score_text, True, (0, 0, 255))
+        score_surface = self.text.render(score_text, (0, 0, 255))
         score_rect = score_surface.get_rect(center=(self.window_width // 2, (self.window_height - 200) // 2))
-        window.blit(score_surface, score_rect)
+        return window.blit(score_surface, score_rect)
 
 ### END OF CLASS -  ScoreKeeper ###
 
@@ -200,15 +476,168 @@ class MarkerPause:
 
 ### END OF CLASS -  MarkerPause ###
 
+class Scheduler:
+    """
+    Runs callbacks at given times on a monotonic clock.
+
+    The game loop calls run_due() each frame and sleeps until
+    next_deadline() or the next input event, so nothing is polled while
+    no timer is due.  Pending calls are kept in a heap ordered by due time
+    and then by the order they were scheduled.
+
+    Attributes:
+        now (callable): Returns the current time in seconds.
+    """
+    def __init__(self, now=time.monotonic):
+        self.now = now
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = set()
+
+    def call_at(self, when, callback):
+        """Schedule callback() at time when. Returns a handle for cancel()"""
+        handle = next(self._counter)
+        heapq.heappush(self._heap, (when, handle, callback))
+        return handle
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.now() + delay, callback)
+
+    def cancel(self, handle):
+        self._cancelled.add(handle)
+
+    def next_deadline(self):
+        """Due time of the next pending call, or None if there is none"""
+        while self._heap and self._heap[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._heap)[1])
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self):
+        """Run every call that is due, including ones scheduled by those calls. Returns the number run"""
+        count = 0
+        now = self.now()
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return count
+            _, _, callback = heapq.heappop(self._heap)
+            callback()
+            count += 1
+
+### END OF CLASS -  Scheduler ###
+
+class StartupTimer:
+    """
+    Records where startup time goes, for the --timing report.
+
+    mark() closes a step on the main thread, measured from the previous
+    mark; steps spent waiting for the player are reported but not counted
+    towards the startup total.  task() times work on other threads, which
+    overlaps the main thread's steps.
+
+    Attributes:
+        started (float): perf_counter() value the first step is measured from.
+        steps (list): (name, seconds, waiting) for each main-thread step.
+        tasks (list): (name, seconds) for each background task.
+    """
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.last = self.started
+        self.steps = []
+        self.tasks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name, waiting=False):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last, waiting))
+        self.last = now
+
+    @contextmanager
+    def task(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.tasks.append((name, time.perf_counter() - start))
+
+    def report(self):
+        lines = ["Startup timing (ms):"]
+        total = 0.0
+        for name, seconds, waiting in self.steps:
+            if not waiting:
+                total += seconds
+            lines.append(f"  {name:<28}{seconds * 1000:9.1f}{'  (waiting for player)' if waiting else ''}")
+        lines.append(f"  {'total, excluding waits':<28}{total * 1000:9.1f}")
+        if self.tasks:
+            lines.append("Background loading (ms):")
+            for name, seconds in self.tasks:
+                lines.append(f"  {name:<28}{seconds * 1000:9.1f}")
+        return "\n".join(lines)
+
+### END OF CLASS -  StartupTimer ###
+
+class Preloader:
+    """
+    Runs loading tasks on a background thread.
+
+    Tasks are added by name and run in order once start() is called.
+    result() waits for a task and returns its value, re-raising any error
+    it raised on the loading thread.
+
+    Attributes:
+        timer (StartupTimer): Times each task, or None.
+        results (dict): Return value of each finished task.
+    """
+    def __init__(self, timer=None):
+        self.timer = timer
+        self.results = {}
+        self._tasks = []
+        self._error = None
+        self._thread = None
+
+    def add(self, name, task):
+        self._tasks.append((name, task))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="Preloader", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def result(self, name):
+        if self._thread is None:
+            self._run()
+        else:
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.results[name]
+
+    def _run(self):
+        try:
+            for name, task in self._tasks:
+                if self.timer is not None:
+                    with self.timer.task(name):
+                        self.results[name] = task()
+                else:
+                    self.results[name] = task()
+        except Exception as error:
+            self._error = error
+
+### END OF CLASS -  Preloader ###
+
 class StartSequence:
     """ class to display a splash screen and game instructions"""
-    def __init__(self):
-        pygame.init()
-        self.window = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("Morse Invader")
-        self.logo = pygame.image.load('assets/images/logo_file.png')
+    def __init__(self, sleep=time.sleep, now=time.monotonic):
+        self.sleep = sleep
+        self.now = now
+        self.window = init_display((800, 600))
+        self.logo = pygame.image.load('assets/images/logo_file.png').convert()
         #self.logo = pygame.transform.scale(self.logo, (800, 600))
-        self.font = pygame.font.Font(None, 36)
+        self.font = FONT_CACHE.get(36)
         self.instructions = [
             "    Welcome to Morse Invader!",
             " ",
@@ -224,29 +653,48 @@ class StartSequence:
         self.window.fill((255, 255, 255))  # Fill the screen with white
         self.window.blit(self.logo, (0, 0))  # Display the resized logo
         pygame.display.update()
-        time.sleep(2)  # Wait for 2 seconds
 
-    def show_instructions(self):
-	    # Clear the event queue before showing instructions
-        # pygame.event.clear()  ## doesn't work
-        showing = True
-        while showing:
+    def wait_on_logo(self, seconds=2.0, ready=None):
+        """
+        Keep the logo up for the given time or until a key or mouse button
+        is pressed, and in any case until ready() is true
+        """
+        start = self.now()
+        skipped = False
+        while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        showing = False
-            self.window.fill((0, 0, 0))  # Fill the screen with black
-            for i, line in enumerate(self.instructions):
-                instruction_text = self.font.render(line, True, (0, 0, 255))  # Render text in blue
-                self.window.blit(instruction_text, (20, 20 + i * 40))
-            pygame.display.update()
-            pygame.time.Clock().tick(30)
-
-    def run_intro(self):
+                elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                    skipped = True
+            if (skipped or self.now() - start >= seconds) and (ready is None or ready()):
+                return
+            self.sleep(0.01)
+
+    def draw_instructions(self):
+        self.window.fill((0, 0, 0))  # Fill the screen with black
+        for i, line in enumerate(self.instructions):
+            instruction_text = self.font.render(line, True, (0, 0, 255))  # Render text in blue
+            self.window.blit(instruction_text, (20, 20 + i * 40))
+        pygame.display.update()
+
+    def show_instructions(self):
+        """Draw the instructions once, then sleep on the event queue until Enter is pressed"""
+        self.draw_instructions()
+        while True:
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                return
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.draw_instructions()
+
+    def run_intro(self, seconds=2.0, ready=None):
         self.show_logo()
+        self.wait_on_logo(seconds, ready)
         self.show_instructions()
 
-### END OF CLASS -  InstructPage ###
\ No newline at end of file
+### END OF CLASS -  InstructPage ###
@@ -1,16 +1,421 @@
 import pygame
 import numpy as np
-import pyaudio
-import time
 import random
 import string
+import threading
+from collections import OrderedDict
+
+# Define Morse code dictionary -- Map CHAR to Morse Code Symbol
+MORSE_CODE = {
+    'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.',
+    'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.',
+    'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 'U': '..-',
+    'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 'Z': '--..',
+    '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-', '5': '.....',
+    '6': '-....', '7': '--...', '8': '---..', '9': '----.', '+': '.-.-.', '=': '-...-',
+    '/': '-..-.', ' ': ' ',  # space
+}
+
+
+class MorseTree:
+    """
+    An array-backed binary tree of Morse code characters.
+
+    Node 0 is the root (the empty code).  A dot moves from node i to node
+    2i+1 and a dash to node 2i+2, so a code of length n with dashes as 1 bits
+    lives at index 2**n - 1 + bits.  Walking the tree one element at a time
+    is O(1) per element and always knows the character at the current node
+    and which characters are still reachable below it.
+
+    Attributes:
+        depth (int): Length of the longest code in the tree.
+        nodes (list): Character at each node index, '' where no character ends.
+        reachable (list): For each node, the characters at or below it ('' for a dead prefix).
+        alphabet (dict): Dictionary mapping Morse code symbols to characters.
+        packed (dict): Dictionary mapping characters to (bits, length), with a dash as a 1 bit
+            and the first element in the most significant bit.
+    """
+    DEAD = -1  # node index for a prefix that has left the tree
+
+    def __init__(self, morse_code):
+        codes = {char: code for char, code in morse_code.items()
+                 if code and set(code) <= {'.', '-'}}
+        self.depth = max(len(code) for code in codes.values())
+        size = 2 ** (self.depth + 1) - 1
+        self.nodes = [''] * size
+        self.alphabet = {}
+        self.packed = {}
+        for char, code in codes.items():
+            self.nodes[self.index_of(code)] = char
+            self.alphabet[code] = char
+            self.packed[char] = (int(code.replace('.', '0').replace('-', '1'), 2), len(code))
+
+        # Fill reachable sets bottom up: children always have larger indexes
+        self.reachable = [''] * size
+        for index in range(size - 1, -1, -1):
+            below = ''
+            if 2 * index + 2 < size:
+                below = self.reachable[2 * index + 1] + self.reachable[2 * index + 2]
+            self.reachable[index] = self.nodes[index] + below
+
+    def child(self, index, symbol):
+        """Return the node reached from index by a '.' or '-', or DEAD."""
+        if index < 0:
+            return self.DEAD
+        index = 2 * index + (1 if symbol == '.' else 2)
+        return index if index < len(self.nodes) else self.DEAD
+
+    def index_of(self, code):
+        index = 0
+        for symbol in code:
+            index = self.child(index, symbol)
+        return index
+
+    def code_of(self, index):
+        code = []
+        while index > 0:
+            code.append('.' if index % 2 else '-')
+            index = (index - 1) // 2
+        return ''.join(reversed(code))
+
+    def char_at(self, index):
+        return self.nodes[index] if index >= 0 else ''
+
+    def is_valid_prefix(self, index):
+        """True while some character can still be reached from this node."""
+        return index >= 0 and self.reachable[index] != ''
+
+    def reachable_from(self, index):
+        return self.reachable[index] if index >= 0 else ''
+
+    def encode(self, char):
+        """Return the packed (bits, length) code for a character."""
+        return self.packed[char]
+
+### END OF CLASS -  MorseTree ###
+
+
+# Shared by every class in this module -- built once at import
+MORSE_TREE = MorseTree(MORSE_CODE)
+
+# Characters the game picks its challenges from
+PRACTICE_CHARACTERS = string.ascii_uppercase + string.digits + '+/='
+
+
+class MessageRenderer:
+    """
+    A class for rendering whole Morse code messages to audio samples.
+
+    A message is laid out as alternating tone/silence lengths in samples,
+    expanded into a keying gate with one np.repeat and multiplied by a
+    phase-continuous sine, so every gap is an exact number of zero samples.
+
+    Speeds follow the PARIS standard (one dit is 1.2 / wpm seconds).  When
+    farnsworth_wpm is below wpm, characters keep their wpm timing and only
+    the character and word gaps are stretched to reach the slower overall
+    speed (ARRL Farnsworth timing).
+
+    Attributes:
+        morse_code (dict): Dictionary mapping characters to their Morse code representations.
+        wpm (float): Character speed in words per minute.
+        farnsworth_wpm (float): Overall speed in words per minute, or None for standard spacing.
+        freq (int): Frequency of the audio tone in Hz.
+        samplerate (int): Sample rate of the audio.
+        dit_samples (int): Length of a dit (and of the gap between elements) in samples.
+        char_gap_samples (int): Length of the gap between characters in samples.
+        word_gap_samples (int): Length of the gap between words in samples.
+    """
+
+    def __init__(self, morse_code, wpm=12, farnsworth_wpm=None, freq=700, samplerate=44100):
+        self.morse_code = morse_code
+        self.wpm = wpm
+        self.farnsworth_wpm = farnsworth_wpm
+        self.freq = freq
+        self.samplerate = samplerate
+
+        dit = 1.2 / wpm
+        self.dit_samples = round(dit * samplerate)
+        if farnsworth_wpm and farnsworth_wpm < wpm:
+            delay = (60 * wpm - 37.2 * farnsworth_wpm) / (farnsworth_wpm * wpm)
+            self.char_gap_samples = round(3 * delay / 19 * samplerate)
+            self.word_gap_samples = round(7 * delay / 19 * samplerate)
+        else:
+            self.char_gap_samples = 3 * self.dit_samples
+            self.word_gap_samples = 7 * self.dit_samples
+
+        # Alternating tone/gap lengths for each character, starting and ending on a tone
+        dit_len = self.dit_samples
+        units = {'.': dit_len, '-': 3 * dit_len}
+        self._elements = {}
+        for char, code in morse_code.items():
+            lengths = []
+            for symbol in code:
+                if symbol in units:
+                    if lengths:
+                        lengths.append(dit_len)
+                    lengths.append(units[symbol])
+            if lengths:
+                self._elements[char] = lengths
+
+    def segment_lengths(self, message):
+        """
+        Return the alternating tone/silence lengths of a message in samples.
+
+        Characters without Morse code act as word separators; runs of them
+        collapse into one word gap and leading or trailing gaps are dropped.
+        """
+        elements = self._elements
+        lengths = []
+        gap = 0
+        for char in message.upper():
+            code_lengths = elements.get(char)
+            if code_lengths is None:
+                gap = self.word_gap_samples
+                continue
+            if lengths:
+                lengths.append(gap)
+            lengths.extend(code_lengths)
+            gap = self.char_gap_samples
+        return np.asarray(lengths, dtype=np.int64)
+
+    def render(self, message):
+        """Render a message to one contiguous float32 array."""
+        lengths = self.segment_lengths(message)
+        gate = np.repeat((np.arange(len(lengths)) % 2 == 0).astype(np.float32), lengths)
+        phase = (2 * np.pi * self.freq / self.samplerate) * np.arange(len(gate))
+        return (np.sin(phase) * gate).astype(np.float32)
+
+    def duration(self, message):
+        """Return the length of a rendered message in seconds."""
+        return int(self.segment_lengths(message).sum()) / self.samplerate
+
+    def segments(self, message, start=0):
+        """
+        Yield (index, is_tone, length) for each tone and silence of a message
+        from character start on, laid out as by segment_lengths() but one
+        character at a time, so a message of any length costs no memory.
+        """
+        elements = self._elements
+        gap = None
+        for index in range(start, len(message)):
+            code_lengths = elements.get(message[index].upper())
+            if code_lengths is None:
+                if gap is not None:
+                    gap = self.word_gap_samples
+                continue
+            if gap is not None:
+                yield index, False, gap
+            for position, length in enumerate(code_lengths):
+                yield index, position % 2 == 0, length
+            gap = self.char_gap_samples
+
+    def stream(self, message, chunk_frames=1024, start=0):
+        return MessageStream(self, message, chunk_frames, start)
+
+### END OF CLASS -  MessageRenderer ###
+
+
+class MessageStream:
+    """
+    A message rendered in fixed-size chunks just ahead of playback.
+
+    Each call to read() fills one chunk of chunk_frames samples from the
+    message's segments, so the first chunk is ready almost at once and
+    memory stays at one chunk whatever the length of the message.  The
+    tone keeps its phase across chunks, so the concatenated chunks match
+    MessageRenderer.render().
+
+    Iterating blocks while the stream is paused and ends when it is closed.
+    pause(), resume(), seek() and close() may be called from another thread;
+    they take effect at the next chunk.
+
+    Attributes:
+        renderer (MessageRenderer): Supplies the timing, tone and sample rate.
+        message (str): The text being played.
+        chunk_frames (int): Samples per chunk.
+        position (int): Index of the character being rendered.
+        rendered (int): Samples rendered since the stream started or last seeked.
+        closed (bool): True once close() has been called.
+    """
+
+    def __init__(self, renderer, message, chunk_frames=1024, start=0):
+        self.renderer = renderer
+        self.message = message
+        self.chunk_frames = chunk_frames
+        self.closed = False
+        self._buffer = np.zeros(chunk_frames, dtype=np.float32)
+        self._ramp = np.arange(chunk_frames, dtype=np.float64)
+        self._step = 2 * np.pi * renderer.freq / renderer.samplerate
+        self._running = threading.Event()
+        self._running.set()
+        self._seek_to = None
+        self._restart(min(max(start, 0), len(message)))
+
+    def _restart(self, index):
+        self._segments = self.renderer.segments(self.message, index)
+        self._tone = False
+        self._remaining = 0
+        self._phase = 0.0
+        self.position = index
+        self.rendered = 0
+
+    def read(self):
+        """
+        Render the next chunk. Returns a float32 array, valid until the next
+        call, of chunk_frames samples (fewer for the last), or None at the end.
+        """
+        if self._seek_to is not None:
+            index, self._seek_to = self._seek_to, None
+            self._restart(index)
+        size = self.chunk_frames
+        filled = 0
+        while filled < size:
+            if self._remaining == 0:
+                segment = next(self._segments, None)
+                if segment is None:
+                    break
+                self.position, self._tone, self._remaining = segment
+            count = min(self._remaining, size - filled)
+            out = self._buffer[filled:filled + count]
+            if self._tone:
+                np.sin(self._phase + self._step * self._ramp[:count], out=out, casting='same_kind')
+            else:
+                out.fill(0.0)
+            self._phase = (self._phase + self._step * count) % (2 * np.pi)
+            self._remaining -= count
+            filled += count
+        self.rendered += filled
+        return self._buffer[:filled] if filled else None
+
+    def __iter__(self):
+        while True:
+            self._running.wait()
+            if self.closed:
+                return
+            chunk = self.read()
+            if chunk is None:
+                return
+            yield chunk
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def seek(self, index):
+        """Continue from the character at index, starting with its first tone"""
+        self._seek_to = min(max(index, 0), len(self.message))
+
+    def close(self):
+        self.closed = True
+        self._running.set()
+
+### END OF CLASS -  MessageStream ###
+
+
+class WaveformBank:
+    """
+    A cache of rendered Morse code tone buffers.
+
+    Tones are rendered once per (freq, samplerate, dit_duration) key. Each key
+    holds the float32 dit and dah arrays plus ready-to-write float32 byte
+    buffers for every character in the Morse code table, as rendered by
+    MessageRenderer.  The first key rendered is
+    pinned as the default; other speed/pitch combinations are kept in a
+    bounded LRU.  With a WaveformStore, a table missing from memory is
+    mapped from the store file instead of rendered, and a table that has
+    to be rendered is added to the file for the next process.
+
+    Attributes:
+        morse_code (dict): Dictionary mapping characters to their Morse code representations.
+        max_variants (int): Number of non-default keys kept before the least recently used is dropped.
+        default_key (tuple): The pinned (freq, samplerate, dit_duration) key, or None until first use.
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that had to render a new table.
+        store (WaveformStore): File the tables are shared through, or None.
+    """
+
+    _empty = np.zeros(0, dtype=np.float32)
+
+    def __init__(self, morse_code, max_variants=8, store=None):
+        self.morse_code = morse_code
+        self.max_variants = max_variants
+        self.store = store
+        self.default_key = None
+        self._default_table = None
+        self._variants = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def table(self, freq, samplerate, dit_duration):
+        """Return the (symbols, characters) table for a key, rendering it on a miss."""
+        key = (freq, samplerate, dit_duration)
+        if key == self.default_key:
+            self.hits += 1
+            return self._default_table
+        table = self._variants.get(key)
+        if table is not None:
+            self.hits += 1
+            self._variants.move_to_end(key)
+            return table
+
+        self.misses += 1
+        table = self._render_table(freq, samplerate, dit_duration)
+        if self.default_key is None:
+            self.default_key = key
+            self._default_table = table
+        else:
+            self._variants[key] = table
+            if len(self._variants) > self.max_variants:
+                self._variants.popitem(last=False)
+        return table
+
+    def symbol(self, symbol, freq, samplerate, dit_duration):
+        """Return the float32 tone for '.' or '-' (empty for anything else)."""
+        return self.table(freq, samplerate, dit_duration)[0].get(symbol, self._empty)
+
+    def character(self, char, freq, samplerate, dit_duration):
+        """Return the float32 byte buffer for a character, or None if it has no Morse code."""
+        return self.table(freq, samplerate, dit_duration)[1].get(char.upper())
+
+    def stats(self):
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'variants': len(self._variants),
+        }
+        if self.store is not None:
+            stats['store'] = self.store.stats()
+        return stats
+
+    def _render_table(self, freq, samplerate, dit_duration):
+        if self.store is not None:
+            table = self.store.load(freq, samplerate, dit_duration)
+            if table is not None:
+                return table
+        renderer = MessageRenderer(self.morse_code, wpm=1.2 / dit_duration,
+                                   freq=freq, samplerate=samplerate)
+        symbols = {'.': renderer.render('E'), '-': renderer.render('T')}
+        characters = {char: renderer.render(char).tobytes() for char in self.morse_code}
+        if self.store is not None:
+            return self.store.save(freq, samplerate, dit_duration, (symbols, characters)) or (symbols, characters)
+        return symbols, characters
+
+### END OF CLASS -  WaveformBank ###
+
 
 class MorseCodePlayer:
     """
     A class for playing Morse code audio.
 
     This class provides functionality to convert text to Morse code
-    and play it as audio using PyAudio.
+    audio; an AudioEngine plays it through one of the Audio_Classes
+    backends.
 
     Attributes:
         dit_duration (float): Duration of a dit (dot) in seconds.
@@ -18,9 +423,11 @@ class MorseCodePlayer:
         freq (int): Frequency of the audio tone in Hz.
         samplerate (int): Sample rate of the audio.
         morse_code (dict): Dictionary mapping characters to their Morse code representations.
+        bank (WaveformBank): Cache of rendered tones and character buffers.
     """
 
-    def __init__(self, dit_duration=0.1, freq=700, samplerate=44100):
+    def __init__(self, dit_duration=0.1, freq=700, samplerate=44100, bank=None,
+                 wpm=None, farnsworth_wpm=None):
         """
         Initialize the MorseCodePlayer.
 
@@ -28,56 +435,42 @@ class MorseCodePlayer:
             dit_duration (float, optional): Duration of a dit in seconds. Defaults to 0.1.
             freq (int, optional): Frequency of the audio tone in Hz. Defaults to 700.
             samplerate (int, optional): Sample rate of the audio. Defaults to 44100.
+            bank (WaveformBank, optional): Waveform cache to share with other players.
+                Defaults to a new bank with this player's settings as its default key.
+            wpm (float, optional): Character speed in words per minute. Overrides dit_duration.
+            farnsworth_wpm (float, optional): Overall speed for Farnsworth spacing. Defaults to None.
         """
+        if wpm is not None:
+            dit_duration = 1.2 / wpm
         self.dit_duration = dit_duration
         self.dah_duration = 3 * dit_duration
         self.freq = freq
         self.samplerate = samplerate
 
-       # Define Morse code dictionary -- Map CHAR to Morse Code Symbol
-        self.morse_code = {
-            'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.',
-            'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.',
-            'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 'U': '..-',
-            'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 'Z': '--..',
-            '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-', '5': '.....',
-            '6': '-....', '7': '--...', '8': '---..', '9': '----.', '+': '.-.-.', '=': '-...-', 
-            '/': '-..-.',' ': ' ',  # space
-        }
+        self.morse_code = MORSE_CODE
+        self.bank = bank if bank is not None else WaveformBank(self.morse_code)
+        self.renderer = MessageRenderer(self.morse_code, wpm=1.2 / dit_duration,
+                                        farnsworth_wpm=farnsworth_wpm,
+                                        freq=freq, samplerate=samplerate)
 
     def generate_signal(self, symbol):
-        if symbol == '.':
-            duration = self.dit_duration
-        elif symbol == '-':
-            duration = self.dah_duration
-        else:
-            duration = 0.0  # for spaces
-
-        t = np.linspace(0, duration, int(duration * self.samplerate), endpoint=False)
-        signal = np.sin(2 * np.pi * self.freq * t)
-        return signal
-
-    def play_morse_code(self, message):
-        p = pyaudio.PyAudio()
-        stream = p.open(format=pyaudio.paFloat32,
-                        channels=1,
-                        rate=self.samplerate,
-                        output=True)
-
-        for char in message:
-            if char.upper() in self.morse_code:
-                code = self.morse_code[char.upper()]
-                for symbol in code:
-                    signal = self.generate_signal(symbol)
-                    stream.write(signal.astype(np.float32).tobytes())
-                    time.sleep(self.dit_duration)  # pause between symbols
-                time.sleep(self.dit_duration * 2)  # pause between characters
-            else:
-                time.sleep(self.dit_duration * 4)  # pause between words
+        return self.bank.symbol(symbol, self.freq, self.samplerate, self.dit_duration)
+
+    def character_buffer(self, char):
+        """Return the ready-to-write float32 byte buffer for a character, or None."""
+        return self.bank.character(char, self.freq, self.samplerate, self.dit_duration)
 
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+    def render_message(self, message):
+        """Return a whole message as one float32 byte buffer, gaps included."""
+        if len(message) == 1:
+            buffer = self.character_buffer(message)
+            if buffer is not None:
+                return buffer
+        return self.renderer.render(message).tobytes()
+
+    def message_buffers(self, message):
+        """Yield the byte buffers that make up a message."""
+        yield self.render_message(message)
 
 ### END OF CLASS -  MorseCodePlayer ###
 
@@ -97,6 +490,8 @@ class MorseCodeInterpreter:
         answer (bool): A flag indicating if the current Morse code is valid.
         morse_code_mappings (dict): A dictionary mapping pygame key events to Morse code symbols.
         morse_alphabet (dict): A dictionary mapping Morse code symbols to their corresponding letters or numbers.
+        tree (MorseTree): The shared Morse code tree.
+        node (int): Tree index of the code entered so far (MorseTree.DEAD once it leaves the tree).
     """
 
     def __init__(self):
@@ -104,7 +499,9 @@ class MorseCodeInterpreter:
         Initialize the MorseCodeInterpreter.
         Sets up empty initial values for all attributes.
         """
-        self.morse_code = ""
+        self.tree = MORSE_TREE
+        self.node = 0
+        self._morse_code = ""
         self.letter_message = ""
         self.answer = None
         self.answer_color = (165, 42, 42)  # BROWN
@@ -112,17 +509,17 @@ class MorseCodeInterpreter:
             pygame.K_LEFT: ".",
             pygame.K_RIGHT: "-"
         }
-        # Define Morse code reverse dictionary -- Map Morse Code Symbol to CHAR
-        self.morse_alphabet = {
-            '.-': 'A', '-...': 'B', '-.-.': 'C', '-..': 'D', '.': 'E',
-            '..-.': 'F', '--.': 'G', '....': 'H', '..': 'I', '.---': 'J',
-            '-.-': 'K', '.-..': 'L', '--': 'M', '-.': 'N', '---': 'O',
-            '.--.': 'P', '--.-': 'Q', '.-.': 'R', '...': 'S', '-': 'T',
-            '..-': 'U', '...-': 'V', '.--': 'W', '-..-': 'X', '-.--': 'Y',
-            '--..': 'Z','-----': '0', '.----': '1',  '..---': '2', '...--': '3', 
-            '....-': '4', '.....': '5', '-....': '6', '--...': '7', '---..': '8', 
-            '----.': '9', '.-.-.' :'+', '-...-': '=', '-..-.': '/'
-        }
+        # Morse code reverse dictionary -- Map Morse Code Symbol to CHAR
+        self.morse_alphabet = MORSE_TREE.alphabet
+
+    @property
+    def morse_code(self):
+        return self._morse_code
+
+    @morse_code.setter
+    def morse_code(self, code):
+        self._morse_code = code
+        self.node = self.tree.index_of(code)
 
     #### no longer used -- events are handled in main
     def handle_event(self, event):
@@ -140,18 +537,24 @@ class MorseCodeInterpreter:
         """
         Handle Left/Right user keys, interpreting them as Morse code input.
         """
-        if (left == True and right == False):				
-            self.morse_code += '.'
-        elif (left == False and right == True):							
-            self.morse_code += '-'
+        if (left == True and right == False):
+            self.add_symbol('.')
+        elif (left == False and right == True):
+            self.add_symbol('-')
+
+    def add_symbol(self, symbol):
+        """Append a '.' or '-' and step down the Morse tree."""
+        self._morse_code += symbol
+        self.node = self.tree.child(self.node, symbol)
             
     #### replacing handle_event
     def handle_return_key(self):
         self.interpret_morse_code()
 			
     def interpret_morse_code(self):
-        if self.morse_code in self.morse_alphabet:
-            self.letter_message = f'Code Letter: {self.morse_alphabet[self.morse_code]}'
+        char = self.tree.char_at(self.node)
+        if char:
+            self.letter_message = f'Code Letter: {char}'
             self.answer = True
             self.answer_color = (165, 42, 42)  # BROWN
         else:
@@ -162,11 +565,18 @@ class MorseCodeInterpreter:
         self.morse_code = ""  # clear the accumlated dot dash string
 
     def check_valid_morse_code(self):
-        self.answer = self.morse_code in self.morse_alphabet
+        self.answer = self.tree.char_at(self.node) != ""
         return self.answer
 
     def current_morse_code(self):
-        return self.morse_alphabet.get(self.morse_code, "")
+        return self.tree.char_at(self.node)
+
+    def prefix_is_valid(self):
+        """True while the code entered so far can still become a character."""
+        return self.tree.is_valid_prefix(self.node)
+
+    def reachable_characters(self):
+        return self.tree.reachable_from(self.node)
     
     def lookup_morse_code(self, code):
         return self.morse_alphabet.get(code, "")
@@ -177,6 +587,92 @@ class MorseCodeInterpreter:
 
 ### END OF CLASS -  MorseCodeInterpreter ###
 
+class StraightKeyDecoder:
+    """
+    Turns the timing of a single key into dots, dashes and gaps.
+
+    Each press is classified when the key is released: it is a dit if it is
+    closer to the running dit estimate than to the running dah estimate.
+    Both estimates are moving averages of the presses classified so far,
+    so the decoder follows the operator's speed as it drifts.  Gaps are
+    judged against the same estimates: a pause of two dits or more after a
+    release ends the character and one of five dits or more ends the word.
+
+    Attributes:
+        dit_seconds (float): Current dit length estimate.
+        dah_seconds (float): Current dah length estimate.
+        pressed_at (float): Time the key went down, or None while it is up.
+        released_at (float): Time of the last release, or None before the first press.
+        pending (str): 'char', then 'word', while those gaps have not yet been reported.
+    """
+    SMOOTHING = 0.25  # weight of the newest press in the estimates
+    MIN_WPM = 3
+    MAX_WPM = 60
+
+    def __init__(self, wpm=12):
+        self.dit_seconds = 1.2 / wpm
+        self.dah_seconds = 3 * self.dit_seconds
+        self.pressed_at = None
+        self.released_at = None
+        self.pending = None
+
+    @property
+    def wpm(self):
+        # Both estimates vote, a dah counting as three dits
+        return 1.2 / ((self.dit_seconds + self.dah_seconds / 3) / 2)
+
+    def char_gap(self):
+        return 2 * self.dit_seconds
+
+    def word_gap(self):
+        return 5 * self.dit_seconds
+
+    def reset(self):
+        """Forget a press or gap in progress, keeping the speed estimates"""
+        self.pressed_at = None
+        self.released_at = None
+        self.pending = None
+
+    def key_down(self, when):
+        self.pressed_at = when
+        self.pending = None
+
+    def key_up(self, when):
+        """Classify the press that just ended. Returns '.' or '-', or None if the key was not down"""
+        if self.pressed_at is None:
+            return None
+        duration = when - self.pressed_at
+        self.pressed_at = None
+        self.released_at = when
+        self.pending = 'char'
+
+        alpha = self.SMOOTHING
+        if abs(duration - self.dit_seconds) <= abs(duration - self.dah_seconds):
+            self.dit_seconds += alpha * (duration - self.dit_seconds)
+            symbol = '.'
+        else:
+            self.dah_seconds += alpha * (duration - self.dah_seconds)
+            symbol = '-'
+        # Keep the estimates apart and within a sensible speed range
+        self.dit_seconds = min(max(self.dit_seconds, 1.2 / self.MAX_WPM), 1.2 / self.MIN_WPM)
+        self.dah_seconds = min(max(self.dah_seconds, 2 * self.dit_seconds), 4 * self.dit_seconds)
+        return symbol
+
+    def poll(self, when):
+        """Report a gap boundary reached by time when: 'char', 'word' or None, each once per gap"""
+        if self.pressed_at is not None or self.released_at is None or self.pending is None:
+            return None
+        gap = when - self.released_at + 1e-9  # a check scheduled for the exact boundary counts
+        if self.pending == 'char' and gap >= self.char_gap():
+            self.pending = 'word'
+            return 'char'
+        if self.pending == 'word' and gap >= self.word_gap():
+            self.pending = None
+            return 'word'
+        return None
+
+### END OF CLASS -  StraightKeyDecoder ###
+
 class MorseCodeEncoder:
     """
     A class to encode alpha-numeric characters into Morse code, allowing step-by-step conversion.
@@ -188,42 +684,44 @@ class MorseCodeEncoder:
         morse_code (dict): A dictionary mapping characters to their Morse code equivalents.
         current_code (str): The current Morse code sequence being processed.
         current_index (int): The current position in the Morse code sequence.
+        current_bits (int): The current code packed as bits, a dash being a 1 bit.
+        current_length (int): The number of elements in the current code.
+        sampler (AdaptiveSampler): Picks random characters, or None to pick uniformly.
     """
-    def __init__(self):
-        self.morse_code = {
-            'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.', 'G': '--.',
-            'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..', 'M': '--', 'N': '-.',
-            'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.', 'S': '...', 'T': '-', 'U': '..-',
-            'V': '...-', 'W': '.--', 'X': '-..-', 'Y': '-.--', 'Z': '--..',
-            '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-', '5': '.....',
-            '6': '-....', '7': '--...', '8': '---..', '9': '----.', '+': '.-.-.', '=': '-...-', 
-            '/': '-..-.',' ': ' ',  # space
-        }
+    def __init__(self, sampler=None):
+        self.morse_code = MORSE_CODE
+        self.packed = MORSE_TREE.packed
+        self.sampler = sampler
         self.current_code = ""
+        self.current_bits = 0
+        self.current_length = 0
         self.current_index = 0
 
     def select_character(self, char):
+        """
+        Start stepping through a character's code. Any character in the Morse
+        code dictionary is accepted; one with no elements, like ' ', selects
+        an empty code.
+        """
         if char in self.morse_code:
             self.current_code = self.morse_code[char]
+            self.current_bits, self.current_length = self.packed.get(char, (0, 0))
             self.current_index = 0
         else:
             raise ValueError(f"Character not found in Morse code dictionary: {char}")
 
     def generate_random_character(self):
-        characters = string.ascii_uppercase + string.digits + '+/='
-        return random.choice(characters)        
+        if self.sampler is not None:
+            return self.sampler.draw()
+        return random.choice(PRACTICE_CHARACTERS)
 
     def next_dot_dash(self):
-        if self.current_index < len(self.current_code):
-            dot_dash = self.current_code[self.current_index]
+        if self.current_index < self.current_length:
             self.current_index += 1
-            done_flag = self.current_index == len(self.current_code)
-            if dot_dash == '.':
-                return done_flag, True, False
-            elif dot_dash == '-':
+            done_flag = self.current_index == self.current_length
+            if (self.current_bits >> (self.current_length - self.current_index)) & 1:
                 return done_flag, False, True
-            else:
-                raise ValueError(f"Unexpected character in Morse code: {dot_dash}")
+            return done_flag, True, False
         else:
             raise IndexError("No more dots or dashes to return")
 
@@ -0,0 +1,210 @@
+import numpy as np
+
+from MorseCode_Classes import MORSE_CODE, MORSE_TREE, MorseTree
+
+CHUNK_SIZE = 1 << 20  # bytes read per chunk by the stream helpers
+
+
+class MorseStreamCodec:
+    """
+    A streaming, table-driven text <-> Morse code converter.
+
+    Text is encoded one chunk at a time by gathering zero-padded rows of a
+    byte table with numpy and squeezing out the padding, so there is no
+    per-character Python code.
+    Letters become their code followed by a space, whitespace between words
+    becomes the word separator and newlines are kept.  Decoding splits the
+    chunk into tokens and folds each token's dots and dashes into its
+    MorseTree index with np.add.reduceat, then looks the characters up in a
+    node table.  Both directions hold at most one chunk (plus one partial
+    token when decoding) in memory.
+
+    Attributes:
+        errors (str): How unknown characters or codes are handled:
+            'replace' (emit the unknown marker), 'ignore' (drop them) or 'strict' (raise ValueError).
+        word_separator (str): Symbol written between words in Morse code.
+        unknown (str): Marker written for an unknown character or code.
+    """
+    ERROR_MODES = ('replace', 'ignore', 'strict')
+    BAD = 64  # tree step for bytes that are not Morse code; always lands outside the tree
+
+    def __init__(self, errors='replace', word_separator='/', unknown='#', morse_code=MORSE_CODE):
+        if errors not in self.ERROR_MODES:
+            raise ValueError(f"errors must be one of {self.ERROR_MODES}, not {errors!r}")
+        self.errors = errors
+        self.word_separator = word_separator
+        self.unknown = unknown
+        self.tree = MORSE_TREE if morse_code is MORSE_CODE else MorseTree(morse_code)
+
+        # Encoding: one output row per input byte, padded to a fixed width
+        rows = {}
+        for char, code in morse_code.items():
+            if char != ' ' and char.isascii():
+                rows[ord(char.upper())] = rows[ord(char.lower())] = code + ' '
+        rows[ord(' ')] = rows[ord('\t')] = word_separator + ' '
+        rows[ord('\n')] = '\n'
+        rows[ord('\r')] = ''
+        for byte in range(0x80, 0xC0):  # UTF-8 continuation bytes
+            rows[byte] = ''
+
+        # Rows are left-aligned and zero padded to whole 64-bit words; the
+        # second half of the table drops the trailing space for bytes that
+        # are followed by a line break, so no line ends in a space
+        width = -(-max(len(row) for row in rows.values()) // 8) * 8
+        self._unknown_byte = np.ones(256, dtype=bool)
+        table = np.zeros((512, width), dtype=np.uint8)
+        for byte in range(256):
+            row = rows.get(byte)
+            if row is None:
+                row = unknown + ' ' if errors == 'replace' else ''
+            else:
+                self._unknown_byte[byte] = False
+            encoded = np.frombuffer(row.encode('ascii'), dtype=np.uint8)
+            table[byte, :len(row)] = encoded
+            table[256 + byte, :len(row.rstrip(' '))] = encoded[:len(row.rstrip(' '))]
+        self._enc_words = table.view(np.uint64)
+
+        # Decoding: each byte's step down the tree (1 for a dot, 2 for a dash,
+        # 0 for a separator, BAD for anything else) and the character at every
+        # node, with one trailing 0 entry for indexes that left the tree
+        self._steps = np.full(256, self.BAD, dtype=np.uint8)
+        self._steps[[ord(' '), ord('\t'), ord('\n'), ord('\r'), ord(word_separator)]] = 0
+        self._steps[ord('.')] = 1
+        self._steps[ord('-')] = 2
+        self._node_chars = np.array([ord(char) if char else 0 for char in self.tree.nodes] + [0],
+                                    dtype=np.uint8)
+
+    # --- text -> Morse -------------------------------------------------
+
+    def encode_chunk(self, data, offset=0):
+        """Encode one chunk of text bytes. offset is only used in error messages."""
+        codes = np.frombuffer(data, dtype=np.uint8)
+        if self.errors == 'strict':
+            bad = np.flatnonzero(self._unknown_byte[codes])
+            if len(bad):
+                raise ValueError(f"No Morse code for byte {data[bad[0]:bad[0] + 1]!r} "
+                                 f"at offset {offset + int(bad[0])}")
+        index = codes.astype(np.intp)
+        following = codes[1:]
+        index[:-1] += 256 * ((following == ord('\n')) | (following == ord('\r')))
+        return self._enc_words.take(index, axis=0).tobytes().translate(None, b'\0')
+
+    def encode_stream(self, chunks):
+        """Yield Morse code bytes for an iterable of text byte chunks."""
+        pending = b''
+        offset = 0
+        for chunk in chunks:
+            out = self.encode_chunk(chunk, offset)
+            offset += len(chunk)
+            if not out:
+                continue
+            # Hold back a trailing space so no line ends in one
+            if pending and not out.startswith(b'\n'):
+                yield pending
+            pending = b''
+            if out.endswith(b' '):
+                out = out[:-1]
+                pending = b' '
+            if out:
+                yield out
+
+    def encode(self, text):
+        return b''.join(self.encode_stream([text.encode('utf-8')])).decode('ascii')
+
+    # --- Morse -> text -------------------------------------------------
+
+    def decode_chunk(self, data, offset=0):
+        """Decode Morse code bytes that end on a separator. offset is only used in error messages."""
+        depth = self.tree.depth
+        symbols = np.frombuffer(data, dtype=np.uint8)
+        # Lead with depth + 1 separators so looking back from any token stays in bounds
+        steps = np.zeros(len(symbols) + depth + 1, dtype=np.uint8)
+        steps[depth + 1:] = self._steps.take(symbols)
+        content = steps != 0
+        ends = np.flatnonzero(content[:-1] & ~content[1:])
+
+        # Walk back up to depth + 1 elements from each token end, folding the
+        # steps into the heap index: dot = 2i+1 and dash = 2i+2 unrolled
+        nodes = np.zeros(len(ends), dtype=np.uint16)
+        alive = np.ones(len(ends), dtype=bool)
+        for k in range(depth + 1):
+            step = steps.take(ends - k).astype(np.uint16)
+            alive &= step != 0
+            step *= alive
+            step <<= k
+            nodes += step
+        nodes[alive] = len(self.tree.nodes)  # longer than the deepest code
+        np.minimum(nodes, len(self.tree.nodes), out=nodes)
+        chars = self._node_chars[nodes]
+
+        unknown = chars == 0
+        if self.errors != 'ignore' and unknown.any():
+            if self.errors == 'strict':
+                end = int(ends[np.flatnonzero(unknown)[0]]) - depth  # one past the token
+                start = end
+                while start > 0 and self._steps[data[start - 1]] != 0:
+                    start -= 1
+                raise ValueError(f"Unknown Morse code {data[start:end]!r} at offset {offset + start}")
+            chars[unknown] = ord(self.unknown)
+
+        out = np.zeros(len(symbols), dtype=np.uint8)
+        out[ends - depth - 1] = chars
+        out[symbols == ord(self.word_separator)] = ord(' ')
+        out[symbols == ord('\n')] = ord('\n')
+        return out[out != 0].tobytes()
+
+    def decode_stream(self, chunks):
+        """
+        Yield text bytes for an iterable of Morse code byte chunks.
+
+        A token split between chunks is carried over, but only while it
+        could still be a code: one longer than the tree is deep is decoded
+        as unknown at once and the rest of it skipped.
+        """
+        carry = b''
+        offset = 0
+        skipping = False  # inside a token already decoded as too long
+        for chunk in chunks:
+            if skipping:
+                separators = np.flatnonzero(self._steps.take(np.frombuffer(chunk, dtype=np.uint8)) == 0)
+                if not len(separators):
+                    offset += len(chunk)
+                    continue
+                skipped = int(separators[0])
+                chunk = chunk[skipped:]
+                offset += skipped
+                skipping = False
+            data = carry + chunk
+            # Only decode up to the last separator; the rest may be a split token
+            cut = max(data.rfind(b) for b in (b' ', b'\t', b'\n', b'\r', self.word_separator.encode('ascii'))) + 1
+            carry = data[cut:]
+            if cut:
+                out = self.decode_chunk(data[:cut], offset)
+                offset += cut
+                if out:
+                    yield out
+            if len(carry) > self.tree.depth:
+                out = self.decode_chunk(carry + b' ', offset)
+                offset += len(carry)
+                carry = b''
+                skipping = True
+                if out:
+                    yield out
+        if carry:
+            out = self.decode_chunk(carry + b' ', offset)
+            if out:
+                yield out
+
+    def decode(self, code):
+        return b''.join(self.decode_stream([code.encode('utf-8')])).decode('ascii')
+
+### END OF CLASS -  MorseStreamCodec ###
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    """Yield chunks from a binary file object until EOF."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
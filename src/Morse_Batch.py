@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from Batch_Classes import render_batch, read_jobs, write_manifest
+
+CHANNEL_OPTIONS = ('snr_db', 'noise_bandwidth', 'qsb_depth', 'chirp_hz', 'jitter', 'rise_time')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Render practice messages to WAV or NPY files in parallel.")
+    parser.add_argument('messages', help="a text file with one message per line, or a .jsonl file of "
+                                         "objects with 'text' and optional name, wpm, farnsworth_wpm, "
+                                         "freq and samplerate")
+    parser.add_argument('-o', '--output', default='rendered', help="output directory (default: %(default)s)")
+    parser.add_argument('--format', choices=('wav', 'npy'), default='wav',
+                        help="16-bit WAV or float32 .npy (default: %(default)s)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--wpm', type=float, default=20, help="default speed (default: %(default)s)")
+    parser.add_argument('--farnsworth', type=float, help="default Farnsworth overall speed")
+    parser.add_argument('--freq', type=float, default=700, help="default tone in Hz (default: %(default)s)")
+    parser.add_argument('--samplerate', type=int, default=44100, help="default sample rate (default: %(default)s)")
+    channel = parser.add_argument_group("band conditions", "any of these renders every message through a "
+                                                           "simulated channel; .jsonl lines can set a 'channel' "
+                                                           "object with the same fields")
+    channel.add_argument('--snr', type=float, dest='snr_db', help="signal to noise ratio in dB")
+    channel.add_argument('--bandwidth', type=float, dest='noise_bandwidth',
+                         help="noise bandwidth in Hz around the tone (default: white noise)")
+    channel.add_argument('--qsb', type=float, dest='qsb_depth', help="fading depth from 0 to 1")
+    channel.add_argument('--chirp', type=float, dest='chirp_hz', help="frequency offset at key-down in Hz")
+    channel.add_argument('--jitter', type=float, help="timing spread as a fraction of each element")
+    channel.add_argument('--rise', type=float, dest='rise_time', help="keying rise time in seconds (default: 0.005)")
+    channel.add_argument('--seed', type=int, help="seed for the channel; each message adds its line number")
+    parser.add_argument('--quiet', action='store_true', help="do not print progress")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    defaults = {'wpm': args.wpm, 'farnsworth_wpm': args.farnsworth,
+                'freq': args.freq, 'samplerate': args.samplerate, 'seed': args.seed}
+    channel = {name: getattr(args, name) for name in CHANNEL_OPTIONS if getattr(args, name) is not None}
+    if channel:
+        defaults['channel'] = channel
+    start = time.perf_counter()
+    try:
+        jobs = read_jobs(args.messages, defaults)
+        entries = []
+        every = max(1, len(jobs) // 100)
+        for entry in render_batch(jobs, args.output, args.format, args.workers):
+            entries.append(entry)
+            if not args.quiet and (len(entries) % every == 0 or len(entries) == len(jobs)):
+                print(f"\r{len(entries)}/{len(jobs)} rendered", end='', file=sys.stderr, flush=True)
+    except (OSError, ValueError) as error:
+        print(f"Morse_Batch: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    manifest = write_manifest(os.path.join(args.output, 'manifest.json'), entries,
+                              {**defaults, 'format': args.format, 'workers': args.workers or os.cpu_count()})
+    if not args.quiet:
+        print(f"\r{manifest['count']} files, {manifest['seconds']:.0f} s of audio in {elapsed:.1f} s "
+              f"({manifest['seconds'] / max(elapsed, 1e-9):.0f}x real time) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
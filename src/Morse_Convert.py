@@ -0,0 +1,109 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # keep stdout clean for piping
+
+from MorseStream_Classes import CHUNK_SIZE, MorseStreamCodec, read_chunks
+
+
+def open_input(path):
+    return sys.stdin.buffer if path == '-' else open(path, 'rb')
+
+
+def open_output(path):
+    return sys.stdout.buffer if path == '-' else open(path, 'wb')
+
+
+def convert(args):
+    """Stream the input through the codec into the output, one chunk at a time"""
+    codec = MorseStreamCodec(errors=args.errors)
+    stream = codec.encode_stream if args.command == 'encode' else codec.decode_stream
+    source = open_input(args.input)
+    target = open_output(args.output)
+    try:
+        for block in stream(read_chunks(source, args.chunk_size)):
+            target.write(block)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout.buffer:
+            target.close()
+
+
+def listen(args):
+    """Decode Morse code audio from a WAV file, writing text as it is recognised"""
+    from AudioDecoder_Classes import decode_wav
+    target = open_output(args.output)
+    try:
+        for text in decode_wav(args.input, freq=args.freq, wpm=args.wpm):
+            target.write(text.encode('ascii'))
+            target.flush()
+        target.write(b'\n')
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+
+
+def play(args):
+    """Play a text file as Morse code audio, rendered a chunk at a time as it plays"""
+    from Audio_Classes import AudioEngine, create_backend
+    from MorseCode_Classes import MorseCodePlayer
+    with open_input(args.input) as source:
+        text = source.read().decode('utf-8', errors='replace')
+    player = MorseCodePlayer(wpm=args.wpm, farnsworth_wpm=args.farnsworth, freq=args.freq)
+    engine = AudioEngine(player, create_backend(args.backend, args.wav))
+    engine.stream(text, start=args.start)
+    try:
+        engine.wait()
+    except KeyboardInterrupt:
+        engine.cancel()
+    finally:
+        engine.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Convert text to Morse code and back.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command, text in (('encode', "text to Morse code"), ('decode', "Morse code to text")):
+        sub = subparsers.add_parser(command, help=f"convert {text}")
+        sub.add_argument('input', nargs='?', default='-', help="input file (default: stdin)")
+        sub.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+        sub.add_argument('--errors', choices=MorseStreamCodec.ERROR_MODES, default='replace',
+                         help="how to handle unknown characters or codes (default: replace)")
+        sub.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                         help="bytes read per chunk (default: %(default)s)")
+        sub.set_defaults(func=convert)
+
+    sub = subparsers.add_parser('listen', help="decode Morse code audio from a WAV file")
+    sub.add_argument('input', help="WAV file to decode")
+    sub.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    sub.add_argument('--freq', type=float, help="tone frequency in Hz (default: detect)")
+    sub.add_argument('--wpm', type=float, help="expected speed, skips speed calibration")
+    sub.set_defaults(func=listen)
+
+    sub = subparsers.add_parser('play', help="play text as Morse code audio")
+    sub.add_argument('input', nargs='?', default='-', help="text file to play (default: stdin)")
+    sub.add_argument('--wpm', type=float, default=20, help="character speed (default: %(default)s)")
+    sub.add_argument('--farnsworth', type=float, help="slower overall speed for Farnsworth spacing")
+    sub.add_argument('--freq', type=float, default=700, help="tone frequency in Hz (default: %(default)s)")
+    sub.add_argument('--start', type=int, default=0, help="character of the text to start from")
+    sub.add_argument('--backend', choices=('mixer', 'pyaudio', 'null', 'wav'), default='mixer',
+                     help="audio output (default: %(default)s)")
+    sub.add_argument('--wav', help="file to write with --backend wav")
+    sub.set_defaults(func=play)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as error:
+        print(f"Morse_Convert: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
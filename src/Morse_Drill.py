@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from Challenge_Classes import AdaptiveSampler
+from Drill_Classes import DrillServer, LoadTest
+
+
+def print_round(scores):
+    median = f"{scores['median_ms']:.0f} ms" if scores['median_ms'] is not None else "-"
+    print(f"round {scores['round']:>4}  {scores['char']:<2} {scores['correct']:>6}/{scores['answered']:<6} "
+          f"correct of {scores['players']} players, median answer {median}")
+    for place, leader in enumerate(scores['leaders'][:5], 1):
+        print(f"    {place}. {leader['name']:<20} {leader['hits']:>4} hits {leader['misses']:>4} misses")
+
+
+async def serve(args):
+    sampler = AdaptiveSampler(seed=args.seed) if not args.uniform else None
+    server = await DrillServer(args.host, args.port, args.answer_time, args.pause, args.board,
+                               sampler, on_round=None if args.quiet else print_round).start()
+    host, port = server.address
+    print(f"drill server listening on {host}:{port}", flush=True)
+    try:
+        await server.drill(args.rounds, args.players)
+    finally:
+        await server.close()
+        if args.profile:
+            server.profiler.dump(args.profile)
+
+
+async def load(args):
+    test = LoadTest(args.host, args.port, args.players, args.rounds, args.accuracy, args.think, args.seed)
+    summary = await test.run()
+    if args.json:
+        json.dump(summary, sys.stdout, indent=1)
+        print()
+        return
+    print(f"{summary['players']} players connected in {summary['connect_seconds']:.2f} s, "
+          f"played {summary['rounds']} rounds in {summary['seconds']:.2f} s")
+    print(f"{summary['sent']} messages sent, {summary['received']} received "
+          f"({summary['messages_per_second']:.0f}/s), {summary['errors']} errors, "
+          f"{summary['disconnected']} disconnected")
+    for name, entry in summary['latency_ms'].items():
+        print(f"{name:<11} ms: p50 {entry['p50']:.2f}  p95 {entry['p95']:.2f}  "
+              f"p99 {entry['p99']:.2f}  max {entry['max']:.2f}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a class Morse drill over the network, or load-test one.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    sub = subparsers.add_parser('serve', help="run a drill server")
+    sub.add_argument('--host', default='127.0.0.1', help="address to listen on (default: %(default)s)")
+    sub.add_argument('--port', type=int, default=7373, help="port to listen on (default: %(default)s)")
+    sub.add_argument('--answer-time', type=float, default=5.0,
+                     help="seconds to answer each challenge (default: %(default)s)")
+    sub.add_argument('--pause', type=float, default=2.0, help="seconds between rounds (default: %(default)s)")
+    sub.add_argument('--rounds', type=int, help="stop after this many rounds (default: run until stopped)")
+    sub.add_argument('--players', type=int, default=1,
+                     help="wait for this many players before the first round (default: %(default)s)")
+    sub.add_argument('--board', type=int, default=10, help="players on the leaderboard (default: %(default)s)")
+    sub.add_argument('--uniform', action='store_true',
+                     help="pick challenges uniformly instead of favouring the ones the class misses")
+    sub.add_argument('--seed', type=int, help="seed for the challenges")
+    sub.add_argument('--profile', help="write answer handling and broadcast times to this JSON file on exit")
+    sub.add_argument('--quiet', action='store_true', help="do not print each round's scores")
+    sub.set_defaults(func=serve)
+
+    sub = subparsers.add_parser('load', help="connect many simulated players to a drill server")
+    sub.add_argument('--host', default='127.0.0.1', help="server address (default: %(default)s)")
+    sub.add_argument('--port', type=int, default=7373, help="server port (default: %(default)s)")
+    sub.add_argument('--players', type=int, default=1000, help="simulated players (default: %(default)s)")
+    sub.add_argument('--rounds', type=int, default=5, help="rounds to play (default: %(default)s)")
+    sub.add_argument('--accuracy', type=float, default=0.9,
+                     help="chance of each answer being right (default: %(default)s)")
+    sub.add_argument('--think', type=float, default=1.0,
+                     help="longest time before answering, in seconds (default: %(default)s)")
+    sub.add_argument('--seed', type=int, help="seed for the simulated answers")
+    sub.add_argument('--json', action='store_true', help="print the results as JSON")
+    sub.set_defaults(func=load)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(args.func(args))
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(f"Morse_Drill: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+# Resolve paths before moving to the script directory, where the game finds its assets
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from Morse_Invader import GameConfig, MorseInvaderGame
+from Simulation_Classes import ScriptedEvents, SimulationReport, VirtualClock, random_session
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Replay a key script through Morse Invader without a screen or sound card.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--script', help="JSON key script to replay, as saved by Morse_Invader.py --record")
+    source.add_argument('--rounds', type=int, help="play this many random practice rounds instead")
+    parser.add_argument('--seed', type=int, help="seed for the target characters and random rounds")
+    parser.add_argument('--fps', type=int, default=GameConfig.FPS,
+                        help="simulated frames per second (default: %(default)s)")
+    parser.add_argument('--tail', type=float, default=5.0,
+                        help="seconds to keep running after the last scripted key (default: %(default)s)")
+    parser.add_argument('--report', help="write the full report, with state transitions, to this JSON file")
+    parser.add_argument('--no-draw', action='store_true',
+                        help="skip drawing frames and only run the game logic")
+    parser.add_argument('--log', help="append the answers to this attempt log")
+    parser.add_argument('--wav', help="write the game audio to this WAV file instead of discarding it")
+    return parser
+
+
+def simulate(script, fps=GameConfig.FPS, tail=5.0, wav_path=None, draw=True, seed=None, log_path=None):
+    """Run the game on a virtual clock until the script has played out. Returns the report summary"""
+    clock = VirtualClock()
+    events = ScriptedEvents(script, clock)
+    config = GameConfig(FPS=fps,
+                        AUDIO_BACKEND='wav' if wav_path else 'null',
+                        AUDIO_WAV_PATH=wav_path,
+                        CHALLENGE_SEED=seed,
+                        ATTEMPT_LOG=log_path)
+    game = MorseInvaderGame(config, now=clock, get_events=events)
+    report = SimulationReport()
+    frame = 1.0 / fps
+    end = events.end_time + tail
+    game.reset_game_marker_position()
+    try:
+        while report.time_frame(game, lambda: game.step(draw)) and (not events.done or clock() < end):
+            clock.advance(frame)
+    finally:
+        game.audio.wait(timeout=10)
+        game.shutdown()
+    summary = report.summary(clock())
+    summary['profile'] = game.profiler.summary()
+    return summary
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    script_path = os.path.abspath(args.script) if args.script else None
+    report_path = os.path.abspath(args.report) if args.report else None
+    wav_path = os.path.abspath(args.wav) if args.wav else None
+    log_path = os.path.abspath(args.log) if args.log else None
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    random.seed(args.seed)
+    if script_path:
+        with open(script_path) as file:
+            script = json.load(file)['events']
+    else:
+        script = random_session(args.rounds, args.seed)
+
+    summary = simulate(script, args.fps, args.tail, wav_path, not args.no_draw, args.seed, log_path)
+    if report_path:
+        with open(report_path, 'w') as file:
+            json.dump(summary, file, indent=1)
+    frame_ms = summary['frame_ms']
+    print(f"{summary['frames']} frames, {summary['sim_seconds']} s simulated in "
+          f"{summary['wall_seconds']} s ({summary['speedup']}x)")
+    print(f"frame ms: mean {frame_ms['mean']}  p50 {frame_ms['p50']}  "
+          f"p95 {frame_ms['p95']}  p99 {frame_ms['p99']}  max {frame_ms['max']}")
+    print(f"score: match {summary['score']['match']}  miss {summary['score']['miss']}  "
+          f"({len(summary['transitions'])} state transitions)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,42 @@
+import time
+IMPORT_STARTED = time.perf_counter()  # start of the --timing report
+
+import argparse
+import contextlib
 import pygame
 import sys
-import time
 from dataclasses import dataclass
 from typing import Tuple, Optional
 
-import numpy as np
-import pyaudio
-import random
-import string
-from MorseCode_Classes import MorseCodePlayer, MorseCodeInterpreter,MorseCodeEncoder
-from Game_Classes import RectangleMarker, CircleMarker, ScoreKeeper, MarkerPause, StartSequence
+from MorseCode_Classes import (MORSE_CODE, MorseCodePlayer, MorseCodeInterpreter,MorseCodeEncoder, StraightKeyDecoder,
+                               WaveformBank)
+from Audio_Classes import AudioEngine, create_backend
+from AttemptLog_Classes import AttemptLog
+from Challenge_Classes import AdaptiveSampler
+from Pileup_Classes import PileupMixer
+from WaveformStore_Classes import WaveformStore
+from Profiler_Classes import Profiler, ProfilerOverlay
+from Game_Classes import (RectangleMarker, CircleMarker, ScoreKeeper, MarkerPause, StartSequence, TextCache,
+                          FONT_CACHE, GlyphAtlas, MarkerMotion, Preloader, Scheduler, StartupTimer, TreeLayout,
+                          build_tree_layer, init_display)
 
 class CompositeMarker:
     """Comibines three classes to enable simpler implementation of game marker"""
-    def __init__(self, x, y, size, speed_x, speed_y, color, window_size):
-        self.rectangle_marker = RectangleMarker(x, y, size, speed_x, speed_y, color)
-        self.circle_marker = CircleMarker(window_size)
-        self.encoder = MorseCodeEncoder()
+    REST_RADIUS = 10  # the empty marker waiting at the root of the tree
+
+    def __init__(self, layout, size, color, window_size, atlas=None, sampler=None):
+        self.layout = layout
+        self.rectangle_marker = RectangleMarker(layout, size, color)
+        self.circle_marker = CircleMarker(window_size, atlas)
+        self.encoder = MorseCodeEncoder(sampler)
+        self.motion = MarkerMotion(layout.position(0) + (self.REST_RADIUS,))
+        self.glyph_sizes = sorted(set(layout.radii()))
 
     def draw_marker(self, surface):
-        self.rectangle_marker.draw(surface)
+        return self.rectangle_marker.draw(surface)
     
-    def move_mkr(self, left_pressed, right_pressed, window_width, window_height):
-        self.rectangle_marker.move_mkr(left_pressed, right_pressed, window_width, window_height)
+    def move_mkr(self, left_pressed, right_pressed):
+        self.rectangle_marker.move_mkr(left_pressed, right_pressed)
 
     def reset_marker(self):
         self.rectangle_marker.reset_marker()
@@ -40,7 +54,7 @@ class CompositeMarker:
         self.encoder.reset()
 
     def draw_circle(self, surface):
-        self.circle_marker.draw(surface)
+        return self.circle_marker.draw(surface)
 
     def clear_text(self):
         self.circle_marker.clear_text()
@@ -51,8 +65,30 @@ class CompositeMarker:
     def set_font_attributes(self, TGT_LTR, NEW_SIZE):
         self.circle_marker.set_font_attributes(TGT_LTR, NEW_SIZE)
 
-    def get_radius_from_list(self, move_count):
-        return self.circle_marker.get_radius_from_list(move_count)
+    def glide_to_node(self, text, now, duration):
+        """Start gliding the circle to the node the marker is on, growing or shrinking to fit it"""
+        node = self.rectangle_marker.node
+        radius = self.layout.radius(self.layout.level(node))
+        self.motion.move_to(self.layout.position(node) + (radius,), now, duration)
+        self.circle_marker.text = text
+        self.update(now)
+
+    def jump_to_rest(self):
+        self.motion.jump_to(self.layout.position(0) + (self.REST_RADIUS,))
+        self.clear_text()
+        self.set_circle_attributes(*self.motion.end)
+
+    def update(self, now):
+        """Move the circle to where it is at time now. Returns True while it is still gliding"""
+        x, y, radius = self.motion.position(now)
+        self.set_circle_attributes(x, y, radius)
+        text = self.circle_marker.text
+        if text:
+            # The largest pre-rendered glyph that fits the circle as it is now
+            size = max((size for size in self.glyph_sizes if size <= radius), default=self.glyph_sizes[0])
+            if size != self.circle_marker.font_size or self.circle_marker.text_surface is None:
+                self.set_font_attributes(text, size)
+        return self.motion.moving(now)
 
 
 @dataclass
@@ -64,17 +100,63 @@ class GameConfig:
     TEXT_COLOR: Tuple[int, int, int] = (165, 42, 42)  # Brown
     FONT_SIZE: int = 36
     UPDATE_INTERVAL: float = 0.5  # 500ms in seconds
+    MARKER_GLIDE: float = 0.3  # seconds the game marker takes to move to the next node
     FPS: int = 30
+    ADAPTIVE_CHALLENGES: bool = True  # favour missed and slow characters
+    CHALLENGE_SEED: Optional[int] = None  # seed for the challenge characters
+    ATTEMPT_LOG: Optional[str] = "attempts.mlog"  # binary log of every answer, or None
+    WAVEFORM_STORE: Optional[str] = "waveforms.mwf"  # rendered tones shared between runs, or None
+    PROFILE_PATH: str = "profile.json"  # where F4 saves the profiler's figures
+    SPLASH_SECONDS: float = 0.75  # logo time before the instructions; any key skips it
+    INPUT_MODE: str = "arrows"  # arrows, or straight_key to key with SPACE
+    KEYER_WPM: float = 12  # starting speed estimate for the straight key
+    PILEUP: bool = False  # play each target among other stations
+    PILEUP_STATIONS: int = 5  # other stations calling in pile-up mode
+    AUDIO_BACKEND: str = "mixer"  # mixer, pyaudio, null or wav
+    AUDIO_WAV_PATH: Optional[str] = None  # output file for the wav backend
+
+@dataclass
+class GameAssets:
+    """Images, glyphs and audio loaded before the game starts, possibly on a background thread"""
+    background: pygame.Surface
+    layout: TreeLayout
+    atlas: GlyphAtlas
+    code_player: MorseCodePlayer
+    audio: AudioEngine
+
+    @classmethod
+    def load(cls, config, timer=None):
+        """Load everything; each part is timed when a StartupTimer is given"""
+        def timed(name):
+            return timer.task(name) if timer is not None else contextlib.nullcontext()
+
+        with timed("background image and tree layout"):
+            layout = TreeLayout.for_background(config.WINDOW_SIZE)
+            background = build_tree_layer(pygame.image.load("assets/images/background.png"),
+                                          layout, len(TreeLayout.BACKGROUND_ROWS))
+        with timed("fonts and glyph atlas"):
+            FONT_CACHE.get(config.FONT_SIZE)
+            atlas = CircleMarker.build_atlas(layout.radii())
+        with timed("audio"):
+            store = WaveformStore(config.WAVEFORM_STORE, MORSE_CODE) if config.WAVEFORM_STORE else None
+            code_player = MorseCodePlayer(bank=WaveformBank(MORSE_CODE, store=store))
+            audio = AudioEngine(code_player, create_backend(config.AUDIO_BACKEND, config.AUDIO_WAV_PATH))
+            audio.start()
+            if audio.backend.name != "mixer":
+                code_player.character_buffer("E")  # renders the waveform bank
+        return cls(background, layout, atlas, code_player, audio)
 
 class GameState:
     """Manages the game's current state"""
-    def __init__(self):
+    def __init__(self, now=time.monotonic):
         self.player_moving = False
         self.game_marker_moving = False
         self.left_pressed = False
         self.right_pressed = False
         self.morse_char_target = ""
-        self.last_update_time = time.time()
+        self.challenge_time = None  # when the current target was played
+        self.key_times = []  # challenge_time to each arrow key of the current answer
+        self.last_update_time = now()
 
     def reset_movement(self):
         self.player_moving = False
@@ -82,52 +164,92 @@ class GameState:
         self.right_pressed = False
 
 class MorseInvaderGame:
-    def __init__(self):
-        self.config = GameConfig()
-        self.state = GameState()
+    def __init__(self, config=None, now=time.monotonic, get_events=pygame.event.get, assets=None):
+        """
+        Args:
+            config (GameConfig, optional): Game settings. Defaults to GameConfig().
+            now (callable, optional): Clock used for game timing. Defaults to time.monotonic.
+            get_events (callable, optional): Event source polled once per frame. Defaults to pygame.event.get.
+            assets (GameAssets, optional): Preloaded assets. Defaults to loading them now.
+        """
+        self.config = config if config is not None else GameConfig()
+        self.now = now
+        self.get_events = get_events
+        self.assets = assets
+        self.state = GameState(now)
+        self.scheduler = Scheduler(now)
+        self.profiler = Profiler()
+        self.last_step_start = None
+        self.overlay_timer = None
         self.initialize_pygame()
         self.initialize_game_objects()
 
     def initialize_pygame(self):
-        """Initialize Pygame and create the game window"""
-        pygame.init()
-        pygame.display.set_caption("Morse Invader")
-        self.window = pygame.display.set_mode(self.config.WINDOW_SIZE)
-        self.font = pygame.font.Font(None, self.config.FONT_SIZE)
-        self.background = pygame.image.load("assets/images/background.png")
-        self.clock = pygame.time.Clock()
+        """Initialize Pygame, or reuse the intro's window, and load the assets if not preloaded"""
+        self.window = init_display(self.config.WINDOW_SIZE)
+        if self.assets is None:
+            self.assets = GameAssets.load(self.config)
+        self.font = FONT_CACHE.get(self.config.FONT_SIZE)
+        self.background = self.assets.background.convert()
+        self.morse_code_text = TextCache(self.font)
+        self.interpreted_text = TextCache(self.font)
+        self.dirty_rects = []  # areas drawn in the last frame, erased in the next
+        self.last_frame = None  # state drawn in the last frame; None forces a full redraw
 
     def initialize_game_objects(self):
         """Initialize game objects and components"""
-        window_center = self.config.WINDOW_SIZE[0] // 2
-        
+        layout = self.assets.layout
+
         # Initialize game components
         self.player_marker = RectangleMarker(
-            window_center - 25, 55, 
-            self.config.BLOCK_SIZE, 10, 10, 
+            layout,
+            self.config.BLOCK_SIZE,
             self.config.MARKER_COLOR
         )
         
+        self.sampler = (AdaptiveSampler(seed=self.config.CHALLENGE_SEED)
+                        if self.config.ADAPTIVE_CHALLENGES else None)
         self.game_marker = CompositeMarker(
-            window_center - 25, 55,
-            self.config.BLOCK_SIZE, 10, 10,
+            layout,
+            self.config.BLOCK_SIZE,
             self.config.MARKER_COLOR,
-            self.config.WINDOW_SIZE
+            self.config.WINDOW_SIZE,
+            self.assets.atlas,
+            self.sampler
         )
         
-        self.score_keeper = ScoreKeeper(self.font, *self.config.WINDOW_SIZE)
+        self.score_keeper = ScoreKeeper(
+            self.font, *self.config.WINDOW_SIZE,
+            on_outcome=self.sampler.record if self.sampler is not None else None
+        )
         self.morse_interpreter = MorseCodeInterpreter()
-        self.code_player = MorseCodePlayer()
+        self.code_player = self.assets.code_player
+        self.audio = self.assets.audio
+        self.audio.on_start = lambda message: self.profiler.end('key_to_audio')
+        self.overlay = ProfilerOverlay(
+            self.profiler, FONT_CACHE.get(22),
+            (10, self.config.WINDOW_SIZE[1] - 130)
+        )
         self.encoder = MorseCodeEncoder()
         self.marker_pause = MarkerPause()
+        self.input_mode = self.config.INPUT_MODE
+        self.straight_key = StraightKeyDecoder(self.config.KEYER_WPM)
+        self.pileup = self.config.PILEUP
+        self.pileup_mixer = PileupMixer(self.audio.samplerate, seed=self.config.CHALLENGE_SEED)
+        self.key_gap_timer = None
+        self.animation_timer = None
+        self.mode_text = TextCache(FONT_CACHE.get(24))
+        self.attempt_log = AttemptLog(self.config.ATTEMPT_LOG) if self.config.ATTEMPT_LOG else None
 
     def handle_input(self):
         """Handle user input events"""
-        for event in pygame.event.get():
+        for event in self.get_events():
             if event.type == pygame.QUIT:
                 return False
-            
-            if event.type == pygame.KEYDOWN:
+
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.redraw()
+            elif event.type == pygame.KEYDOWN:
                 self.handle_keydown(event)
             elif event.type == pygame.KEYUP:
                 self.handle_keyup(event)
@@ -144,6 +266,16 @@ class MorseInvaderGame:
             self.handle_return_key()
         elif event.key == pygame.K_r:
             self.handle_random_character()
+        elif event.key == pygame.K_SPACE and self.input_mode == "straight_key":
+            self.handle_straight_key_down(getattr(event, 'time', None))
+        elif event.key == pygame.K_k:
+            self.toggle_input_mode()
+        elif event.key == pygame.K_p:
+            self.pileup = not self.pileup
+        elif event.key == pygame.K_F3:
+            self.toggle_overlay()
+        elif event.key == pygame.K_F4:
+            self.profiler.dump(self.config.PROFILE_PATH)
 
     def handle_keyup(self, event):
         """Handle keyboard release events"""
@@ -151,28 +283,75 @@ class MorseInvaderGame:
             self.state.left_pressed = False
         elif event.key == pygame.K_RIGHT:
             self.state.right_pressed = False
+        elif event.key == pygame.K_SPACE and self.input_mode == "straight_key":
+            self.handle_straight_key_up(getattr(event, 'time', None))
+
+    def toggle_input_mode(self):
+        """Switch between arrow-key entry and the straight key"""
+        self.input_mode = "straight_key" if self.input_mode == "arrows" else "arrows"
+        self.straight_key.reset()
+        if self.key_gap_timer is not None:
+            self.scheduler.cancel(self.key_gap_timer)
+            self.key_gap_timer = None
+
+    def handle_straight_key_down(self, when=None):
+        """Start timing a press from when, the event's arrival time, or from now if it has none"""
+        if self.key_gap_timer is not None:
+            self.scheduler.cancel(self.key_gap_timer)
+            self.key_gap_timer = None
+        self.straight_key.key_down(self.now() if when is None else when)
+
+    def handle_straight_key_up(self, when=None):
+        """Classify the press as soon as the key is released and enter it like an arrow key"""
+        when = self.now() if when is None else when
+        symbol = self.straight_key.key_up(when)
+        if symbol is None:
+            return
+        self.handle_movement_key(symbol == '.', symbol == '-')
+        self.key_gap_timer = self.scheduler.call_at(when + self.straight_key.char_gap(), self.check_key_gap)
+
+    def check_key_gap(self):
+        """A character gap on the straight key submits the answer, like Enter"""
+        self.key_gap_timer = None
+        if self.straight_key.poll(self.now()) == 'char':
+            self.handle_return_key()
 
     def handle_movement_key(self, left: bool, right: bool):
         """Handle movement key presses"""
         self.state.left_pressed = left
         self.state.right_pressed = right
         self.state.player_moving = True
+        if self.state.challenge_time is not None:
+            self.state.key_times.append(self.now() - self.state.challenge_time)
         self.morse_interpreter.letter_message = ""
         self.morse_interpreter.handle_arrow_keys(left,right)
 
     def handle_return_key(self):
         """Handle return key press"""
         if self.morse_interpreter.check_valid_morse_code():
-            self.code_player.play_morse_code(
+            self.profiler.begin('key_to_audio')
+            self.audio.play(
                 self.morse_interpreter.lookup_morse_code(
                     self.morse_interpreter.morse_code
                 )
             )
             
-        if self.state.morse_char_target == self.morse_interpreter.current_morse_code():
-            self.score_keeper.increment_player_score()
-        else:
-            self.score_keeper.increment_game_score()
+        response_time = (self.now() - self.state.challenge_time
+                         if self.state.challenge_time is not None else None)
+        entered = self.morse_interpreter.current_morse_code()
+        correct = self.state.morse_char_target == entered
+        self.score_keeper.record_outcome(self.state.morse_char_target, correct, response_time)
+        if self.attempt_log is not None and self.state.challenge_time is not None:
+            self.attempt_log.record(
+                self.state.morse_char_target,
+                self.morse_interpreter.morse_code,
+                entered,
+                correct,
+                response_time,
+                self.state.key_times
+            )
+        self.state.challenge_time = None
+        self.state.key_times = []
 
         self.morse_interpreter.handle_return_key()
         self.morse_interpreter.morse_code = ""
@@ -185,47 +364,73 @@ class MorseInvaderGame:
         if not self.state.game_marker_moving:
             self.state.morse_char_target = self.game_marker.encoder.generate_random_character()
             self.game_marker.encode_character(self.state.morse_char_target)
-            self.code_player.play_morse_code(self.state.morse_char_target)
+            self.audio.cancel()
+            self.profiler.begin('key_to_audio')
+            if self.pileup:
+                self.play_pileup(self.state.morse_char_target)
+            else:
+                self.audio.play(self.state.morse_char_target)
+            self.state.challenge_time = self.now()
+            self.state.key_times = []
             
             self.morse_interpreter.morse_code = ""
             self.player_marker.reset_marker()
             self.marker_pause.set_count(8)
             self.state.game_marker_moving = True
+            self.scheduler.call_at(
+                max(self.now(), self.state.last_update_time + self.config.UPDATE_INTERVAL),
+                self.update_game_marker
+            )
+
+    def play_pileup(self, target):
+        """Play the target at the usual pitch and speed with other stations calling around it"""
+        player = self.code_player
+        stations = self.pileup_mixer.pileup(target, self.config.PILEUP_STATIONS,
+                                            freq=player.freq, wpm=1.2 / player.dit_duration)
+        self.audio.play_samples(self.pileup_mixer.mix(stations), target)
 
     def update_game_marker(self):
-        """Update game marker position and state"""
-        current_time = time.time()
-        if (current_time - self.state.last_update_time >= self.config.UPDATE_INTERVAL 
-            and self.state.game_marker_moving):
+        """
+        Step the game marker. Runs from the scheduler while the marker is
+        moving: once per frame time during the pause, then every UPDATE_INTERVAL
+        """
+        if not self.state.game_marker_moving:
+            return
+        current_time = self.now()
+        if self.marker_pause.update():
+            move_done, left, right = self.game_marker.next_dot_dash()
+            self.game_marker.move_mkr(left, right)
+
+            self.update_marker_visuals()
             
-            if self.marker_pause.update():
-                move_done, left, right = self.game_marker.next_dot_dash()
-                self.game_marker.move_mkr(
-                    left, right,
-                    self.config.WINDOW_SIZE[0],
-                    self.config.WINDOW_SIZE[1]
-                )
-                
-                self.update_marker_visuals()
-                
-                if move_done:
-                    self.state.game_marker_moving = False
-                    self.game_marker.reset_marker()
-                else:
-                    self.state.last_update_time = current_time
+            if move_done:
+                self.state.game_marker_moving = False
+                self.game_marker.reset_marker()
             else:
-                self.reset_game_marker_position()
+                self.state.last_update_time = current_time
+                self.scheduler.call_later(self.config.UPDATE_INTERVAL, self.update_game_marker)
+        else:
+            self.reset_game_marker_position()
+            self.scheduler.call_later(1 / self.config.FPS, self.update_game_marker)
 
     def update_marker_visuals(self):
-        """Update visual aspects of the game marker"""
-        move_count = self.game_marker.rectangle_marker.move_count
-        radius, xy_mod = self.game_marker.get_radius_from_list(move_count)
-        
-        x_mod = xy_mod[0] + self.game_marker.rectangle_marker.x
-        y_mod = xy_mod[1] + self.game_marker.rectangle_marker.y
-        
-        self.game_marker.set_circle_attributes(x_mod, y_mod, radius)
-        self.game_marker.set_font_attributes(self.state.morse_char_target, radius)
+        """Start the game marker gliding to its new node, showing the target"""
+        glide = min(self.config.MARKER_GLIDE, self.config.UPDATE_INTERVAL)
+        self.game_marker.glide_to_node(self.state.morse_char_target, self.now(), glide)
+        self.start_animation()
+
+    def start_animation(self):
+        """Redraw every frame until both markers have arrived"""
+        if self.animation_timer is None:
+            self.animation_timer = self.scheduler.call_later(1 / self.config.FPS, self.animate)
+
+    def animate(self):
+        now = self.now()
+        self.animation_timer = None
+        gliding = self.game_marker.update(now)
+        gliding = self.player_marker.update(now) or gliding
+        if gliding:
+            self.start_animation()
 
     def reset_game_state(self):
         """Reset game state after input verification"""
@@ -236,44 +441,115 @@ class MorseInvaderGame:
 
     def reset_game_marker_position(self):
         """Reset game marker to starting position"""
-        self.game_marker.set_circle_attributes(
-            (self.config.WINDOW_SIZE[0] // 2) - 15,
-            65,
-            10
-        )
-        self.game_marker.clear_text()
+        self.game_marker.jump_to_rest()
 
     def update_display(self):
-        """Update game display"""
-        self.window.blit(self.background, (0, 0))
-        self.draw_morse_code()
-        self.draw_interpreted_code()
-        self.score_keeper.display_score(self.window)
-        
+        """
+        Update game display.
+
+        Only the areas that were drawn in the last frame or are drawn in
+        this one are erased and pushed to the screen, and nothing is drawn
+        at all while the visible state is unchanged.
+        """
         if self.state.player_moving:
-            self.player_marker.move_mkr(
-                self.state.left_pressed,
-                self.state.right_pressed,
-                self.config.WINDOW_SIZE[0],
-                self.config.WINDOW_SIZE[1]
-            )
+            now = self.now()
+            if self.player_marker.move_mkr(self.state.left_pressed, self.state.right_pressed, now):
+                self.player_marker.update(now)
+                self.start_animation()
             self.state.player_moving = False
-        
-        self.player_marker.draw(self.window)
-        self.game_marker.draw_circle(self.window)
-        pygame.display.flip()
+
+        frame = self.frame_state()
+        if frame == self.last_frame:
+            return
+        full_redraw = self.last_frame is None
+        self.last_frame = frame
+
+        if full_redraw:
+            self.window.blit(self.background, (0, 0))
+        else:
+            for rect in self.dirty_rects:
+                self.window.blit(self.background, rect, rect)
+
+        drawn = [
+            self.draw_morse_code(),
+            self.draw_interpreted_code(),
+            self.draw_modes(),
+            self.score_keeper.display_score(self.window),
+            self.player_marker.draw(self.window),
+            self.game_marker.draw_circle(self.window),
+            self.overlay.draw(self.window),
+        ]
+        drawn = [rect for rect in drawn if rect is not None]
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects + drawn)
+        self.dirty_rects = drawn
+
+    def frame_state(self):
+        """Everything update_display draws; the frame is only redrawn when this changes"""
+        circle = self.game_marker.circle_marker
+        return (
+            self.morse_interpreter.morse_code,
+            self.morse_interpreter.letter_message,
+            self.morse_interpreter.answer_color,
+            self.score_keeper.player_score,
+            self.score_keeper.game_score,
+            self.player_marker.x,
+            self.player_marker.y,
+            tuple(circle.circle_center),
+            circle.circle_radius,
+            circle.text if circle.text_surface is not None else None,
+            self.overlay.visible,
+            self.overlay.version,
+            self.input_mode,
+            self.pileup,
+            round(self.straight_key.wpm),
+        )
+
+    def toggle_overlay(self):
+        """Show or hide the profiling overlay, which refreshes twice a second while shown"""
+        if self.overlay_timer is not None:
+            self.scheduler.cancel(self.overlay_timer)
+            self.overlay_timer = None
+        if self.overlay.toggle():
+            self.overlay_timer = self.scheduler.call_later(0.5, self.refresh_overlay)
+
+    def refresh_overlay(self):
+        self.overlay.refresh()
+        self.overlay_timer = self.scheduler.call_later(0.5, self.refresh_overlay)
+
+    def redraw(self):
+        """Force a full redraw on the next frame, e.g. after the window was covered"""
+        self.last_frame = None
 
     def draw_morse_code(self):
-        """Draw current morse code input"""
+        """Draw current morse code input, returning the area drawn"""
         message = (f'Morse Code Symbol: {self.morse_interpreter.morse_code}'
                   if self.morse_interpreter.morse_code
                   else '_________________:')
         
-        text_surface = self.font.render(message, True, self.config.TEXT_COLOR)
-        self.window.blit(text_surface, (20, 20))
+        # Flag a dead prefix as soon as it leaves the Morse tree
+        color = (self.config.TEXT_COLOR if self.morse_interpreter.prefix_is_valid()
+                 else (255, 0, 0))  # RED
+        text_surface = self.morse_code_text.render(message, color)
+        return self.window.blit(text_surface, (20, 20))
+
+    def draw_modes(self):
+        """Draw the straight key's speed and the pile-up size while in use, returning the area drawn or None"""
+        modes = []
+        if self.input_mode == "straight_key":
+            modes.append(f"Straight key (SPACE): {self.straight_key.wpm:.0f} WPM")
+        if self.pileup:
+            modes.append(f"Pile-up: {self.config.PILEUP_STATIONS} stations")
+        if not modes:
+            return None
+        message = "   ".join(modes)
+        text_surface = self.mode_text.render(message, self.config.TEXT_COLOR)
+        return self.window.blit(text_surface, (20, 60))
 
     def draw_interpreted_code(self):
-        """Draw interpreted morse code character"""
+        """Draw interpreted morse code character, returning the area drawn"""
         if self.morse_interpreter.letter_message:
             message = self.morse_interpreter.letter_message
             color = self.morse_interpreter.answer_color
@@ -281,27 +557,124 @@ class MorseInvaderGame:
             message = '_________________:'
             color = self.config.TEXT_COLOR
             
-        text_surface = self.font.render(message, True, color)
-        self.window.blit(
+        text_surface = self.interpreted_text.render(message, color)
+        return self.window.blit(
             text_surface,
             (self.config.WINDOW_SIZE[0] - text_surface.get_width() - 20, 20)
         )
 
+    def step(self, draw=True):
+        """Run one frame, skipping the drawing if draw is False. Returns False once the player has quit"""
+        profiler = self.profiler
+        start = profiler.clock()
+        if self.last_step_start is not None:
+            profiler.record('frame_interval', start - self.last_step_start)
+        self.last_step_start = start
+
+        running = profiler.timed('handle_input', self.handle_input)
+        profiler.timed('update_game_marker', self.scheduler.run_due)
+        if draw:
+            profiler.timed('update_display', self.update_display)
+        profiler.record('frame', profiler.clock() - start)
+        return running
+
+    def shutdown(self):
+        """Stop audio, finish writing the attempt log and close pygame"""
+        self.audio.close()
+        if self.attempt_log is not None:
+            self.attempt_log.close()
+        pygame.quit()
+
+    def wait_for_input(self, frame_end=None):
+        """
+        Sleep on the event queue until frame_end at least, then until an
+        input event has arrived or the next scheduled marker step is due.
+
+        Every event taken off the queue is stamped with its arrival time as
+        'time', on the now() clock, so key timing does not depend on when
+        the frame handles it.  The events are put back at the head of the
+        queue, so the next frame reads them through get_events like any
+        other and a recorder wrapping the event source sees them.
+        """
+        arrived = []
+        while True:
+            now = self.now()
+            if frame_end is not None and now < frame_end:
+                deadline = frame_end
+            elif arrived:
+                break
+            else:
+                deadline = self.scheduler.next_deadline()
+                if deadline is not None and deadline <= now:
+                    break
+            if deadline is None:
+                event = pygame.event.wait()
+            else:
+                event = pygame.event.wait(int((deadline - now) * 1000 + 0.999))
+            if event.type != pygame.NOEVENT:
+                arrived.append(pygame.event.Event(event.type, {'time': self.now(), **event.dict}))
+        if arrived:
+            queued = pygame.event.get()
+            for event in arrived + queued:
+                pygame.event.post(event)
+
     def run(self):
-        """Main game loop"""
+        """
+        Main game loop. Frames are capped at FPS, and between frames the
+        loop sleeps on the event queue, so an idle game uses no CPU
+        """
         running = True
         self.reset_game_marker_position()
         while running:
-            running = self.handle_input()
-            self.update_game_marker()
-            self.update_display()
-            self.clock.tick(self.config.FPS)
+            frame_start = self.now()
+            running = self.step()
+            if running:
+                self.wait_for_input(frame_start + 1 / self.config.FPS)
 
-        pygame.quit()
-        sys.exit()
+        self.shutdown()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Morse Invader")
+    parser.add_argument('--record', help="save the key presses of this session to a JSON script")
+    parser.add_argument('--timing', action='store_true', help="print where startup time goes")
+    parser.add_argument('--profile', help="save frame times and latencies to this JSON file on exit")
+    args = parser.parse_args()
+
+    timer = StartupTimer(IMPORT_STARTED)
+    timer.mark("imports")
+    config = GameConfig()
+    if args.profile:
+        config.PROFILE_PATH = args.profile
     start_sequence = StartSequence()
-    start_sequence.run_intro()
-    game = MorseInvaderGame()
-    game.run()
\ No newline at end of file
+    start_sequence.show_logo()
+    timer.mark("splash screen")
+
+    # Load the game while the splash screen is up
+    preloader = Preloader(timer)
+    preloader.add("all game assets", lambda: GameAssets.load(config, timer))
+    preloader.start()
+    start_sequence.wait_on_logo(config.SPLASH_SECONDS)
+    timer.mark("splash wait", waiting=True)
+    assets = preloader.result("all game assets")
+    timer.mark("preload remainder")
+    start_sequence.show_instructions()
+    timer.mark("instructions", waiting=True)
+
+    get_events = pygame.event.get
+    if args.record:
+        from Simulation_Classes import EventRecorder
+        get_events = recorder = EventRecorder(pygame.event.get, time.time)
+    game = MorseInvaderGame(config, get_events=get_events, assets=assets)
+    game.reset_game_marker_position()
+    game.update_display()
+    timer.mark("first game frame")
+    if args.timing:
+        print(timer.report(), file=sys.stderr)
+    try:
+        game.run()
+    finally:
+        if args.record:
+            recorder.save(args.record)
+        if args.profile:
+            game.profiler.dump(args.profile)
+    sys.exit()
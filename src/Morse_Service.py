@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from Service_Classes import RenderServer, WaveformCache
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve Morse code encoding, decoding and WAV rendering over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=8373, help="port to listen on (default: %(default)s)")
+    parser.add_argument('--cache', default='render_cache', help="directory for rendered audio (default: %(default)s)")
+    parser.add_argument('--max-mb', type=float, default=512,
+                        help="size the cache is trimmed to, in megabytes (default: %(default)s)")
+    parser.add_argument('--workers', type=int, help="render processes (default: one per core)")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        cache = WaveformCache(args.cache, int(args.max_mb * (1 << 20)), args.workers)
+    except OSError as error:
+        print(f"Morse_Service: {error}", file=sys.stderr)
+        return 1
+    try:
+        with RenderServer((args.host, args.port), cache, args.verbose) as server:
+            host, port = server.server_address[:2]
+            print(f"render service on http://{host}:{port}/ (cache {args.cache}, "
+                  f"{len(cache.entries)} files)", flush=True)
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(f"Morse_Service: {error}", file=sys.stderr)
+        return 1
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
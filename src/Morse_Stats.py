@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import time
+
+from AttemptLog_Classes import character_stats, read_attempts
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Show per-character accuracy and answer times from attempt logs.")
+    parser.add_argument('logs', nargs='+', help="attempt log files (the game writes attempts.mlog)")
+    parser.add_argument('--days', type=float, help="only count attempts from the last DAYS days")
+    parser.add_argument('--sort', choices=('accuracy', 'response', 'attempts', 'char'), default='accuracy',
+                        help="table order, hardest first (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print the statistics as JSON")
+    return parser
+
+
+def merge(stats, more):
+    """Combine two character_stats() results; medians are approximated by the weighted mean"""
+    for char, entry in more.items():
+        current = stats.get(char)
+        if current is None:
+            stats[char] = dict(entry)
+            continue
+        # Only the timed attempts went into the response times, so they are the weights
+        for key in ('mean_response_ms', 'median_response_ms'):
+            if entry['timed'] and current['timed']:
+                current[key] = ((current[key] * current['timed'] + entry[key] * entry['timed'])
+                                / (current['timed'] + entry['timed']))
+            elif entry['timed']:
+                current[key] = entry[key]
+        current['timed'] += entry['timed']
+        current['attempts'] += entry['attempts']
+        current['correct'] += entry['correct']
+        current['accuracy'] = current['correct'] / current['attempts']
+    return stats
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    since = time.time() - args.days * 86400 if args.days is not None else None
+    stats = {}
+    try:
+        for path in args.logs:
+            merge(stats, character_stats(read_attempts(path), since))
+    except (OSError, ValueError) as error:
+        print(f"Morse_Stats: {error}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        json.dump(stats, sys.stdout, indent=1, sort_keys=True)
+        print()
+        return 0
+
+    orders = {
+        'accuracy': lambda item: item[1]['accuracy'],
+        'response': lambda item: -(item[1]['median_response_ms'] or 0),
+        'attempts': lambda item: -item[1]['attempts'],
+        'char': lambda item: item[0],
+    }
+    print(f"{'char':>4} {'attempts':>9} {'accuracy':>9} {'median ms':>10} {'mean ms':>9}")
+    for char, entry in sorted(stats.items(), key=orders[args.sort]):
+        median = entry['median_response_ms']
+        mean = entry['mean_response_ms']
+        print(f"{char:>4} {entry['attempts']:>9} {entry['accuracy']:>9.1%} "
+              f"{median if median is not None else float('nan'):>10.0f} "
+              f"{mean if mean is not None else float('nan'):>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from Channel_Classes import ChannelConditions, ChannelSimulator
+from MorseCode_Classes import MORSE_CODE, PRACTICE_CHARACTERS, MessageRenderer
+
+
+@dataclass
+class Station:
+    """
+    One transmitting station in a pile-up.
+
+    Attributes:
+        message (str): The text it sends.
+        freq (float): Its tone in Hz.
+        wpm (float): Its sending speed.
+        offset (float): Seconds after the start of the mix at which it starts sending.
+        amplitude (float): Its level relative to a full-scale tone.
+        farnsworth_wpm (float): Overall speed for Farnsworth spacing, or None.
+        conditions (ChannelConditions): Its own fading, chirp and jitter, or None for soft keying only.
+    """
+    message: str
+    freq: float = 700
+    wpm: float = 20
+    offset: float = 0.0
+    amplitude: float = 1.0
+    farnsworth_wpm: Optional[float] = None
+    conditions: Optional[ChannelConditions] = None
+
+
+class PileupMixer:
+    """
+    Mixes several stations into one buffer.
+
+    Each station is rendered whole by a ChannelSimulator, so it gets
+    click-free keying and its own fading or chirp, then scaled and added
+    into the output at its offset with one array operation.  Shared band
+    noise is applied once to the sum, and the mix is scaled down to level
+    only if its peak would exceed it, so a quiet pile-up is not amplified.
+    Renderers are cached per speed and pitch.
+
+    Attributes:
+        samplerate (int): Sample rate of the mix.
+        level (float): Highest peak allowed in the mix.
+        band (ChannelConditions): Noise applied to the whole mix, or None.
+        rng (np.random.Generator): Source of all fading, jitter and noise.
+    """
+
+    def __init__(self, samplerate=44100, level=0.9, band=None, seed=None):
+        self.samplerate = samplerate
+        self.level = level
+        self.band = band
+        self.rng = np.random.default_rng(seed)
+        self._renderers = {}
+
+    def renderer(self, station):
+        key = (station.wpm, station.farnsworth_wpm, station.freq)
+        renderer = self._renderers.get(key)
+        if renderer is None:
+            renderer = self._renderers[key] = MessageRenderer(
+                MORSE_CODE, wpm=station.wpm, farnsworth_wpm=station.farnsworth_wpm,
+                freq=station.freq, samplerate=self.samplerate)
+        return renderer
+
+    def mix(self, stations, center=None):
+        """
+        Render and sum stations into float32 samples.
+
+        Args:
+            stations (list): The Station objects to mix.
+            center (float, optional): Centre of the band noise in Hz. Defaults to the first station's tone.
+        """
+        rendered = []
+        for station in stations:
+            simulator = ChannelSimulator(station.conditions, self.rng)
+            samples = simulator.render(self.renderer(station), station.message)
+            start = max(0, round(station.offset * self.samplerate))
+            rendered.append((start, samples, np.float32(station.amplitude)))
+        total = max((start + len(samples) for start, samples, _ in rendered), default=0)
+
+        out = np.zeros(total, dtype=np.float32)
+        for start, samples, amplitude in rendered:
+            out[start:start + len(samples)] += samples * amplitude
+        if self.band is not None and total:
+            center = center if center is not None else stations[0].freq
+            out = ChannelSimulator(self.band, self.rng).impair(out, self.samplerate, center)
+        peak = max(out.max(initial=0.0), -out.min(initial=0.0))
+        if peak > self.level:
+            out *= self.level / peak
+        return out
+
+    def pileup(self, target, count, freq=700, wpm=20, spread=400, min_separation=80,
+               max_offset=0.8, characters=PRACTICE_CHARACTERS):
+        """
+        Make a pile-up around one target station.
+
+        The target sends target at freq, starting first; count other stations
+        each send one or two random characters at a random pitch within
+        spread/2 Hz of it but at least min_separation away, at 80-150% of its
+        speed, starting within max_offset seconds, at 40-100% of its level.
+
+        Returns:
+            list: The Station objects, the target first.
+        """
+        rng = self.rng
+        stations = [Station(target, freq=freq, wpm=wpm)]
+        offsets = rng.uniform(min_separation, spread / 2, count) * rng.choice((-1, 1), count)
+        speeds = wpm * rng.uniform(0.8, 1.5, count)
+        starts = rng.uniform(0, max_offset, count)
+        amplitudes = rng.uniform(0.4, 1.0, count)
+        lengths = rng.integers(1, 3, count)
+        for index in range(count):
+            message = ''.join(rng.choice(list(characters), lengths[index]))
+            stations.append(Station(message, freq=max(100.0, freq + float(offsets[index])),
+                                    wpm=float(speeds[index]), offset=float(starts[index]),
+                                    amplitude=float(amplitudes[index])))
+        return stations
+
+### END OF CLASS -  PileupMixer ###
@@ -0,0 +1,186 @@
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer of the most recent integer samples.
+
+    Appending overwrites the oldest sample once the buffer is full, so
+    memory stays constant however long the game runs.
+
+    Attributes:
+        samples (np.ndarray): Storage for the samples, in write order modulo its size.
+        count (int): Total number of samples ever appended.
+    """
+    def __init__(self, size=1024):
+        self.samples = np.zeros(size, dtype=np.int64)
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.count % len(self.samples)] = value
+        self.count += 1
+
+    def values(self):
+        """The samples currently held, oldest first"""
+        size = len(self.samples)
+        if self.count <= size:
+            return self.samples[:self.count].copy()
+        start = self.count % size
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+### END OF CLASS -  RingBuffer ###
+
+
+class Profiler:
+    """
+    Low-overhead timing of game sections and input-to-audio latency.
+
+    Durations are taken with time.perf_counter_ns and stored as integer
+    nanoseconds in one RingBuffer per metric; recording costs two clock
+    reads and one array store, so the profiler can stay on all the time.
+    Percentiles are only computed when summary() is asked for.
+
+    Latencies that end on another thread, like a key press to the first
+    audio sample, are measured with begin() and end(): begin() notes the
+    start time under a name and end() records the time since then.
+
+    Attributes:
+        size (int): Samples kept per metric.
+        metrics (dict): RingBuffer for each metric name.
+    """
+    def __init__(self, size=1024, clock=time.perf_counter_ns):
+        self.size = size
+        self.clock = clock
+        self.metrics = {}
+        self._started = {}
+
+    def record(self, name, nanoseconds):
+        buffer = self.metrics.get(name)
+        if buffer is None:
+            buffer = self.metrics[name] = RingBuffer(self.size)
+        buffer.append(nanoseconds)
+
+    def timed(self, name, function, *args):
+        """Call function(*args), recording how long it took under name. Returns its result"""
+        start = self.clock()
+        result = function(*args)
+        self.record(name, self.clock() - start)
+        return result
+
+    def begin(self, name):
+        self._started[name] = self.clock()
+
+    def end(self, name):
+        start = self._started.pop(name, None)
+        if start is not None:
+            self.record(name, self.clock() - start)
+
+    def summary(self):
+        """Count, mean, p50, p95, p99 and max in milliseconds for each metric"""
+        summary = {}
+        for name, buffer in list(self.metrics.items()):
+            values = buffer.values() / 1e6
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            summary[name] = {
+                'count': buffer.count,
+                'mean': round(float(values.mean()), 3),
+                'p50': round(float(p50), 3),
+                'p95': round(float(p95), 3),
+                'p99': round(float(p99), 3),
+                'max': round(float(values.max()), 3),
+            }
+        return summary
+
+    def rate(self, name, seconds=1.0):
+        """Samples of a metric recorded per second over the last few seconds, e.g. frames per second"""
+        buffer = self.metrics.get(name)
+        if buffer is None or buffer.count < 2:
+            return 0.0
+        # Interval metrics hold the time between events; sum the newest back to `seconds`
+        intervals = buffer.values()[::-1]
+        elapsed = np.cumsum(intervals)
+        within = int(np.searchsorted(elapsed, seconds * 1e9, side='right'))
+        if within == 0:
+            return 1e9 / float(intervals[0])
+        return within / (float(elapsed[within - 1]) / 1e9)
+
+    def dump(self, path):
+        """Write the summary and the raw samples in milliseconds to a JSON file"""
+        data = {
+            'summary': self.summary(),
+            'samples_ms': {name: (buffer.values() / 1e6).round(4).tolist()
+                           for name, buffer in list(self.metrics.items())},
+        }
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=1)
+
+### END OF CLASS -  Profiler ###
+
+
+class ProfilerOverlay:
+    """
+    An on-screen table of the profiler's frame rate and latencies.
+
+    The text is re-rendered only by refresh(), which the game schedules a
+    few times a second while the overlay is shown, so the overlay does not
+    force a redraw every frame.
+
+    Attributes:
+        profiler (Profiler): The source of the figures.
+        visible (bool): Whether the overlay is drawn.
+        version (int): Bumped on every refresh, so a change can be detected.
+        position (tuple): Top-left corner of the overlay.
+    """
+    ROWS = (
+        ('frame', "frame"),
+        ('handle_input', "input"),
+        ('update_game_marker', "marker"),
+        ('update_display', "display"),
+        ('key_to_audio', "key->audio"),
+    )
+
+    def __init__(self, profiler, font, position=(10, 440)):
+        self.profiler = profiler
+        self.font = font
+        self.position = position
+        self.visible = False
+        self.version = 0
+        self.surface = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.refresh()
+        return self.visible
+
+    def refresh(self):
+        summary = self.profiler.summary()
+        lines = [f"{self.profiler.rate('frame_interval'):5.1f} frames/s   ms: p50 / p95 / p99"]
+        for metric, label in self.ROWS:
+            entry = summary.get(metric)
+            if entry is None:
+                lines.append(f"{label:<11} -")
+            else:
+                lines.append(f"{label:<11} {entry['p50']:7.2f} {entry['p95']:7.2f} {entry['p99']:7.2f}")
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(surface.get_width() for surface in rendered) + 12
+        self.surface = pygame.Surface((width, line_height * len(rendered) + 8), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 170))
+        for index, surface in enumerate(rendered):
+            self.surface.blit(surface, (6, 4 + index * line_height))
+        self.version += 1
+
+    def draw(self, window):
+        """Draw the overlay if it is visible, returning the area drawn or None"""
+        if not self.visible or self.surface is None:
+            return None
+        return window.blit(self.surface, self.position)
+
+### END OF CLASS -  ProfilerOverlay ###
@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from Batch_Classes import RenderJob, render_job
+from MorseCode_Classes import MORSE_CODE
+from MorseStream_Classes import MorseStreamCodec
+
+MAX_TEXT = 10000  # characters accepted in one request
+
+
+class WaveformCache:
+    """
+    A size-bounded, content-addressed directory of rendered WAV files.
+
+    A file's name is the SHA-256 of the settings it was rendered with, so
+    the same request always maps to the same file and a file never needs
+    to be invalidated.  Renders run in a process pool through
+    Batch_Classes.render_job, which writes straight into the file; the file
+    only takes its final name once it is complete, so a half-written file
+    is never served.  Identical requests that arrive while a render is
+    running wait for that one render.  When the files add up to more than
+    max_bytes the least recently used are deleted; across restarts the
+    order falls back to the files' modification times.  Files are handed
+    out already open, so an eviction cannot remove one between lookup and
+    sending; the open handle keeps it readable.
+
+    Attributes:
+        directory (str): Where the files are kept.
+        max_bytes (int): Total size the cache is trimmed to.
+        entries (OrderedDict): File size for each cached key, least recently used first.
+        total (int): Bytes in all cached files.
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that needed a render.
+    """
+    def __init__(self, directory, max_bytes=512 << 20, workers=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.scan()
+
+    @staticmethod
+    def key(job):
+        settings = asdict(job)
+        del settings['name']
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def path(self, key, suffix='.wav'):
+        return os.path.join(self.directory, key + suffix)
+
+    def scan(self):
+        """Register the files already in the directory, oldest first, and delete unfinished ones"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.part.wav'):
+                os.remove(entry.path)
+            elif entry.name.endswith('.wav') and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total += size
+        self.evict()
+
+    def open(self, job):
+        """
+        Return (key, file, hit): the rendered WAV for job, open for
+        reading, and whether it came from the cache.  Renders it first if
+        needed, blocking until it is done.
+        """
+        key = self.key(job)
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return key, open(self.path(key), 'rb'), True
+            future = self._pending.get(key)
+            if future is None:
+                self.misses += 1
+                job = RenderJob(**{**asdict(job), 'name': key + '.part'})
+                future = self._pending[key] = self.pool.submit(render_job, job, self.directory, 'wav')
+        try:
+            entry = future.result()
+        except BaseException:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+            raise
+        with self._lock:
+            if self._pending.get(key) is future:
+                # The first waiter to get here publishes the file
+                del self._pending[key]
+                os.replace(self.path(key, '.part.wav'), self.path(key))
+                self.entries[key] = entry['bytes']
+                self.total += entry['bytes']
+                self.evict(keep=key)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return key, open(self.path(key), 'rb'), False
+        return self.open(job)  # evicted again before this waiter woke up
+
+    def evict(self, keep=None):
+        """Delete least recently used files until the total is within max_bytes"""
+        while self.total > self.max_bytes and self.entries:
+            key, size = next(iter(self.entries.items()))
+            if key == keep:
+                break
+            del self.entries[key]
+            self.total -= size
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'files': len(self.entries),
+                'bytes': self.total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'rendering': len(self._pending),
+            }
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+### END OF CLASS -  WaveformCache ###
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    Endpoints of the render service.
+
+    GET /encode?text=...       text to Morse code, as text/plain
+    GET /decode?code=...       Morse code to text, as text/plain
+    GET /render?text=...       text to a 16-bit mono WAV, with optional
+                               wpm, farnsworth, freq and samplerate
+    GET /stats                 cache statistics as JSON
+
+    The same parameters can be POSTed as a JSON object.  A WAV response
+    is sent from the cached file with socket.sendfile, so its samples go
+    from the page cache to the socket without being copied through
+    Python; its ETag is the cache key, so clients can revalidate for free.
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MorseInvader'
+    codec = MorseStreamCodec()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query, keep_blank_values=True).items()}
+        self.dispatch(url.path, params)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError("the body must be a JSON object")
+        except ValueError as error:
+            self.send_text(HTTPStatus.BAD_REQUEST, f"{error}\n")
+            return
+        self.dispatch(url.path, params)
+
+    def dispatch(self, path, params):
+        routes = {
+            '/encode': self.encode,
+            '/decode': self.decode,
+            '/render': self.render,
+            '/stats': self.stats,
+        }
+        route = routes.get(path)
+        if route is None:
+            self.send_text(HTTPStatus.NOT_FOUND, f"no endpoint {path}\n")
+            return
+        try:
+            route(params)
+        except KeyError as error:
+            self.send_text(HTTPStatus.BAD_REQUEST, f"missing parameter {error}\n")
+        except (TypeError, ValueError) as error:
+            self.send_text(HTTPStatus.BAD_REQUEST, f"{error}\n")
+
+    def text_param(self, params, name):
+        text = params[name]
+        if not isinstance(text, str):
+            raise ValueError(f"'{name}' must be a string")
+        if len(text) > MAX_TEXT:
+            raise ValueError(f"'{name}' is longer than {MAX_TEXT} characters")
+        return text
+
+    def encode(self, params):
+        self.send_text(HTTPStatus.OK, self.codec.encode(self.text_param(params, 'text')))
+
+    def decode(self, params):
+        self.send_text(HTTPStatus.OK, self.codec.decode(self.text_param(params, 'code')))
+
+    def stats(self, params):
+        self.send_body(HTTPStatus.OK, 'application/json', json.dumps(self.server.cache.stats()).encode())
+
+    def render(self, params):
+        text = self.text_param(params, 'text')
+        # The renderer would silently play characters without Morse code as word gaps
+        unknown = sorted({char for char in text if not char.isspace() and char.upper() not in MORSE_CODE})
+        if unknown:
+            raise ValueError(f"no Morse code for {''.join(unknown)!r}")
+        if not text.strip():
+            raise ValueError("'text' has nothing to render")
+        job = RenderJob('', text,
+                        wpm=float(params.get('wpm', 20)),
+                        farnsworth_wpm=float(params['farnsworth']) if params.get('farnsworth') else None,
+                        freq=float(params.get('freq', 700)),
+                        samplerate=int(params.get('samplerate', 44100)))
+        if not (5 <= job.wpm <= 60 and 100 <= job.freq <= 4000 and 8000 <= job.samplerate <= 96000):
+            raise ValueError("wpm must be 5-60, freq 100-4000 Hz and samplerate 8000-96000")
+        if job.farnsworth_wpm is not None and not 1 <= job.farnsworth_wpm <= job.wpm:
+            raise ValueError("farnsworth must be between 1 and wpm")
+
+        start = time.perf_counter()
+        key, file, hit = self.server.cache.open(job)
+        with file:
+            etag = f'"{key}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            size = os.fstat(file.fileno()).st_size
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', 'audio/wav')
+            self.send_header('Content-Length', str(size))
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+            self.send_header('X-Cache', 'hit' if hit else 'miss')
+            self.send_header('Server-Timing', f'cache;dur={1000 * (time.perf_counter() - start):.3f}')
+            self.end_headers()
+            self.wfile.flush()
+            self.connection.sendfile(file)
+
+    def send_text(self, status, text):
+        self.send_body(status, 'text/plain; charset=utf-8', text.encode())
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+### END OF CLASS -  RenderRequestHandler ###
+
+
+class RenderServer(ThreadingHTTPServer):
+    """
+    The render service: a thread per connection in front of a WaveformCache.
+
+    Attributes:
+        cache (WaveformCache): Rendered audio shared by every request.
+        verbose (bool): Whether each request is logged to stderr.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, cache, verbose=False):
+        super().__init__(address, RenderRequestHandler)
+        self.cache = cache
+        self.verbose = verbose
+
+### END OF CLASS -  RenderServer ###
@@ -0,0 +1,193 @@
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+class VirtualClock:
+    """
+    A clock that only moves when told to.
+
+    Passed to MorseInvaderGame as its now clock, in place of the default
+    time.monotonic, and to ScriptedEvents, so a headless run can step
+    through minutes of game time as fast as frames can be computed.
+
+    Attributes:
+        time (float): Current virtual time in seconds.
+    """
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def __call__(self):
+        return self.time
+
+    def advance(self, seconds):
+        self.time += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+### END OF CLASS -  VirtualClock ###
+
+
+class ScriptedEvents:
+    """
+    An event source that replays a recorded key script.
+
+    Each script entry has a time 't' in seconds, a pygame key name 'key'
+    and an optional 'type' of 'down', 'up' or 'tap' (the default, a press
+    and release in the same frame).  An entry with type 'quit' ends the
+    game.  Calling the object returns the pygame events that are due at
+    the clock's current time, like pygame.event.get.
+
+    Attributes:
+        script (list): Script entries sorted by time.
+        clock (callable): Returns the current time.
+    """
+    def __init__(self, script, clock):
+        self.script = sorted(script, key=lambda entry: entry['t'])
+        self.clock = clock
+        self.position = 0
+
+    @classmethod
+    def load(cls, path, clock):
+        with open(path) as file:
+            return cls(json.load(file)['events'], clock)
+
+    @property
+    def done(self):
+        return self.position >= len(self.script)
+
+    @property
+    def end_time(self):
+        return self.script[-1]['t'] if self.script else 0.0
+
+    def __call__(self):
+        events = []
+        now = self.clock()
+        while self.position < len(self.script) and self.script[self.position]['t'] <= now:
+            entry = self.script[self.position]
+            self.position += 1
+            kind = entry.get('type', 'tap')
+            if kind == 'quit':
+                events.append(pygame.event.Event(pygame.QUIT))
+                continue
+            key = pygame.key.key_code(entry['key'])
+            if kind in ('down', 'tap'):
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+            if kind in ('up', 'tap'):
+                events.append(pygame.event.Event(pygame.KEYUP, key=key))
+        return events
+
+### END OF CLASS -  ScriptedEvents ###
+
+
+class EventRecorder:
+    """
+    An event source that records key events from another source.
+
+    Wraps pygame.event.get (or any other source) and passes every event
+    through, noting key presses and releases with their clock time so a
+    session can be saved and replayed by ScriptedEvents.
+    """
+    def __init__(self, source, clock):
+        self.source = source
+        self.clock = clock
+        self.start = clock()
+        self.events = []
+
+    def __call__(self):
+        events = self.source()
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self.events.append({
+                    't': round(self.clock() - self.start, 4),
+                    'key': pygame.key.name(event.key),
+                    'type': 'down' if event.type == pygame.KEYDOWN else 'up',
+                })
+        return events
+
+    def save(self, path):
+        with open(path, 'w') as file:
+            json.dump({'events': self.events}, file, indent=1)
+
+### END OF CLASS -  EventRecorder ###
+
+
+class SimulationReport:
+    """
+    Collects frame times, state transitions and scores from a headless run.
+
+    Run every frame through time_frame(), which times the game's step()
+    and records each watched field that changed during it.
+    """
+    FIELDS = ('game_marker_moving', 'morse_char_target', 'morse_code',
+              'letter_message', 'player_score', 'game_score')
+
+    def __init__(self):
+        self.frame_times = []
+        self.transitions = []
+        self._last = None
+        self._started = time.perf_counter()
+
+    @staticmethod
+    def snapshot(game):
+        return {
+            'game_marker_moving': game.state.game_marker_moving,
+            'morse_char_target': game.state.morse_char_target,
+            'morse_code': game.morse_interpreter.morse_code,
+            'letter_message': game.morse_interpreter.letter_message,
+            'player_score': game.score_keeper.player_score,
+            'game_score': game.score_keeper.game_score,
+        }
+
+    def time_frame(self, game, step):
+        """Run step() and record how long it took and what it changed"""
+        start = time.perf_counter()
+        running = step()
+        self.frame_times.append(time.perf_counter() - start)
+        current = self.snapshot(game)
+        if self._last is not None:
+            for field in self.FIELDS:
+                if current[field] != self._last[field]:
+                    self.transitions.append({'t': round(game.now(), 4), 'field': field,
+                                             'from': self._last[field], 'to': current[field]})
+        self._last = current
+        return running
+
+    def summary(self, sim_seconds):
+        wall = time.perf_counter() - self._started
+        frames = np.asarray(self.frame_times) * 1000
+        return {
+            'frames': len(frames),
+            'sim_seconds': round(sim_seconds, 3),
+            'wall_seconds': round(wall, 3),
+            'speedup': round(sim_seconds / wall, 1) if wall else None,
+            'frame_ms': {
+                'mean': round(float(frames.mean()), 3) if len(frames) else None,
+                'p50': round(float(np.percentile(frames, 50)), 3) if len(frames) else None,
+                'p95': round(float(np.percentile(frames, 95)), 3) if len(frames) else None,
+                'p99': round(float(np.percentile(frames, 99)), 3) if len(frames) else None,
+                'max': round(float(frames.max()), 3) if len(frames) else None,
+            },
+            'score': {'match': self._last['player_score'], 'miss': self._last['game_score']}
+                     if self._last else None,
+            'transitions': self.transitions,
+        }
+
+### END OF CLASS -  SimulationReport ###
+
+
+def random_session(rounds, seed=None, answer_delay=3.0, round_length=8.0):
+    """Build a script of random practice rounds: 'R', some arrow keys, then Enter"""
+    rng = np.random.default_rng(seed)
+    events = []
+    for number in range(rounds):
+        start = number * round_length
+        events.append({'t': start, 'key': 'r'})
+        for index in range(int(rng.integers(1, 6))):
+            key = 'left' if rng.random() < 0.5 else 'right'
+            events.append({'t': round(start + answer_delay + 0.3 * index, 3), 'key': key})
+        events.append({'t': round(start + answer_delay + 2.0, 3), 'key': 'return'})
+    return events
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+STORE_MAGIC = b'MIWAVES\0'
+STORE_VERSION = 1  # bump when the file layout or the way tones are rendered changes
+STORE_HEADER = struct.Struct('<8sIIQQ')  # magic, version, reserved, index offset, index length
+STORE_ALIGN = 64  # every buffer starts on a cache line
+
+
+def preset_name(freq, samplerate, dit_duration):
+    return f"{freq!r}/{samplerate!r}/{dit_duration!r}"
+
+
+def table_fingerprint(morse_code):
+    """Identifies the Morse code table the stored characters were rendered from"""
+    table = json.dumps(sorted(morse_code.items()), separators=(',', ':'))
+    return hashlib.sha256(f"{STORE_VERSION}:{table}".encode()).hexdigest()
+
+
+class WaveformStore:
+    """
+    A file of pre-rendered WaveformBank tables that processes share through mmap.
+
+    The file holds a header, the float32 samples of every stored preset
+    (one per freq, sample rate and dit length) and a JSON index giving the
+    offset and length of each preset's dit, dah and character buffers.
+    load() hands back numpy arrays and memoryviews straight into a
+    read-only mapping, so no process synthesises or copies a stored tone
+    and every process using the file shares the same physical pages.
+
+    The file is never changed in place.  save() writes a complete new file
+    beside it and renames it over the old one, so readers always see a
+    whole file and any mapping they already hold stays valid.  The index
+    records the format version and a fingerprint of the Morse code table;
+    a file that does not match is ignored and replaced on the next save.
+    Where the rename is not possible (a read-only directory, or another
+    process holding the file open on Windows) save() leaves the file alone
+    and the caller keeps its freshly rendered table in memory.
+
+    Attributes:
+        path (str): The store file.
+        fingerprint (str): Table fingerprint the file must carry to be used.
+        max_presets (int): Presets kept; saving another drops the oldest.
+        presets (dict): Index entry of each preset in the current mapping.
+        hits (int): Presets loaded from the file.
+        misses (int): Presets asked for that the file did not hold.
+    """
+    def __init__(self, path, morse_code, max_presets=8):
+        self.path = path
+        self.fingerprint = table_fingerprint(morse_code)
+        self.max_presets = max_presets
+        self.presets = {}
+        self.hits = 0
+        self.misses = 0
+        self._map = None
+        self._identity = None
+        self.refresh()
+
+    def refresh(self):
+        """Map the file again if another process has replaced it since it was last mapped"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._map, self._identity, self.presets = None, None, {}
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._identity:
+            return
+        self._identity = identity
+        # The old mapping is dropped, not closed: tables loaded from it may still be in use
+        self._map, self.presets = None, {}
+        if stat.st_size < STORE_HEADER.size:
+            return
+        try:
+            with open(self.path, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return  # unreadable, or emptied since the stat; the caller renders instead
+        magic, version, _, index_offset, index_length = STORE_HEADER.unpack_from(mapping)
+        if magic != STORE_MAGIC or version != STORE_VERSION or index_offset + index_length > len(mapping):
+            return
+        try:
+            index = json.loads(mapping[index_offset:index_offset + index_length])
+        except ValueError:
+            return
+        if not isinstance(index, dict) or index.get('fingerprint') != self.fingerprint:
+            return
+        presets = index.get('presets')
+        if not isinstance(presets, dict) or not all(self._valid(entry, index_offset) for entry in presets.values()):
+            return
+        self._map, self.presets = mapping, presets
+
+    @staticmethod
+    def _valid(entry, end):
+        """Whether every buffer of an index entry is a float32 run that lies before end"""
+        if not isinstance(entry, dict):
+            return False
+        for key in ('symbols', 'characters'):
+            buffers = entry.get(key)
+            if not isinstance(buffers, dict):
+                return False
+            for span in buffers.values():
+                if not (isinstance(span, list) and len(span) == 2
+                        and all(type(value) is int and value >= 0 for value in span)):
+                    return False
+                offset, frames = span
+                if offset < STORE_HEADER.size or offset + 4 * frames > end:
+                    return False
+        return True
+
+    def load(self, freq, samplerate, dit_duration):
+        """Return a preset's (symbols, characters) table from the file, or None if it is not stored"""
+        name = preset_name(freq, samplerate, dit_duration)
+        if name not in self.presets:
+            self.refresh()
+        entry = self.presets.get(name)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._table(self._map, entry)
+
+    def save(self, freq, samplerate, dit_duration, table):
+        """
+        Add a preset's table to the file, keeping the presets already there.
+
+        Returns the table as loaded back from the new file, so the caller
+        can drop its own copy, or None if the file could not be replaced.
+        """
+        self.refresh()
+        name = preset_name(freq, samplerate, dit_duration)
+        tables = {key: self._table(self._map, entry) for key, entry in self.presets.items() if key != name}
+        while len(tables) >= self.max_presets:
+            del tables[next(iter(tables))]
+        tables[name] = table
+
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            self._write(temporary, tables)
+            os.replace(temporary, self.path)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            return None
+        self.refresh()
+        entry = self.presets.get(name)
+        return self._table(self._map, entry) if entry is not None else None
+
+    def _write(self, path, tables):
+        presets = {}
+        with open(path, 'wb') as file:
+            file.write(bytes(STORE_HEADER.size))
+            for name, (symbols, characters) in tables.items():
+                presets[name] = {
+                    'symbols': {symbol: self._append(file, samples) for symbol, samples in symbols.items()},
+                    'characters': {char: self._append(file, buffer) for char, buffer in characters.items()},
+                }
+            index = json.dumps({'fingerprint': self.fingerprint, 'presets': presets}).encode()
+            index_offset = file.tell()
+            file.write(index)
+            file.seek(0)
+            file.write(STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION, 0, index_offset, len(index)))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def _append(file, buffer):
+        """Write a float32 buffer at the next aligned offset, returning [offset, frames]"""
+        offset = file.tell()
+        padding = -offset % STORE_ALIGN
+        if padding:
+            file.write(bytes(padding))
+            offset += padding
+        data = memoryview(buffer).cast('B')
+        file.write(data)
+        return [offset, len(data) // 4]
+
+    @staticmethod
+    def _table(mapping, entry):
+        symbols = {symbol: np.frombuffer(mapping, dtype=np.float32, count=frames, offset=offset)
+                   for symbol, (offset, frames) in entry['symbols'].items()}
+        view = memoryview(mapping)
+        characters = {char: view[offset:offset + 4 * frames]
+                      for char, (offset, frames) in entry['characters'].items()}
+        return symbols, characters
+
+    def stats(self):
+        return {
+            'presets': len(self.presets),
+            'bytes': self._identity[2] if self._identity else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+### END OF CLASS -  WaveformStore ###
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# The modules live flat in src/, as the game and its tools import them
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+
+@pytest.fixture
+def make_game(monkeypatch):
+    """Build games without sound or logs, closing their audio after the test"""
+    from Morse_Invader import GameConfig, MorseInvaderGame
+
+    monkeypatch.chdir(SRC)  # the game loads its assets relative to src
+    games = []
+
+    def make(**kwargs):
+        config = GameConfig(AUDIO_BACKEND='null', ATTEMPT_LOG=None, WAVEFORM_STORE=None, CHALLENGE_SEED=1)
+        game = MorseInvaderGame(config, **kwargs)
+        games.append(game)
+        return game
+    yield make
+    # pygame stays initialised: the game's font cache outlives any one game
+    for game in games:
+        game.audio.close()
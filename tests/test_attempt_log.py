@@ -0,0 +1,64 @@
+import numpy as np
+
+from AttemptLog_Classes import ATTEMPT_DTYPE, LOG_HEADER, AttemptLog, character_stats, read_attempts, unpack_code
+
+
+def write_log(path, attempts):
+    log = AttemptLog(path)
+    for target, code, entered, correct in attempts:
+        log.record(target, code, entered, correct, response_time=0.5, key_times=[0.1] * len(code), when=1.0)
+    log.close()
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / 'attempts.bin')
+    write_log(path, [('A', '.-', 'A', True), ('K', '-.-', 'R', False)])
+    records = read_attempts(path)
+    assert [chr(code) for code in records['target']] == ['A', 'K']
+    assert [chr(code) for code in records['entered']] == ['A', 'R']
+    assert [unpack_code(bits, length) for bits, length in zip(records['code_bits'], records['code_length'])] == \
+        ['.-', '-.-']
+    assert records['correct'].tolist() == [1, 0]
+
+
+def test_reopen_drops_a_torn_record(tmp_path):
+    path = str(tmp_path / 'attempts.bin')
+    write_log(path, [('A', '.-', 'A', True), ('B', '-...', 'B', True)])
+    with open(path, 'ab') as file:
+        file.write(b'\xff' * (ATTEMPT_DTYPE.itemsize // 2))  # a crash in the middle of a write
+    write_log(path, [('C', '-.-.', 'C', True), ('D', '-..', 'D', True)])
+
+    size = (tmp_path / 'attempts.bin').stat().st_size
+    assert (size - LOG_HEADER.size) % ATTEMPT_DTYPE.itemsize == 0
+    records = read_attempts(path)
+    assert ''.join(chr(code) for code in records['target']) == 'ABCD'
+    assert set(character_stats(records)) == set('ABCD')
+
+
+def test_stats_skip_targets_outside_unicode():
+    records = np.zeros(3, dtype=ATTEMPT_DTYPE)
+    records['target'] = [ord('E'), 0xFFFFFFFF, ord('E')]
+    records['correct'] = [1, 1, 0]
+    records['response_ms'] = [200, 300, np.nan]
+    stats = character_stats(records)
+    assert list(stats) == ['E']
+    assert stats['E']['attempts'] == 2
+    assert stats['E']['accuracy'] == 0.5
+    assert stats['E']['mean_response_ms'] == 200
+
+
+def test_merge_weights_response_times_by_timed_attempts():
+    from Morse_Stats import merge
+
+    first = np.zeros(4, dtype=ATTEMPT_DTYPE)
+    first['target'] = ord('Q')
+    first['response_ms'] = [100, np.nan, np.nan, np.nan]
+    second = np.zeros(2, dtype=ATTEMPT_DTYPE)
+    second['target'] = ord('Q')
+    second['response_ms'] = [400, 400]
+    stats = merge(character_stats(first), character_stats(second))
+    assert stats['Q']['attempts'] == 6
+    assert stats['Q']['timed'] == 3
+    assert stats['Q']['mean_response_ms'] == 300
+    assert stats['Q']['median_response_ms'] == 300
+    assert stats['Q']['mean_response_ms'] == character_stats(np.concatenate([first, second]))['Q']['mean_response_ms']
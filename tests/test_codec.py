@@ -0,0 +1,81 @@
+import pytest
+
+from MorseCode_Classes import MORSE_CODE, MORSE_TREE, MorseCodeEncoder, MorseCodeInterpreter
+from MorseStream_Classes import MorseStreamCodec
+
+CHARACTERS = list(MORSE_TREE.packed)
+
+
+def test_tree_index_round_trip():
+    for char in CHARACTERS:
+        index = MORSE_TREE.index_of(MORSE_CODE[char])
+        assert MORSE_TREE.char_at(index) == char
+        assert MORSE_TREE.code_of(index) == MORSE_CODE[char]
+
+
+@pytest.mark.parametrize('char', CHARACTERS)
+def test_encoder_to_interpreter_round_trip(char):
+    encoder = MorseCodeEncoder()
+    interpreter = MorseCodeInterpreter()
+    encoder.select_character(char)
+    done = False
+    while not done:
+        done, left, right = encoder.next_dot_dash()
+        interpreter.handle_arrow_keys(left, right)
+    assert interpreter.morse_code == MORSE_CODE[char]
+    assert interpreter.lookup_morse_code(interpreter.morse_code) == char
+    interpreter.interpret_morse_code()
+    assert interpreter.answer is True
+    assert interpreter.letter_message == f'Code Letter: {char}'
+    assert interpreter.morse_code == ""
+
+
+def test_encoder_selects_any_dictionary_character():
+    encoder = MorseCodeEncoder()
+    encoder.select_character(' ')  # in the dictionary, with no elements
+    with pytest.raises(IndexError):
+        encoder.next_dot_dash()
+    with pytest.raises(ValueError):
+        encoder.select_character('\u2603')
+
+
+def test_interpreter_rejects_code_outside_the_tree():
+    interpreter = MorseCodeInterpreter()
+    for symbol in '.-.-.-.-':
+        interpreter.add_symbol(symbol)
+    assert not interpreter.prefix_is_valid()
+    interpreter.interpret_morse_code()
+    assert interpreter.answer is False
+
+
+def test_stream_codec_round_trip():
+    codec = MorseStreamCodec()
+    text = "CQ CQ DE K1ABC\nTHE QUICK BROWN FOX 1234567890 +/="
+    code = codec.encode(text)
+    assert codec.decode(code) == text
+    assert codec.encode("sos") == "... --- ..."
+
+
+def test_stream_codec_chunk_boundaries():
+    codec = MorseStreamCodec()
+    text = "PARIS PARIS 73 DE W1AW\n" * 50
+    code = codec.encode(text).encode('ascii')
+    for size in (1, 3, 7, 64):
+        chunks = [code[start:start + size] for start in range(0, len(code), size)]
+        assert b''.join(codec.decode_stream(chunks)).decode('ascii') == text
+
+
+def test_stream_codec_unknown_characters():
+    assert MorseStreamCodec().encode("A☃B") == ".- # -..."
+    assert MorseStreamCodec(errors='ignore').encode("A☃B") == ".- -..."
+    with pytest.raises(ValueError):
+        MorseStreamCodec(errors='strict').encode("A☃B")
+
+
+def test_stream_codec_bounds_a_token_without_separators():
+    codec = MorseStreamCodec()
+    chunks = [b'... '] + [b'.-' * 32768] * 200 + [b' ---']
+    assert b''.join(codec.decode_stream(chunks)) == b'S#O'
+    assert MorseStreamCodec(errors='ignore').decode('.-.-.-.-.-.- ...') == 'S'
+    with pytest.raises(ValueError, match='offset 4'):
+        b''.join(MorseStreamCodec(errors='strict').decode_stream(chunks))
@@ -0,0 +1,29 @@
+import pytest
+
+from AudioDecoder_Classes import decode_wav
+from Batch_Classes import create_wav, render_into, renderer_for
+
+
+def write_message(path, text, wpm, lead_seconds=0.0, samplerate=8000):
+    renderer = renderer_for(wpm, None, 700, samplerate)
+    lead = int(lead_seconds * samplerate)
+    out = create_wav(path, lead + int(renderer.segment_lengths(text).sum()), samplerate)
+    render_into(renderer, text, out[lead:])
+    out.flush()
+    return str(path)
+
+
+# At these speeds a dah is longer than a 0.5 second chunk, so a chunk can hold no quiet blocks at all
+@pytest.mark.parametrize('text, wpm', [('TEST', 5), ('TEST', 6), ('CQ TEST', 5), ('CQ TEST', 8), ('PARIS 73', 20)])
+@pytest.mark.parametrize('lead_seconds', [0.0, 1.0, 2.5])
+@pytest.mark.parametrize('given', [False, True])
+def test_chunked_decode_round_trip(tmp_path, text, wpm, lead_seconds, given):
+    path = write_message(tmp_path / 'message.wav', text, wpm, lead_seconds)
+    settings = {'freq': 700, 'wpm': wpm} if given else {}
+    assert ''.join(decode_wav(path, chunk_seconds=0.5, **settings)) == text
+
+
+def test_silence_decodes_to_nothing(tmp_path):
+    path = tmp_path / 'silence.wav'
+    create_wav(path, 8000 * 3, 8000).flush()
+    assert ''.join(decode_wav(str(path), freq=700)) == ''
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import pygame
+
+from Simulation_Classes import EventRecorder, ScriptedEvents, VirtualClock
+
+KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_LEFT]
+
+
+def press_later(delay, key):
+    def post():
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+    timer = threading.Timer(delay, post)
+    timer.start()
+    return timer
+
+
+def test_events_that_end_an_idle_wait_are_recorded_and_replay(make_game):
+    recorder = EventRecorder(pygame.event.get, time.monotonic)
+    game = make_game(get_events=recorder)
+    pygame.event.clear()
+    for key in KEYS:
+        # Nothing is queued, so each key arrives while the loop sleeps in wait_for_input
+        timer = press_later(0.05, key)
+        deadline = time.monotonic() + 5
+        recorded = len(recorder.events)
+        while len(recorder.events) < recorded + 2 and time.monotonic() < deadline:
+            wake = game.scheduler.call_at(time.monotonic() + 0.5, lambda: None)  # bound each wait
+            game.wait_for_input()
+            game.scheduler.cancel(wake)
+            assert game.handle_input()
+        timer.join()
+    assert game.morse_interpreter.morse_code == '.-.'
+    assert [(entry['key'], entry['type']) for entry in recorder.events] == [
+        (pygame.key.name(key), kind) for key in KEYS for kind in ('down', 'up')]
+
+    clock = VirtualClock()
+    replay = make_game(now=clock, get_events=ScriptedEvents(recorder.events, clock))
+    while not replay.get_events.done:
+        clock.advance(0.01)
+        assert replay.step(draw=False)
+    assert replay.morse_interpreter.morse_code == game.morse_interpreter.morse_code
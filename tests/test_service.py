@@ -0,0 +1,53 @@
+import http.client
+import threading
+
+import pytest
+
+from Service_Classes import RenderServer, WaveformCache
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    cache = WaveformCache(str(tmp_path_factory.mktemp('render_cache')), workers=1)
+    server = RenderServer(('127.0.0.1', 0), cache)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    cache.close()
+
+
+def get(server, path):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, response.getheader('Content-Type'), response.read()
+    finally:
+        connection.close()
+
+
+def test_encode_round_trip(server):
+    assert get(server, '/encode?text=sos')[2] == b'... --- ...'
+    assert get(server, '/decode?code=...%20---%20...')[2] == b'SOS'
+
+
+def test_blank_parameters_are_present(server):
+    assert get(server, '/encode?text=') == (200, 'text/plain; charset=utf-8', b'')
+    status, _, body = get(server, '/render?text=')
+    assert status == 400 and b'missing parameter' not in body
+
+
+@pytest.mark.parametrize('text', ['%E2%98%83', 'SOS%E2%98%83', '%20%20'])
+def test_render_rejects_text_without_morse_code(server, text):
+    misses = server.cache.stats()['misses']
+    status, _, body = get(server, f'/render?text={text}')
+    assert status == 400, body
+    assert server.cache.stats()['misses'] == misses
+
+
+def test_render_serves_a_wav(server):
+    status, content_type, body = get(server, '/render?text=CQ%20DE%20K1ABC&samplerate=8000')
+    assert (status, content_type) == (200, 'audio/wav')
+    assert body[:4] == b'RIFF' and len(body) > 44
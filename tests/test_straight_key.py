@@ -0,0 +1,26 @@
+import threading
+import time
+
+import pygame
+import pytest
+
+
+@pytest.mark.parametrize('units, symbol', [(1, '.'), (3, '-')])
+def test_press_is_timed_from_event_arrival(make_game, units, symbol):
+    game = make_game(now=time.monotonic)
+    game.toggle_input_mode()
+    dit = game.straight_key.dit_seconds
+    pygame.event.clear()
+
+    def press():
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        time.sleep(units * dit)
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+    thread = threading.Thread(target=press)
+    start = time.monotonic()
+    thread.start()
+    # Both events arrive within one frame, so they are handled together long after the press
+    game.wait_for_input(start + 5 * dit)
+    thread.join()
+    assert game.handle_input()
+    assert game.morse_interpreter.morse_code == symbol
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from MorseCode_Classes import MORSE_CODE, WaveformBank
+from WaveformStore_Classes import STORE_HEADER, STORE_MAGIC, STORE_VERSION, WaveformStore, table_fingerprint
+
+KEY = (700, 8000, 0.06)
+
+
+def write_store(path, index, samples=np.zeros(64, dtype=np.float32)):
+    """Write a store file by hand, with samples right after the header and then the index"""
+    data = samples.tobytes()
+    index = json.dumps(index).encode()
+    with open(path, 'wb') as file:
+        file.write(STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION, 0, STORE_HEADER.size + len(data), len(index)))
+        file.write(data)
+        file.write(index)
+
+
+def index_with(entry):
+    return {'fingerprint': table_fingerprint(MORSE_CODE), 'presets': {'700/8000/0.06': entry}}
+
+
+def test_tables_reload_from_another_store(tmp_path):
+    path = str(tmp_path / 'tones.store')
+    rendered = WaveformBank(MORSE_CODE, store=WaveformStore(path, MORSE_CODE)).table(*KEY)
+
+    store = WaveformStore(path, MORSE_CODE)
+    symbols, characters = WaveformBank(MORSE_CODE, store=store).table(*KEY)
+    assert store.hits == 1
+    for symbol, samples in rendered[0].items():
+        np.testing.assert_array_equal(symbols[symbol], samples)
+    assert {char: bytes(buffer) for char, buffer in characters.items()} == \
+        {char: bytes(buffer) for char, buffer in rendered[1].items()}
+
+
+@pytest.mark.parametrize('index', [
+    [],
+    {'fingerprint': table_fingerprint(MORSE_CODE), 'presets': []},
+    index_with([]),
+    index_with({'symbols': {'.': [STORE_HEADER.size, 1 << 20]}, 'characters': {}}),
+    index_with({'symbols': {'.': [-4, 8]}, 'characters': {}}),
+    index_with({'symbols': {}, 'characters': {'E': ['16', 8]}}),
+], ids=['list', 'presets-list', 'entry-list', 'past-end', 'negative', 'string-offset'])
+def test_damaged_index_falls_back_to_rendering(tmp_path, index):
+    path = str(tmp_path / 'tones.store')
+    write_store(path, index)
+    store = WaveformStore(path, MORSE_CODE)
+    assert store.presets == {}
+    symbols, characters = WaveformBank(MORSE_CODE, store=store).table(*KEY)
+    assert len(symbols['.']) and characters['E']
+    assert WaveformStore(path, MORSE_CODE).load(*KEY) is not None  # replaced by a good file
+
+
+def test_valid_hand_written_entry_loads(tmp_path):
+    path = str(tmp_path / 'tones.store')
+    samples = np.arange(64, dtype=np.float32)
+    write_store(path, index_with({'symbols': {'.': [STORE_HEADER.size, 64]}, 'characters': {}}), samples)
+    symbols, _ = WaveformStore(path, MORSE_CODE).load(*KEY)
+    np.testing.assert_array_equal(symbols['.'], samples)
+
+
+def test_unreadable_file_falls_back_to_rendering(tmp_path):
+    path = tmp_path / 'tones.store'
+    path.mkdir()  # exists, but cannot be opened as a file
+    store = WaveformStore(str(path), MORSE_CODE)
+    assert store.presets == {}
+    symbols, characters = WaveformBank(MORSE_CODE, store=store).table(*KEY)
+    assert len(symbols['-']) and characters['T']